@@ -0,0 +1,265 @@
+"""
+분석 결과 요약 저장소 - 제품/직업 1개당 1행 (장단점, 출처, 키워드 빈도, 카테고리 집계를 미리 계산해 저장)
+
+장단점 1개당 1행인 기존 테이블(laptop_pros_cons, career_pros_cons)은 조회할 때마다
+행을 다시 모으고 키워드를 다시 세야 합니다. 요약 테이블은 한 행만 읽으면 바로 표시할 수 있습니다.
+
+요약 테이블 (Supabase SQL):
+    create table laptop_analysis (
+        product_name text primary key,
+        pros jsonb, cons jsonb, sources jsonb,
+        keywords jsonb, category_counts jsonb,
+        point_count int, created_at timestamptz default now()
+    );
+    create table career_analysis (
+        career_name text primary key,
+        pros jsonb, cons jsonb, sources jsonb,
+        keywords jsonb, category_counts jsonb,
+        salary_info jsonb, career_path jsonb,
+        point_count int, created_at timestamptz default now()
+    );
+
+기존 테이블 이전: python analysis_store.py product (또는 career) [--dry-run]
+"""
+
+import argparse
+import os
+import re
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from storage import TABLES
+from versioned_store import latest_version
+
+# 저장 방식: points (장단점 1개당 1행, 기존) / summary (제품/직업 1개당 1행)
+STORAGE_POINTS = "points"
+STORAGE_SUMMARY = "summary"
+
+# 요약 행에 저장할 키워드 수 (워드클라우드 최대 40개)
+MAX_STORED_KEYWORDS = 50
+
+PRODUCT_STOPWORDS = {
+    # 일반 불용어
+    '수', '있습니다', '있어요', '있음', '좋습니다', '좋아요', '좋음',
+    '나쁩니다', '나빠요', '나쁨', '않습니다', '않아요', '않음',
+    '입니다', '이다', '되다', '하다', '있다', '없다', '같다',
+    '위해', '통해', '대해', '매우', '정말', '너무', '조금',
+    '그리고', '하지만', '그러나', '또한', '때문', '경우',
+    '제공합니다', '제공', '합니다', '해요', '드립니다', '드려요',
+    '위한', '위하여', '따라', '따른', '통한', '대한', '관한',
+    '됩니다', '됨', '되어', '되었습니다', '했습니다', '하는',
+    '이', '그', '저', '것', '것이', '것을', '것은', '것도',
+    '더', '덜', '꽤', '약간', '살짝', '많이', '적게', '조금',
+    '모든', '각', '각각', '여러', '몇', '몇몇', '전체', '일부',
+    '항상', '가끔', '종종', '자주', '언제나', '절대', '전혀',
+    '만', '도', '까지', '부터', '에서', '에게', '으로', '로',
+    '와', '과', '하고', '이고', '이며', '거나', '든지', '라고',
+    '들', '등', '등등', '따위', '및', '또는', '혹은', '즉',
+    '의', '를', '을', '에', '가', '이', '은', '는', '와', '과',
+    '했다', '한다', '하며', '하여', '해서', '하고', '하니', '하면',
+    '그래서', '그러니', '그러므로', '따라서', '때문에', '왜냐하면',
+    '비해', '보다', '처럼', '같이', '만큼', '대로', '듯이',
+    '점', '면', '측면', '부분', '경우', '상황', '상태', '정도',
+    '이런', '저런', '그런', '어떤', '무슨', '어느', '어떻게',
+    '가능', '불가능', '필요', '불필요', '중요', '사용', '이용',
+    '느낌', '기분', '마음', '생각', '의견', '감정', '인상',
+    '한', '두', '세', '네', '몇', '여러', '많은', '적은',
+    '첫', '둘', '셋', '넷', '첫째', '둘째', '셋째', '마지막',
+    '좀', '꼭', '딱', '막', '참', '진짜', '정말로', '확실히',
+    '거의', '대부분', '대체로', '보통', '일반적', '평균적',
+    '특히', '특별히', '주로', '대개', '대체로', '전반적'
+}
+
+# 직업 관련 불용어
+CAREER_STOPWORDS = {
+    '수', '있습니다', '있어요', '있음', '좋습니다', '좋아요', '좋음',
+    '나쁩니다', '나빠요', '나쁨', '않습니다', '않아요', '않음',
+    '입니다', '이다', '되다', '하다', '있다', '없다', '같다',
+    '직업', '일', '업무', '근무', '회사', '직장', '분야',
+    '위해', '통해', '대해', '매우', '정말', '너무', '조금',
+    '그리고', '하지만', '그러나', '또한', '때문', '경우',
+    '제공합니다', '제공', '합니다', '해요', '드립니다', '드려요'
+}
+
+# 제품 장단점 카테고리
+PRODUCT_CATEGORIES = {
+    '성능': ['성능', '속도', '빠르', '느리', '렉', '버벅', '프로세서', 'CPU', 'GPU', '메모리'],
+    '디자인': ['디자인', '외관', '예쁘', '이쁘', '못생', '색상', '모양', '두께', '얇'],
+    '가격': ['가격', '비싸', '저렴', '가성비', '비용', '돈', '할인', '세일'],
+    '품질': ['품질', '마감', '재질', '튼튼', '약하', '고장', '내구성', '견고'],
+    '기능': ['기능', '편의', '편리', '불편', '사용', '조작', '인터페이스'],
+    '배터리': ['배터리', '충전', '전원', '지속', '방전'],
+    '화면': ['화면', '디스플레이', '선명', '밝기', '해상도'],
+    '기타': []
+}
+
+# 테이블 구성: (장단점 행 테이블, 요약 테이블, 이름 컬럼)
+PRODUCT_TABLES = ('laptop_pros_cons', 'laptop_analysis', 'product_name')
+CAREER_TABLES = ('career_pros_cons', 'career_analysis', 'career_name')
+
+
+def extract_keywords(texts, stopwords, strict=False):
+    """텍스트에서 핵심 키워드 빈도 추출 (strict: 있/없/하/되/않 으로 시작하는 단어도 제외)"""
+    # 한글만 추출 (영어, 숫자 제외)
+    words = re.findall(r'[가-힣]+', ' '.join(texts))
+
+    filtered_words = []
+    for word in words:
+        if len(word) < 2 or word in stopwords:
+            continue
+        if word.endswith('습니다') or word.endswith('합니다'):
+            continue
+        if strict and (word.endswith('입니다') or word.endswith('됩니다') or word.startswith(('있', '없', '하', '되', '않'))):
+            continue
+        filtered_words.append(word)
+
+    # 빈도수가 1인 단어는 제외 (더 중요한 키워드만 남김)
+    return {word: freq for word, freq in Counter(filtered_words).items() if freq > 1}
+
+
+def categorize_points(points, categories):
+    """장단점을 카테고리별로 분류한 개수 (어디에도 속하지 않으면 '기타')"""
+    counts = {cat: 0 for cat in categories}
+    for point in points:
+        for cat, keywords in categories.items():
+            if cat != '기타' and any(keyword in point for keyword in keywords):
+                counts[cat] += 1
+                break
+        else:
+            counts['기타'] = counts.get('기타', 0) + 1
+    return counts
+
+
+def top_keywords(word_freq, limit=MAX_STORED_KEYWORDS):
+    return dict(sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:limit])
+
+
+def build_product_summary(name, pros, cons, sources=None):
+    """제품 요약 행 생성"""
+    return {
+        'product_name': name,
+        'pros': list(pros),
+        'cons': list(cons),
+        'sources': list(sources or []),
+        'keywords': {
+            'pros': top_keywords(extract_keywords(pros, PRODUCT_STOPWORDS, strict=True)),
+            'cons': top_keywords(extract_keywords(cons, PRODUCT_STOPWORDS, strict=True))
+        },
+        'category_counts': {
+            'pros': categorize_points(pros, PRODUCT_CATEGORIES),
+            'cons': categorize_points(cons, PRODUCT_CATEGORIES)
+        },
+        'point_count': len(pros) + len(cons),
+        'created_at': datetime.now(timezone.utc).isoformat()
+    }
+
+
+def build_career_summary(name, pros, cons, sources=None, salary_info=None, career_path=None):
+    """직업 요약 행 생성 (연봉/경력 경로 포함, 카테고리 분류는 제품에만 있음)"""
+    return {
+        'career_name': name,
+        'pros': list(pros),
+        'cons': list(cons),
+        'sources': list(sources or []),
+        'keywords': {
+            'pros': top_keywords(extract_keywords(pros, CAREER_STOPWORDS)),
+            'cons': top_keywords(extract_keywords(cons, CAREER_STOPWORDS))
+        },
+        'category_counts': {},
+        'salary_info': salary_info or None,
+        'career_path': career_path or None,
+        'point_count': len(pros) + len(cons),
+        'created_at': datetime.now(timezone.utc).isoformat()
+    }
+
+
+def fetch_summary(supabase, table, key_column, name):
+    """요약 행 조회 (한 번의 단일 행 조회, 없으면 빈 목록)"""
+    return supabase.table(table).select("*").eq(key_column, name).limit(1).execute().data or []
+
+
+def save_summary(supabase, table, key_column, row):
+    """요약 행 저장 (이름 기준 upsert - 한 번에 통째로 교체)"""
+    return supabase.table(table).upsert(row, on_conflict=key_column).execute().data or []
+
+
+def group_point_rows(rows, key_column):
+    """장단점 행을 이름별로 모아 (이름, 장점, 단점, 저장 시각) 목록으로 변환 (이름마다 최신 묶음만 사용)"""
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row[key_column]].append(row)
+
+    entities = []
+    for name, name_rows in grouped.items():
+        batch = latest_version(name_rows)
+        pros = [item['content'] for item in batch if item['type'] == 'pro']
+        cons = [item['content'] for item in batch if item['type'] == 'con']
+        entities.append((name, pros, cons, batch[0].get('created_at')))
+    return entities
+
+
+def fetch_all_rows(supabase, table, page_size=1000):
+    """테이블 전체 행을 페이지 단위로 조회 (기본 키 순서로 고정해야 페이지 사이에 행이 빠지거나 겹치지 않음)"""
+    spec = TABLES[table]
+    order_column = 'id' if spec['kind'] == 'points' else spec['key']
+    rows = []
+    start = 0
+    while True:
+        page = (
+            supabase.table(table).select("*").order(order_column)
+            .range(start, start + page_size - 1).execute().data or []
+        )
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+def migrate(supabase, kind, dry_run=False, page_size=1000):
+    """장단점 1개당 1행 테이블을 요약 테이블로 이전, 이전한 항목 수 반환
+
+    저장 시각은 원래 행의 created_at 을 유지하므로 신선도(TTL) 판단이 그대로 이어집니다.
+    연봉/경력 경로는 기존 테이블에 없으므로 비워 두며, 조회 시 크롤러 기본값으로 채워집니다.
+    """
+    points_table, summary_table, key_column = PRODUCT_TABLES if kind == 'product' else CAREER_TABLES
+    build = build_product_summary if kind == 'product' else build_career_summary
+
+    rows = fetch_all_rows(supabase, points_table, page_size=page_size)
+    entities = group_point_rows(rows, key_column)
+    print(f"{points_table}: {len(rows)}행 → {summary_table}: {len(entities)}행")
+
+    migrated = 0
+    for name, pros, cons, created_at in entities:
+        row = build(name, pros, cons)
+        if created_at:
+            row['created_at'] = created_at
+        if dry_run:
+            print(f"  [dry-run] {name}: 장점 {len(pros)}개, 단점 {len(cons)}개")
+            continue
+        try:
+            save_summary(supabase, summary_table, key_column, row)
+            migrated += 1
+        except Exception as e:
+            print(f"  이전 실패 ({name}): {e}")
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="장단점 행 테이블을 요약 테이블(1개당 1행)로 이전")
+    parser.add_argument('kind', choices=['product', 'career'], help="이전할 데이터 종류")
+    parser.add_argument('--dry-run', action='store_true', help="저장하지 않고 이전 대상만 출력")
+    args = parser.parse_args()
+
+    from supabase import create_client
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+    if not url or not key:
+        parser.error("SUPABASE_URL, SUPABASE_KEY 환경 변수가 필요합니다")
+
+    migrated = migrate(create_client(url, key), args.kind, dry_run=args.dry_run)
+    print(f"완료: {migrated}개 항목 이전")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+벤치마크 - 실제 API 키 없이 로컬 대역 서버로 검색 경로를 재현해 측정 (python -m benchmarks.e2e)
+"""
@@ -0,0 +1,201 @@
+"""
+전체 경로 벤치마크 - 로컬 대역 서버(fake_services)를 띄우고 검색 워크플로우(search_app / career_app)를
+화면 없이 invoke 로 실행해 검색 1회의 지연 시간(p50/p95), 처리량, 외부 호출 수를 측정
+
+    python -m benchmarks.e2e --app product --runs 20 --concurrency 4
+    python -m benchmarks.e2e --app career --page-latency 0.3 --page-failure-rate 0.1 --llm-delay 0.8
+    python -m benchmarks.e2e --app product --warm --json bench.json     # 같은 검색어 반복 (저장 결과/캐시 경로)
+    python -m benchmarks.e2e --storage sqlite                             # Supabase 대역 대신 로컬 SQLite
+
+기본은 검색마다 다른 검색어를 써서 매번 웹 수집 경로를 탑니다 (--warm 은 첫 검색 뒤 저장 결과 재사용).
+앱 모듈은 대역 서버 주소를 환경 변수로 넘긴 뒤 불러오므로 한 프로세스에서 앱 하나만 측정합니다.
+캐시/체크포인트/추적 파일은 임시 디렉터리(--cache-dir)에 남겨 실행마다 같은 조건에서 시작합니다.
+"""
+
+import argparse
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_services import FakeServices  # noqa: E402
+from result_cache import percentile  # noqa: E402
+
+# 앱별 모듈 / 워크플로우 / 초기 상태 함수 / 기본 검색어
+APPS = {
+    'product': {
+        'module': 'test_app', 'graph': 'search_app', 'initial_state': 'initial_search_state',
+        'terms': ["맥북 프로 M3", "LG 그램 2024", "갤럭시북4 프로", "델 XPS 15"]
+    },
+    'career': {
+        'module': 'test_app2', 'graph': 'career_app', 'initial_state': 'initial_career_state',
+        'terms': ["데이터 분석가", "간호사", "웹 개발자", "공무원"]
+    }
+}
+
+
+def load_app(app, env):
+    """대역 서버 설정으로 앱 모듈 불러오기 (Streamlit 화면 없이 실행 - 화면 관련 경고는 숨김)"""
+    os.environ.update(env)
+    module = importlib.import_module(APPS[app]['module'])
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    return module
+
+
+def search_terms(app, runs, warm, terms=None):
+    """측정할 검색어 목록 - 기본은 모두 다른 검색어 (warm 이면 목록을 돌려 씀)"""
+    base = terms or APPS[app]['terms']
+    if warm:
+        return [base[i % len(base)] for i in range(runs)]
+    return [f"{base[i % len(base)]} {i // len(base) + 1}" if i >= len(base) else base[i] for i in range(runs)]
+
+
+def run_one(module, spec, term):
+    """검색 1회 실행 → 측정 결과"""
+    state = getattr(module, spec['initial_state'])(term)
+    started = time.perf_counter()
+    try:
+        final = getattr(module, spec['graph']).invoke(state)
+    except Exception as e:
+        return {'term': term, 'seconds': time.perf_counter() - started, 'error': f"{type(e).__name__}: {e}"}
+    return {
+        'term': term,
+        'seconds': time.perf_counter() - started,
+        'method': final.get('search_method') or "none",
+        'pros': len(final.get('pros') or []),
+        'cons': len(final.get('cons') or []),
+        'partial': bool((final.get('results') or {}).get('partial')),
+        'error': final.get('error') or ""
+    }
+
+
+def latency_summary(seconds):
+    values = sorted(seconds)
+    if not values:
+        return {}
+    return {
+        'p50_ms': round(percentile(values, 50) * 1000, 1),
+        'p95_ms': round(percentile(values, 95) * 1000, 1),
+        'max_ms': round(values[-1] * 1000, 1),
+        'mean_ms': round(sum(values) / len(values) * 1000, 1)
+    }
+
+
+def run_benchmark(args):
+    spec = APPS[args.app]
+    cache_dir = args.cache_dir or tempfile.mkdtemp(prefix="smart-bench-")
+    with FakeServices(
+        api_latency=args.api_latency, page_latency=args.page_latency, page_failure_rate=args.page_failure_rate,
+        llm_delay=args.llm_delay, db_latency=args.db_latency, seed=args.seed
+    ) as services:
+        env = dict(services.env(args.storage), SMART_CACHE_DIR=cache_dir)
+        if args.deadline:
+            env['SEARCH_DEADLINE'] = str(args.deadline)
+        module = load_app(args.app, env)
+        services.reset()
+
+        terms = search_terms(args.app, args.runs, args.warm, args.terms)
+        started = time.perf_counter()
+        if args.warm:
+            # 검색어마다 한 번씩 수집해 저장 결과를 만든 뒤 측정
+            for term in dict.fromkeys(terms):
+                run_one(module, spec, term)
+            if getattr(module, 'WRITE_BEHIND_ENABLED', False):
+                module.get_write_behind().flush(timeout=30)
+            services.reset()
+            started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(lambda term: run_one(module, spec, term), terms))
+        wall = time.perf_counter() - started
+        if getattr(module, 'WRITE_BEHIND_ENABLED', False):
+            module.get_write_behind().flush(timeout=30)
+        calls = services.calls()
+
+    completed = [result for result in results if not result['error'] or 'method' in result]
+    return {
+        'app': args.app,
+        'runs': len(results),
+        'concurrency': args.concurrency,
+        'warm': args.warm,
+        'storage': args.storage,
+        'settings': {
+            'api_latency': args.api_latency, 'page_latency': args.page_latency, 'page_failure_rate': args.page_failure_rate,
+            'llm_delay': args.llm_delay, 'db_latency': args.db_latency, 'deadline': args.deadline, 'seed': args.seed
+        },
+        'latency': latency_summary([result['seconds'] for result in completed]),
+        'throughput_per_s': round(len(completed) / wall, 3) if wall else None,
+        'wall_seconds': round(wall, 3),
+        'outcomes': dict(Counter(result.get('method', 'exception') for result in results)),
+        'partial': sum(result.get('partial', False) for result in results),
+        'errors': [result for result in results if result['error']],
+        'calls': calls,
+        'calls_per_search': {
+            server: {key: round(value / len(results), 2) for key, value in counts.items()}
+            for server, counts in calls.items()
+        },
+        'stages': module.get_metrics().stage_summary(),
+        'searches': results
+    }
+
+
+def print_report(report):
+    print(f"\n[{report['app']}] 검색 {report['runs']}회, 동시 {report['concurrency']}개, "
+          f"{'저장 결과 재사용' if report['warm'] else '웹 수집'}, 저장소 {report['storage']}")
+    latency = report['latency']
+    if latency:
+        print(f"  지연 시간  p50 {latency['p50_ms']:.0f}ms · p95 {latency['p95_ms']:.0f}ms · 최대 {latency['max_ms']:.0f}ms · 평균 {latency['mean_ms']:.0f}ms")
+    print(f"  처리량     {report['throughput_per_s']}회/초 (전체 {report['wall_seconds']}초)")
+    print(f"  결과       {report['outcomes']} · 부분 결과 {report['partial']}회 · 오류 {len(report['errors'])}회")
+    for server, counts in report['calls'].items():
+        if counts:
+            per_search = report['calls_per_search'][server]
+            print(f"  {server:10} " + ", ".join(f"{key} {value} ({per_search[key]}/검색)" for key, value in sorted(counts.items())))
+    if report['warm'] and report['stages']:
+        print("  (단계별 통계는 예열 수집 포함)")
+    for stage, entry in report['stages'].items():
+        print(f"  단계 {stage:10} {entry['count']:5}회 · p50 {entry['p50_ms']:.0f}ms · p99 {entry['p99_ms']:.0f}ms · 오류 {entry['errors']}")
+    for error in report['errors'][:5]:
+        print(f"  ⚠️ {error['term']}: {error['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 대역 서버로 검색 워크플로우 전체 경로 벤치마크")
+    parser.add_argument('--app', choices=sorted(APPS), default='product')
+    parser.add_argument('--runs', type=int, default=8, help="검색 횟수")
+    parser.add_argument('--concurrency', type=int, default=1, help="동시에 실행할 검색 수")
+    parser.add_argument('--terms', nargs='+', help="검색어 목록 (기본: 앱별 인기 검색어)")
+    parser.add_argument('--warm', action='store_true', help="같은 검색어를 반복해 저장 결과/캐시 경로 측정")
+    parser.add_argument('--storage', choices=['supabase', 'sqlite'], default='supabase', help="supabase: PostgREST 대역 서버")
+    parser.add_argument('--api-latency', type=float, default=0.05, help="네이버 검색 API 응답 지연 (초)")
+    parser.add_argument('--page-latency', type=float, default=0.2, help="블로그/뉴스 페이지 응답 지연 (초)")
+    parser.add_argument('--page-failure-rate', type=float, default=0.0, help="페이지 요청 실패(503) 비율")
+    parser.add_argument('--llm-delay', type=float, default=0.5, help="LLM 응답 지연 (초)")
+    parser.add_argument('--db-latency', type=float, default=0.01, help="Supabase 대역 응답 지연 (초)")
+    parser.add_argument('--deadline', type=float, help="검색 마감 (SEARCH_DEADLINE, 초)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cache-dir', help="앱 캐시 디렉터리 (기본: 새 임시 디렉터리)")
+    parser.add_argument('--json', help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+    if args.storage == 'supabase' and importlib.util.find_spec('supabase') is None:
+        parser.error("supabase 패키지가 없습니다 (pip install supabase) - 로컬 SQLite 로 측정하려면 --storage sqlite")
+
+    report = run_benchmark(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n{args.json} 저장")
+
+
+if __name__ == "__main__":
+    main()
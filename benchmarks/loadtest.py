@@ -0,0 +1,420 @@
+"""
+다중 세션 부하 시험 - Streamlit AppTest 세션 N개를 동시에 띄워 한 서버 프로세스의 공유 자원
+(get_crawler, get_supabase_client, 작업 실행기, 조회 캐시 등 @st.cache_resource)을 함께 쓰게 하고
+세션별 지연 시간, 서버 CPU/메모리, 오류율을 측정
+
+    python -m benchmarks.loadtest --app career --sessions 8 --actions 6
+    python -m benchmarks.loadtest --app product --sessions 16 --mix cached=5,cold=2,points=3 --json load.json
+    python -m benchmarks.loadtest --storage supabase --page-latency 0.4 --llm-delay 1.0
+
+세션은 사용자 한 명처럼 첫 화면을 연 뒤 --mix 비율에 따라 동작을 고릅니다.
+    cached  저장 결과가 있는 검색어 검색 (시작 전에 한 번씩 수집해 둠)
+    cold    처음 보는 검색어 검색 (웹 수집 경로)
+    mbti    MBTI 탭에서 유형 선택 후 직업 추천 (career 앱만)
+    points  저장된 장단점 검색
+검색은 버튼을 누른 뒤 진행 영역이 1초마다 다시 그려지는 것처럼 --poll 간격으로 화면을 다시 실행해
+결과가 그려질 때까지의 시간을 잽니다. 외부 서비스는 fake_services 대역 서버를 씁니다.
+
+AppTest 는 화면을 실행할 때마다 프로세스 전역 Streamlit 런타임을 바꿔 끼우므로 화면 실행은 한 번에
+하나씩 합니다 (대기 시간은 따로 기록). 검색 작업, 공유 자원, 대역 서버 호출은 세션끼리 동시에 진행됩니다.
+
+오류는 처리되지 않은 예외, 시간 초과, 그리고 세션 첫 화면에 없던 st.error 메시지로 셉니다
+(폰트 다운로드 실패처럼 첫 화면부터 있던 메시지는 환경 문제로 보고 따로 표시).
+"""
+
+import argparse
+import importlib.util
+import itertools
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.e2e import APPS  # noqa: E402
+from benchmarks.fake_services import FakeServices  # noqa: E402
+from result_cache import percentile  # noqa: E402
+
+# 앱별 화면 요소 (AppTest 에서 찾을 key / 라벨)
+SCREENS = {
+    'product': {'file': 'test_app.py', 'search_input': 'product_search_input', 'points': ["배터리", "발열", "무게", "가격"]},
+    'career': {'file': 'test_app2.py', 'search_input': 'career_search_input', 'points': ["연봉", "야근", "워라밸", "성장"]}
+}
+SEARCH_BUTTON = "🔍 검색하기"
+SEARCH_FAILED = "검색 중 오류가 발생했습니다"
+
+# AppTest 화면 실행은 전역 런타임을 쓰므로 세션 사이에서 하나씩 실행
+RUN_LOCK = threading.Lock()
+
+DEFAULT_MIX = {'product': "cached=5,cold=2,points=3", 'career': "cached=4,cold=2,mbti=3,points=1"}
+
+
+def parse_mix(text, app):
+    mix = {}
+    for part in text.split(','):
+        action, _, weight = part.partition('=')
+        action = action.strip()
+        if action not in ('cached', 'cold', 'mbti', 'points'):
+            raise ValueError(f"알 수 없는 동작: {action}")
+        if action == 'mbti' and app != 'career':
+            raise ValueError("mbti 동작은 career 앱에만 있습니다")
+        mix[action] = float(weight or 1)
+    return mix
+
+
+def quiet_streamlit():
+    """화면 없이 실행할 때 나오는 Streamlit 경고 숨김 (설정을 읽을 때 로그 수준이 다시 정해지므로 필터로 거름)"""
+    import streamlit  # noqa: F401
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).addFilter(lambda record: record.levelno >= logging.ERROR)
+
+
+class ResourceSampler:
+    """서버 프로세스 CPU 사용률과 메모리(RSS)를 주기적으로 기록 (세션과 검색 작업이 모두 이 프로세스에서 실행)"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="load-sampler", daemon=True)
+
+    @staticmethod
+    def rss_mb():
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1048576
+        except (OSError, ValueError, IndexError):
+            # /proc 이 없으면 최대 사용량 (Linux: KB, macOS: 바이트)
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak / (1048576 if sys.platform == "darwin" else 1024)
+
+    def _run(self):
+        last_wall, last_cpu = time.perf_counter(), time.process_time()
+        while not self._stop.wait(self.interval):
+            wall, cpu = time.perf_counter(), time.process_time()
+            self.samples.append({
+                'cpu_percent': round((cpu - last_cpu) / (wall - last_wall) * 100, 1),
+                'rss_mb': round(self.rss_mb(), 1)
+            })
+            last_wall, last_cpu = wall, cpu
+
+    def __enter__(self):
+        self.start_rss = self.rss_mb()
+        self.start_cpu = time.process_time()
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.cpu_seconds = time.process_time() - self.start_cpu
+        self.wall_seconds = time.perf_counter() - self.started
+
+    def summary(self):
+        cpu = sorted(sample['cpu_percent'] for sample in self.samples)
+        rss = [sample['rss_mb'] for sample in self.samples] or [self.start_rss]
+        return {
+            'cpu_seconds': round(self.cpu_seconds, 2),
+            'cpu_percent_mean': round(self.cpu_seconds / self.wall_seconds * 100, 1) if self.wall_seconds else None,
+            'cpu_percent_p95': percentile(cpu, 95) if cpu else None,
+            'cpu_percent_max': cpu[-1] if cpu else None,
+            'rss_mb_start': round(self.start_rss, 1),
+            'rss_mb_peak': max(rss),
+            'rss_mb_end': rss[-1],
+            'samples': self.samples
+        }
+
+
+class Session:
+    """AppTest 로 흉내 낸 사용자 한 명 (첫 화면 → --mix 비율로 고른 동작 반복)"""
+
+    def __init__(self, index, app, options, cold_terms, rng):
+        from streamlit.testing.v1 import AppTest
+        self.index = index
+        self.app = app
+        self.options = options
+        self.screen = SCREENS[app]
+        self.cold_terms = cold_terms
+        self.rng = rng
+        self.at = AppTest.from_file(os.path.join(ROOT, self.screen['file']), default_timeout=options.run_timeout)
+        self.baseline_errors = set()
+        self.actions = []
+        self.runs = []
+        self.waits = []
+
+    def run(self):
+        """화면 1회 실행 (다른 세션의 화면 실행을 기다린 시간과 스크립트 전체 재실행 시간 기록)"""
+        waited = time.perf_counter()
+        with RUN_LOCK:
+            started = time.perf_counter()
+            self.waits.append(started - waited)
+            self.at.run()
+            self.runs.append(time.perf_counter() - started)
+
+    def problems(self):
+        """첫 화면에 없던 오류 메시지와 예외"""
+        found = [f"예외: {e.message}" for e in self.at.exception]
+        found += [error.value for error in self.at.error if error.value not in self.baseline_errors]
+        return found
+
+    def record(self, kind, started, error="", **extra):
+        self.actions.append(dict(kind=kind, seconds=time.perf_counter() - started, error=error, **extra))
+
+    def open(self):
+        started = time.perf_counter()
+        try:
+            self.run()
+        except Exception as e:
+            self.record('load', started, error=f"{type(e).__name__}: {e}")
+            return False
+        self.baseline_errors = {error.value for error in self.at.error}
+        problems = [f"예외: {e.message}" for e in self.at.exception]
+        self.record('load', started, error="; ".join(problems))
+        return not problems
+
+    def search(self, kind, term):
+        started = time.perf_counter()
+        self.at.text_input(key=self.screen['search_input']).set_value(term)
+        next(button for button in self.at.button if button.label == SEARCH_BUTTON).click()
+        self.run()
+        deadline = started + self.options.search_timeout
+        while True:
+            job = self.at.session_state['search_job'] if 'search_job' in self.at.session_state else None
+            problems = self.problems()
+            if problems or not job or job['counted'] or any(SEARCH_FAILED in error.value for error in self.at.error):
+                break
+            if time.perf_counter() > deadline:
+                problems = [f"시간 초과 ({self.options.search_timeout:.0f}초)"]
+                break
+            time.sleep(self.options.poll)
+            self.run()
+        self.record(kind, started, error="; ".join(problems), term=term, joined=bool(job and job['joined']))
+
+    def mbti(self):
+        started = time.perf_counter()
+        selector = self.at.selectbox(key="mbti_selector")
+        selector.set_value(self.rng.choice(selector.options))
+        self.at.button(key="mbti_recommend").click()
+        self.run()
+        self.record('mbti', started, error="; ".join(self.problems()))
+
+    def points(self):
+        started = time.perf_counter()
+        self.at.text_input(key="point_search_input").set_value(self.rng.choice(self.screen['points']))
+        self.run()
+        self.record('points', started, error="; ".join(self.problems()))
+
+    def act(self, kind):
+        if kind == 'cached':
+            self.search(kind, self.rng.choice(self.options.cached_terms))
+        elif kind == 'cold':
+            self.search(kind, next(self.cold_terms))
+        elif kind == 'mbti':
+            self.mbti()
+        else:
+            self.points()
+
+    def play(self, mix):
+        if not self.open():
+            return
+        kinds, weights = zip(*mix.items())
+        for _ in range(self.options.actions):
+            time.sleep(self.rng.uniform(0.5, 1.5) * self.options.think)
+            kind = self.rng.choices(kinds, weights)[0]
+            started = time.perf_counter()
+            try:
+                self.act(kind)
+            except Exception as e:
+                self.record(kind, started, error=f"{type(e).__name__}: {e}")
+
+    def summary(self):
+        by_kind = defaultdict(list)
+        for action in self.actions:
+            by_kind[action['kind']].append(action['seconds'])
+        return {
+            'session': self.index,
+            'actions': len(self.actions),
+            'errors': sum(bool(action['error']) for action in self.actions),
+            'latency': {kind: latency_summary(values) for kind, values in by_kind.items()},
+            'script_run': latency_summary(self.runs),
+            'run_wait': latency_summary(self.waits),
+            'timeline': self.actions
+        }
+
+
+def latency_summary(seconds):
+    values = sorted(seconds)
+    if not values:
+        return {}
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 50) * 1000, 1),
+        'p95_ms': round(percentile(values, 95) * 1000, 1),
+        'max_ms': round(values[-1] * 1000, 1)
+    }
+
+
+def warm_up(app, options):
+    """cached 동작에 쓸 검색어를 미리 한 번씩 수집해 저장 (측정하지 않음)"""
+    session = Session(-1, app, options, iter(()), random.Random(0))
+    if not session.open():
+        raise RuntimeError(f"첫 화면 실행 실패: {session.actions[-1]['error']}")
+    for term in options.cached_terms:
+        session.search('warm', term)
+        if session.actions[-1]['error']:
+            print(f"  예열 검색 실패 ({term}): {session.actions[-1]['error']}")
+
+
+def run_load(args):
+    mix = parse_mix(args.mix or DEFAULT_MIX[args.app], args.app)
+    args.cached_terms = args.terms or APPS[args.app]['terms']
+    base_terms = APPS[args.app]['terms']
+    counter = itertools.count(1)
+    lock = threading.Lock()
+
+    def cold_terms():
+        while True:
+            with lock:
+                n = next(counter)
+            yield f"{base_terms[n % len(base_terms)]} 부하 {n}"
+
+    cache_dir = args.cache_dir or tempfile.mkdtemp(prefix="smart-load-")
+    with FakeServices(
+        api_latency=args.api_latency, page_latency=args.page_latency, page_failure_rate=args.page_failure_rate,
+        llm_delay=args.llm_delay, db_latency=args.db_latency, seed=args.seed
+    ) as services:
+        os.environ.update(services.env(args.storage), SMART_CACHE_DIR=cache_dir)
+        os.environ.pop('METRICS_PORT', None)
+        quiet_streamlit()
+        if 'cached' in mix:
+            print(f"예열: {', '.join(args.cached_terms)}")
+            warm_up(args.app, args)
+        services.reset()
+
+        shared_cold = cold_terms()
+        sessions = [
+            Session(i, args.app, args, shared_cold, random.Random(args.seed * 1000 + i))
+            for i in range(args.sessions)
+        ]
+        threads = []
+        with ResourceSampler(args.sample_interval) as sampler:
+            for i, session in enumerate(sessions):
+                thread = threading.Thread(target=session.play, args=(mix,), name=f"load-session-{i}")
+                thread.start()
+                threads.append(thread)
+                if args.ramp:
+                    time.sleep(args.ramp / args.sessions)
+            for thread in threads:
+                thread.join()
+        calls = services.calls()
+
+    actions = [action for session in sessions for action in session.actions]
+    by_kind = defaultdict(list)
+    for action in actions:
+        by_kind[action['kind']].append(action['seconds'])
+    errors = [dict(action, session=session.index) for session in sessions for action in session.actions if action['error']]
+    return {
+        'app': args.app,
+        'sessions': args.sessions,
+        'actions_per_session': args.actions,
+        'mix': mix,
+        'storage': args.storage,
+        'settings': {
+            'api_latency': args.api_latency, 'page_latency': args.page_latency, 'page_failure_rate': args.page_failure_rate,
+            'llm_delay': args.llm_delay, 'db_latency': args.db_latency, 'think': args.think, 'poll': args.poll,
+            'ramp': args.ramp, 'seed': args.seed
+        },
+        'wall_seconds': round(sampler.wall_seconds, 2),
+        'actions': len(actions),
+        'error_rate': round(len(errors) / len(actions), 4) if actions else None,
+        'latency': {kind: latency_summary(values) for kind, values in by_kind.items()},
+        'script_run': latency_summary([seconds for session in sessions for seconds in session.runs]),
+        'run_wait': latency_summary([seconds for session in sessions for seconds in session.waits]),
+        'joined_searches': sum(action.get('joined', False) for action in actions),
+        'server': sampler.summary(),
+        'environment_errors': sorted(set().union(*(session.baseline_errors for session in sessions))),
+        'errors': errors,
+        'calls': calls,
+        'per_session': [session.summary() for session in sessions]
+    }
+
+
+def print_report(report):
+    print(f"\n[{report['app']}] 세션 {report['sessions']}개 × 동작 {report['actions_per_session']}회, "
+          f"비율 {report['mix']}, 저장소 {report['storage']} ({report['wall_seconds']}초)")
+    for kind, entry in report['latency'].items():
+        print(f"  {kind:8} {entry['count']:4}회 · p50 {entry['p50_ms']:.0f}ms · p95 {entry['p95_ms']:.0f}ms · 최대 {entry['max_ms']:.0f}ms")
+    run = report['script_run']
+    if run:
+        wait = report['run_wait']
+        print(f"  화면 실행 {run['count']:4}회 · p50 {run['p50_ms']:.0f}ms · p95 {run['p95_ms']:.0f}ms · 최대 {run['max_ms']:.0f}ms "
+              f"(실행 대기 p50 {wait['p50_ms']:.0f}ms · p95 {wait['p95_ms']:.0f}ms)")
+    server = report['server']
+    print(f"  서버 CPU  평균 {server['cpu_percent_mean']}% · p95 {server['cpu_percent_p95']}% · 최대 {server['cpu_percent_max']}% "
+          f"(CPU 시간 {server['cpu_seconds']}초)")
+    print(f"  메모리    시작 {server['rss_mb_start']}MB · 최대 {server['rss_mb_peak']}MB · 끝 {server['rss_mb_end']}MB")
+    print(f"  오류율    {report['error_rate'] * 100 if report['error_rate'] is not None else 0:.1f}% "
+          f"({len(report['errors'])}/{report['actions']}) · 진행 중 검색 합류 {report['joined_searches']}회")
+    for server_name, counts in report['calls'].items():
+        if counts:
+            print(f"  {server_name:10} " + ", ".join(f"{key} {value}" for key, value in sorted(counts.items())))
+    print("  세션별:")
+    for entry in report['per_session']:
+        parts = [f"{kind} p50 {value['p50_ms']:.0f}ms" for kind, value in entry['latency'].items()]
+        print(f"    #{entry['session']:<3} 동작 {entry['actions']} · 오류 {entry['errors']} · " + " · ".join(parts))
+    for message in report['environment_errors']:
+        print(f"  (환경) {message[:100]}")
+    for error in report['errors'][:5]:
+        print(f"  ⚠️ 세션 #{error['session']} {error['kind']}: {error['error'][:160]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AppTest 세션 여러 개로 Streamlit 앱 부하 시험")
+    parser.add_argument('--app', choices=sorted(SCREENS), default='career')
+    parser.add_argument('--sessions', type=int, default=4, help="동시 세션 수")
+    parser.add_argument('--actions', type=int, default=5, help="세션별 동작 수 (첫 화면 제외)")
+    parser.add_argument('--mix', help="동작 비율 (예: cached=4,cold=2,mbti=3,points=1)")
+    parser.add_argument('--terms', nargs='+', help="cached 동작 검색어 (기본: 앱별 인기 검색어)")
+    parser.add_argument('--think', type=float, default=0.5, help="동작 사이 평균 대기 시간 (초)")
+    parser.add_argument('--poll', type=float, default=1.0, help="검색 진행 중 화면을 다시 실행하는 간격 (초)")
+    parser.add_argument('--ramp', type=float, default=0.0, help="세션을 이 시간(초)에 걸쳐 나눠 시작")
+    parser.add_argument('--run-timeout', type=float, default=60.0, help="화면 1회 실행 제한 시간 (초)")
+    parser.add_argument('--search-timeout', type=float, default=120.0, help="검색 1회 제한 시간 (초)")
+    parser.add_argument('--sample-interval', type=float, default=0.5, help="CPU/메모리 기록 간격 (초)")
+    parser.add_argument('--storage', choices=['supabase', 'sqlite'], default='supabase', help="supabase: PostgREST 대역 서버")
+    parser.add_argument('--api-latency', type=float, default=0.05, help="네이버 검색 API 응답 지연 (초)")
+    parser.add_argument('--page-latency', type=float, default=0.2, help="블로그/뉴스 페이지 응답 지연 (초)")
+    parser.add_argument('--page-failure-rate', type=float, default=0.0, help="페이지 요청 실패(503) 비율")
+    parser.add_argument('--llm-delay', type=float, default=0.5, help="LLM 응답 지연 (초)")
+    parser.add_argument('--db-latency', type=float, default=0.01, help="Supabase 대역 응답 지연 (초)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cache-dir', help="앱 캐시 디렉터리 (기본: 새 임시 디렉터리)")
+    parser.add_argument('--json', help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+    if args.storage == 'supabase' and importlib.util.find_spec('supabase') is None:
+        parser.error("supabase 패키지가 없습니다 (pip install supabase) - 로컬 SQLite 로 측정하려면 --storage sqlite")
+    try:
+        parse_mix(args.mix or DEFAULT_MIX[args.app], args.app)
+    except ValueError as e:
+        parser.error(str(e))
+
+    report = run_load(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n{args.json} 저장")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""
+마이크로 벤치마크 - 텍스트 처리/시각화 핫 패스를 고정 한국어 말뭉치로 반복 측정해
+커밋 사이 성능 변화를 비교
+
+    python -m benchmarks.micro                                  # .benchmarks/micro_<커밋>.json 저장
+    python -m benchmarks.micro -k keywords parse                # 이름에 들어간 문자열로 골라 실행
+    python -m benchmarks.micro --compare .benchmarks/micro_abc1234.json --fail-threshold 20
+    python -m benchmarks.micro --font /path/to/NanumGothic.ttf  # 워드클라우드 포함
+
+측정 대상: 키워드 추출, 장단점 중복 제거, HTML 태그 제거, 저장해 둔 페이지의 본문 해석,
+카테고리 분류, 워드클라우드, Plotly 차트 생성 (두 앱의 함수를 그대로 불러 씀).
+말뭉치는 benchmarks/fixtures 의 review_points.json / blog_post.html / news_article.html /
+naver_blog.json 으로 고정되어 있어 실행마다 같은 입력을 씁니다.
+
+측정 방식은 timeit 과 같습니다 - 한 라운드가 --min-time 이상 걸리도록 반복 횟수를 정한 뒤
+--rounds 라운드를 GC 를 끈 채 실행하고, 라운드마다 1회 평균 시간을 기록합니다.
+결과 JSON 은 pytest-benchmark 저장 형식(machine_info / commit_info / benchmarks[].stats)을 따릅니다.
+
+워드클라우드는 한글 폰트가 필요합니다 - 앱과 같은 경로(NanumGothic.ttf 등)에 없고 --font 도 없으면
+건너뛴 것으로 기록합니다.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+DEFAULT_DIR = os.path.join(ROOT, ".benchmarks")
+
+sys.path.insert(0, ROOT)
+
+# 앱과 같은 순서로 찾는 한글 폰트 경로 (create_wordcloud)
+FONT_PATHS = [
+    "./NanumGothic.ttf",
+    "./fonts/NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc"
+]
+
+# 등록된 벤치마크: (이름, 그룹, 준비 함수) - 준비 함수는 측정할 인자 없는 함수를 반환
+BENCHMARKS = []
+
+
+class Skip(Exception):
+    """준비 단계에서 측정할 수 없는 벤치마크 (사유를 결과에 기록)"""
+
+
+def benchmark(name, group):
+    def register(setup):
+        BENCHMARKS.append((name, group, setup))
+        return setup
+    return register
+
+
+def load_fixture(name):
+    path = os.path.join(FIXTURES, name)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f) if name.endswith('.json') else f.read()
+
+
+def load_apps(cache_dir):
+    """두 앱 모듈을 화면 없이 불러오기 (로컬 SQLite, 임시 캐시 디렉터리 - 외부 서비스는 호출하지 않음)"""
+    import importlib
+    os.environ.setdefault('OPENAI_API_KEY', 'bench')
+    os.environ.setdefault('NAVER_CLIENT_ID', 'bench')
+    os.environ.setdefault('NAVER_CLIENT_SECRET', 'bench')
+    os.environ['STORAGE_BACKEND'] = 'sqlite'
+    os.environ['SMART_CACHE_DIR'] = cache_dir
+    os.environ.pop('METRICS_PORT', None)
+    # 화면 관련 경고 숨김 - Streamlit 이 설정을 읽을 때 로그 수준을 다시 정하므로 수준 대신 필터로 거름
+    import streamlit  # noqa: F401
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).addFilter(lambda record: record.levelno >= logging.ERROR)
+    return importlib.import_module('test_app'), importlib.import_module('test_app2')
+
+
+class Context:
+    """벤치마크 준비 함수가 함께 쓰는 입력 (앱 모듈, 말뭉치)"""
+
+    def __init__(self, product, career, font=None):
+        self.product = product
+        self.career = career
+        self.font = font
+        self.points = load_fixture("review_points.json")
+        self.blog_html = load_fixture("blog_post.html")
+        self.news_html = load_fixture("news_article.html")
+        items = load_fixture("naver_blog.json")['items'] + load_fixture("naver_news.json")['items']
+        # 검색 결과 제목/요약 (<b> 강조 태그, HTML 엔티티 포함) - 한 번 검색에서 처리하는 양 정도로 반복
+        self.snippets = [item[key] for item in items for key in ('title', 'description')] * 5
+        self._product_crawler = None
+        self._career_crawler = None
+
+    @property
+    def product_crawler(self):
+        if self._product_crawler is None:
+            self._product_crawler = self.product.ProConsLaptopCrawler('bench', 'bench')
+        return self._product_crawler
+
+    @property
+    def career_crawler(self):
+        if self._career_crawler is None:
+            self._career_crawler = self.career.CareerInfoCrawler('bench', 'bench')
+        return self._career_crawler
+
+
+# ========================
+# 텍스트 처리
+# ========================
+
+@benchmark("extract_keywords[product]", "text")
+def bench_keywords_product(ctx):
+    texts = ctx.points['product']['pros'] + ctx.points['product']['cons']
+    return lambda: ctx.product.extract_keywords(texts)
+
+
+@benchmark("extract_keywords[career]", "text")
+def bench_keywords_career(ctx):
+    texts = ctx.points['career']['pros'] + ctx.points['career']['cons']
+    return lambda: ctx.career.extract_keywords(texts)
+
+
+@benchmark("deduplicate_points[product]", "text")
+def bench_deduplicate_product(ctx):
+    points = ctx.points['product']['pros']
+    return lambda: ctx.product_crawler.deduplicate_points(points)
+
+
+@benchmark("deduplicate_points[career]", "text")
+def bench_deduplicate_career(ctx):
+    points = ctx.points['career']['cons']
+    return lambda: ctx.career_crawler.deduplicate_points(points)
+
+
+@benchmark("remove_html_tags", "text")
+def bench_remove_html_tags(ctx):
+    crawler = ctx.product_crawler
+    snippets = ctx.snippets
+    return lambda: [crawler.remove_html_tags(text) for text in snippets]
+
+
+@benchmark("categorize_points", "text")
+def bench_categorize(ctx):
+    from analysis_store import categorize_points, PRODUCT_CATEGORIES
+    pros = ctx.points['product']['pros']
+    cons = ctx.points['product']['cons']
+    return lambda: (categorize_points(pros, PRODUCT_CATEGORIES), categorize_points(cons, PRODUCT_CATEGORIES))
+
+
+# ========================
+# 본문 해석 (저장해 둔 페이지)
+# ========================
+
+@benchmark("parse_content[blog]", "parse")
+def bench_parse_blog(ctx):
+    crawler = ctx.product_crawler
+    html = ctx.blog_html.encode('utf-8')
+    if not crawler.parse_content(html):
+        raise Skip("블로그 본문을 찾지 못했습니다 (고정 페이지 확인 필요)")
+    return lambda: crawler.parse_content(html)
+
+
+@benchmark("parse_content[news]", "parse")
+def bench_parse_news(ctx):
+    crawler = ctx.career_crawler
+    html = ctx.news_html.encode('utf-8')
+    url = "https://news.example.com/article/1"
+    if not crawler.parse_content(url, html):
+        raise Skip("기사 본문을 찾지 못했습니다 (고정 페이지 확인 필요)")
+    return lambda: crawler.parse_content(url, html)
+
+
+# ========================
+# 시각화
+# ========================
+
+@benchmark("create_comparison_chart", "chart")
+def bench_comparison_chart(ctx):
+    pros = ctx.points['product']['pros']
+    cons = ctx.points['product']['cons']
+    return lambda: ctx.product.create_comparison_chart(pros, cons)
+
+
+@benchmark("create_pros_cons_chart", "chart")
+def bench_pros_cons_chart(ctx):
+    return lambda: ctx.product.create_pros_cons_chart(24, 17)
+
+
+@benchmark("create_salary_chart", "chart")
+def bench_salary_chart(ctx):
+    salary_info = ctx.career_crawler.get_career_salary_info("데이터 분석가")
+    return lambda: ctx.career.create_salary_chart(salary_info, "데이터 분석가")
+
+
+@benchmark("create_career_path_timeline", "chart")
+def bench_career_path(ctx):
+    career_path = ctx.career_crawler.get_career_path("데이터 분석가")
+    return lambda: ctx.career.create_career_path_timeline(career_path)
+
+
+@benchmark("create_wordcloud", "chart")
+def bench_wordcloud(ctx):
+    texts = ctx.points['product']['pros']
+    word_freq = ctx.product.extract_keywords(texts)
+    if not ctx.font:
+        raise Skip("한글 폰트가 없습니다 (--font 로 지정)")
+    return lambda: ctx.product.create_wordcloud(texts, "", "Greens", word_freq=word_freq)
+
+
+# ========================
+# 측정
+# ========================
+
+def calibrate(fn, min_time):
+    """한 라운드가 min_time 이상 걸리는 반복 횟수 (1, 2, 5, 10, 20, ... 순으로 늘림)"""
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            iterations = number * factor
+            started = time.perf_counter()
+            for _ in range(iterations):
+                fn()
+            if time.perf_counter() - started >= min_time:
+                return iterations
+        number *= 10
+
+
+def measure(fn, rounds, min_time):
+    """라운드별 1회 평균 시간 목록 (초)"""
+    fn()  # 첫 호출 (지연 import, 캐시 준비) 은 측정하지 않음
+    iterations = calibrate(fn, min_time)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        data = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                fn()
+            data.append((time.perf_counter() - started) / iterations)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return data, iterations
+
+
+def summarize(data, iterations):
+    mean = statistics.fmean(data)
+    return {
+        'min': min(data),
+        'max': max(data),
+        'mean': mean,
+        'median': statistics.median(data),
+        'stddev': statistics.stdev(data) if len(data) > 1 else 0.0,
+        'rounds': len(data),
+        'iterations': iterations,
+        'ops': 1 / mean if mean else None,
+        'data': data
+    }
+
+
+def git_commit():
+    def git(*args):
+        result = subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() if result.returncode == 0 else ""
+    try:
+        return {
+            'id': git('rev-parse', 'HEAD'),
+            'branch': git('rev-parse', '--abbrev-ref', 'HEAD'),
+            'dirty': bool(git('status', '--porcelain', '--untracked-files=no'))
+        }
+    except (OSError, subprocess.SubprocessError):
+        return {'id': "", 'branch': "", 'dirty': False}
+
+
+def machine_info():
+    return {
+        'node': platform.node(),
+        'processor': platform.processor(),
+        'machine': platform.machine(),
+        'python_implementation': platform.python_implementation(),
+        'python_version': platform.python_version(),
+        'system': platform.system(),
+        'release': platform.release(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def run(ctx, selected, rounds, min_time):
+    results = []
+    for name, group, setup in BENCHMARKS:
+        if selected and not any(keyword in name for keyword in selected):
+            continue
+        entry = {'name': name, 'group': group}
+        try:
+            fn = setup(ctx)
+            data, iterations = measure(fn, rounds, min_time)
+            entry['stats'] = summarize(data, iterations)
+        except Skip as e:
+            entry['skipped'] = str(e)
+        except Exception as e:
+            entry['error'] = f"{type(e).__name__}: {e}"
+        results.append(entry)
+        print_entry(entry)
+    return results
+
+
+def format_time(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f}ms"
+    return f"{seconds:8.3f}s "
+
+
+def print_entry(entry):
+    name = f"{entry['name']:32}"
+    if 'skipped' in entry:
+        print(f"  {name} 건너뜀 - {entry['skipped']}")
+    elif 'error' in entry:
+        print(f"  {name} ⚠️ {entry['error']}")
+    else:
+        stats = entry['stats']
+        print(f"  {name} 최소 {format_time(stats['min'])} · 중앙값 {format_time(stats['median'])} · "
+              f"표준편차 {format_time(stats['stddev'])} ({stats['rounds']}×{stats['iterations']})")
+
+
+def compare(current, baseline, threshold):
+    """기준 결과와 중앙값 비교 → threshold(%) 이상 느려진 벤치마크 이름 목록"""
+    before = {entry['name']: entry['stats'] for entry in baseline['benchmarks'] if 'stats' in entry}
+    short_id = (baseline.get('commit_info') or {}).get('id', "")[:7] or "기준"
+    print(f"\n{short_id} 대비 (중앙값)")
+    regressions = []
+    for entry in current:
+        old = before.get(entry['name'])
+        if not old or 'stats' not in entry:
+            continue
+        new_median = entry['stats']['median']
+        change = (new_median - old['median']) / old['median'] * 100 if old['median'] else 0.0
+        mark = ""
+        if threshold is not None and change >= threshold:
+            mark = " ⚠️ 느려짐"
+            regressions.append(entry['name'])
+        print(f"  {entry['name']:32} {format_time(old['median'])} → {format_time(new_median)} ({change:+6.1f}%){mark}")
+    return regressions
+
+
+def find_font(font):
+    if font:
+        if not os.path.exists(font):
+            raise SystemExit(f"폰트 파일이 없습니다: {font}")
+        return os.path.abspath(font)
+    paths = (os.path.join(ROOT, path) for path in FONT_PATHS)
+    return next((os.path.abspath(path) for path in paths if os.path.exists(path)), None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="텍스트 처리/시각화 핫 패스 마이크로 벤치마크")
+    parser.add_argument('-k', dest='selected', nargs='+', help="이름에 이 문자열이 들어간 벤치마크만 실행")
+    parser.add_argument('--rounds', type=int, default=7)
+    parser.add_argument('--min-time', type=float, default=0.05, help="라운드 1회 최소 시간 (초)")
+    parser.add_argument('--font', help="워드클라우드에 쓸 한글 폰트 파일")
+    parser.add_argument('--json', help="결과 JSON 경로 (기본: .benchmarks/micro_<커밋>.json)")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON")
+    parser.add_argument('--fail-threshold', type=float, help="중앙값이 이 비율(%%) 이상 느려지면 종료 코드 1")
+    parser.add_argument('--list', action='store_true', help="벤치마크 목록만 출력")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, group, _ in BENCHMARKS:
+            print(f"{group:6} {name}")
+        return
+
+    font = find_font(args.font)
+    cache_dir = tempfile.mkdtemp(prefix="smart-micro-")
+    cwd = os.getcwd()
+    # 앱은 실행 디렉터리 기준으로 폰트를 찾으므로 폰트를 넣어 둔 임시 디렉터리에서 실행
+    work_dir = os.path.join(cache_dir, "work")
+    os.makedirs(work_dir)
+    if font:
+        shutil.copy(font, os.path.join(work_dir, "NanumGothic.ttf"))
+    os.chdir(work_dir)
+    try:
+        product, career = load_apps(cache_dir)
+        ctx = Context(product, career, font=font)
+        print(f"마이크로 벤치마크 ({args.rounds}라운드, 라운드 최소 {args.min_time}초)")
+        results = run(ctx, args.selected, args.rounds, args.min_time)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    commit_info = git_commit()
+    report = {
+        'machine_info': machine_info(),
+        'commit_info': commit_info,
+        'datetime': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'version': "smart-micro/1",
+        'font': font,
+        'benchmarks': results
+    }
+    path = args.json or os.path.join(DEFAULT_DIR, f"micro_{commit_info['id'][:7] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n{path} 저장")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.fail_threshold)
+        if regressions:
+            print(f"\n{len(regressions)}개 벤치마크가 {args.fail_threshold}% 이상 느려졌습니다: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+호스트별 서킷 브레이커 - 크롤러 공용 모듈
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+# 브레이커 상태
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def host_of(url):
+    """URL에서 호스트 추출"""
+    return urlparse(url).netloc.lower()
+
+
+class HostCircuitBreaker:
+    """호스트 단위 서킷 브레이커 (closed → open → half-open)
+
+    연속 실패가 failure_threshold 회에 도달하면 호스트를 차단(open)하고,
+    reset_timeout 초가 지나면 한 건의 시험 요청(half-open)만 허용합니다.
+    시험 요청이 성공하면 다시 closed, 실패하면 다시 open 으로 돌아갑니다.
+    @st.cache_resource 로 여러 세션이 공유하므로 모든 상태 변경은 락으로 보호합니다.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _entry(self, host):
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = {
+                'state': CLOSED,
+                'failures': 0,
+                'opened_at': 0.0,
+                'probing': False,
+                'trips': 0,
+                'skipped': 0
+            }
+            self._hosts[host] = entry
+        return entry
+
+    def allow(self, host):
+        """요청 허용 여부 (차단된 호스트면 False)"""
+        with self._lock:
+            entry = self._entry(host)
+
+            if entry['state'] == OPEN:
+                if time.monotonic() - entry['opened_at'] < self.reset_timeout:
+                    entry['skipped'] += 1
+                    return False
+                # 대기 시간이 지나면 시험 요청 1건 허용
+                entry['state'] = HALF_OPEN
+                entry['probing'] = False
+
+            if entry['state'] == HALF_OPEN:
+                if entry['probing']:
+                    entry['skipped'] += 1
+                    return False
+                entry['probing'] = True
+
+            return True
+
+    def is_available(self, host):
+        """상태를 바꾸지 않고 요청 가능 여부만 확인"""
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None or entry['state'] == CLOSED:
+                return True
+            if entry['state'] == OPEN:
+                return time.monotonic() - entry['opened_at'] >= self.reset_timeout
+            return not entry['probing']
+
+    def record_success(self, host):
+        """요청 성공 기록"""
+        with self._lock:
+            entry = self._entry(host)
+            entry['state'] = CLOSED
+            entry['failures'] = 0
+            entry['probing'] = False
+
+    def release(self, host):
+        """성공/실패를 판단할 수 없이 끝난 요청 (검색 마감으로 타임아웃을 줄여 끊긴 경우 등) - 시험 요청 표시만 해제"""
+        with self._lock:
+            self._entry(host)['probing'] = False
+
+    def record_failure(self, host):
+        """요청 실패 기록 (타임아웃, 연결 오류, 429/5xx)"""
+        with self._lock:
+            entry = self._entry(host)
+            entry['probing'] = False
+
+            if entry['state'] == HALF_OPEN:
+                self._trip(entry)
+                return
+
+            entry['failures'] += 1
+            if entry['state'] == CLOSED and entry['failures'] >= self.failure_threshold:
+                self._trip(entry)
+
+    def _trip(self, entry):
+        entry['state'] = OPEN
+        entry['opened_at'] = time.monotonic()
+        entry['trips'] += 1
+
+    def snapshot(self):
+        """호스트별 상태 요약 (crawler.stats 표시용)"""
+        with self._lock:
+            return {
+                host: {
+                    'state': entry['state'],
+                    'failures': entry['failures'],
+                    'trips': entry['trips'],
+                    'skipped': entry['skipped']
+                }
+                for host, entry in self._hosts.items()
+            }
+
+    def total_trips(self):
+        """전체 차단 횟수"""
+        with self._lock:
+            return sum(entry['trips'] for entry in self._hosts.values())
@@ -0,0 +1,85 @@
+"""
+신규성 기반 조기 종료 - 포스트를 더 읽어도 새로운 장단점이 나오지 않으면 크롤링 중단
+"""
+
+from collections import deque
+
+
+def point_keywords(point):
+    """장단점 문장의 비교용 키워드 (deduplicate_points와 같은 기준)"""
+    return set(word for word in point.split() if len(word) > 2)
+
+
+def estimate_savings(remaining_candidates, budget, uses_llm=True):
+    """조기 종료로 아낀 (포스트 수, LLM 호출 수) - 예산 안에서 더 처리했을 양 기준"""
+    remaining_fetches = budget.remaining_fetches()
+    posts_saved = remaining_candidates if remaining_fetches is None else min(remaining_candidates, remaining_fetches)
+    if not uses_llm:
+        return posts_saved, 0
+    remaining_llm_calls = budget.remaining_llm_calls()
+    llm_calls_saved = posts_saved if remaining_llm_calls is None else min(posts_saved, remaining_llm_calls)
+    return posts_saved, llm_calls_saved
+
+
+class NoveltyTracker:
+    """포스트마다 새로 추가된(중복이 아닌) 장단점 수를 추적
+
+    최근 window 개 포스트의 평균 신규 포인트 수가 min_novelty 미만으로 떨어지면
+    수렴한 것으로 보고 크롤링을 멈춥니다. min_posts 개를 읽기 전에는 멈추지 않습니다.
+    중복 판정은 크롤러의 deduplicate_points 와 같은 키워드 50% 겹침 기준을 씁니다.
+    """
+
+    def __init__(self, window=3, min_novelty=1.0, min_posts=4):
+        self.window = window
+        self.min_novelty = min_novelty
+        self.min_posts = min_posts
+        self._seen = {'pros': set(), 'cons': set()}
+        self._recent = deque(maxlen=window)
+        self.history = []
+        self.unique_points = 0
+
+    def _is_novel(self, point, kind):
+        keywords = point_keywords(point)
+        seen = self._seen[kind]
+        if len(keywords & seen) < len(keywords) * 0.5:
+            seen.update(keywords)
+            return True
+        return False
+
+    def observe(self, pros, cons):
+        """포스트 1개의 추출 결과 반영, 신규 포인트 수 반환 (추출 실패는 빈 목록으로 전달)"""
+        novel = sum(1 for point in pros if self._is_novel(point, 'pros'))
+        novel += sum(1 for point in cons if self._is_novel(point, 'cons'))
+        self._recent.append(novel)
+        self.history.append(novel)
+        self.unique_points += novel
+        return novel
+
+    def marginal_novelty(self):
+        """최근 window 개 포스트의 평균 신규 포인트 수"""
+        if not self._recent:
+            return float('inf')
+        return sum(self._recent) / len(self._recent)
+
+    def converged(self):
+        """신규성이 기준 아래로 떨어졌는지 여부"""
+        if len(self.history) < max(self.min_posts, self.window):
+            return False
+        return self.marginal_novelty() < self.min_novelty
+
+    def window_change(self):
+        """최종 신규 포인트 중 최근 window 개 포스트가 기여한 비율 (추가 수집 시 변화량 추정치)"""
+        if not self.unique_points:
+            return 0.0
+        return sum(self._recent) / self.unique_points
+
+    def summary(self, posts_saved=0, llm_calls_saved=0):
+        """조기 종료 결과 요약"""
+        return {
+            'posts_observed': len(self.history),
+            'unique_points': self.unique_points,
+            'marginal_novelty': round(self.marginal_novelty(), 2) if self.history else None,
+            'window_change': round(self.window_change(), 3),
+            'posts_saved': posts_saved,
+            'llm_calls_saved': llm_calls_saved
+        }
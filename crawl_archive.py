@@ -0,0 +1,261 @@
+"""
+크롤링 원문 보관소 - 수집한 본문을 압축해 계속 덧붙여 두고, 프롬프트를 바꾸거나 새 분석을 할 때 다시 크롤링하지 않고 재사용
+
+구성 (디렉터리 하나):
+    <시각>-<pid>.seg   압축 블록을 이어 붙인 세그먼트 파일 (프로세스마다 따로 써서 잠금 없음)
+    <시각>-<pid>.idx   블록 색인 (JSONL, 블록당 1줄: 위치, 길이, 압축 방식, 건수, 수집 시각 범위, 이름 목록)
+
+블록 하나는 레코드 block_records 개를 JSONL 로 묶어 따로 압축한 것이라서, 읽는 쪽은 세그먼트를
+mmap 으로 열고 색인을 보고 필요한 블록만 풀 수 있습니다 (이름/시각으로 걸러 블록을 건너뜀).
+색인 줄은 블록을 다 쓴 뒤에 추가하므로, 쓰다가 멈춘 블록은 색인에 없어 읽히지 않습니다.
+
+압축은 zstandard 패키지가 있으면 zstd, 없으면 zlib 를 씁니다 (블록마다 방식을 기록).
+
+레코드: url (정규화된 주소), fetched_at, source_type, query, kind (product/career), name, title, text, content_hash
+
+확인: python crawl_archive.py stats [디렉터리]
+      python crawl_archive.py dump [디렉터리] --name "맥북 프로 M3" --limit 5
+"""
+
+import argparse
+import atexit
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+
+try:
+    import zstandard
+except ImportError:  # 선택 패키지
+    zstandard = None
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _compress(data, codec):
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data, codec):
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd 블록을 읽으려면 zstandard 패키지가 필요합니다")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class CrawlArchive:
+    """크롤링 원문 보관소 (덧붙이기 전용)
+
+    append() 는 레코드를 메모리에 모았다가 block_records 개가 되면 한 블록으로 압축해 씁니다.
+    flush() 로 남은 레코드를 바로 쓸 수 있고, 종료 시(atexit) 자동으로 씁니다.
+    세그먼트가 segment_bytes 를 넘으면 새 세그먼트를 시작합니다.
+    같은 프로세스에서 같은 주소의 같은 본문은 한 번만 보관합니다.
+    """
+
+    def __init__(self, path, block_records=64, segment_bytes=64 * 1024 * 1024, codec=None):
+        self.path = path
+        self.block_records = block_records
+        self.segment_bytes = segment_bytes
+        self.codec = codec or (CODEC_ZSTD if zstandard is not None else CODEC_ZLIB)
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._seen = set()
+        self._segment = None
+        self._segment_size = 0
+        self.stats = {'appended': 0, 'duplicates': 0, 'blocks': 0, 'raw_bytes': 0, 'stored_bytes': 0}
+        os.makedirs(path, exist_ok=True)
+        atexit.register(self.flush)
+
+    def append(self, url, text, kind, name, query='', source_type='blog', title='', fetched_at=None):
+        """본문 1건 보관 (이미 보관한 주소+본문이면 False)"""
+        digest = content_hash(text)
+        with self._lock:
+            if (url, digest) in self._seen:
+                self.stats['duplicates'] += 1
+                return False
+            self._seen.add((url, digest))
+            self._buffer.append({
+                'url': url,
+                'fetched_at': fetched_at or datetime.now(timezone.utc).isoformat(),
+                'source_type': source_type,
+                'query': query,
+                'kind': kind,
+                'name': name,
+                'title': title,
+                'text': text,
+                'content_hash': digest
+            })
+            self.stats['appended'] += 1
+            if len(self._buffer) >= self.block_records:
+                self._write_block()
+        return True
+
+    def flush(self):
+        """모아 둔 레코드를 블록으로 쓰기"""
+        with self._lock:
+            if self._buffer:
+                self._write_block()
+
+    def _write_block(self):
+        records, self._buffer = self._buffer, []
+        raw = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records).encode('utf-8')
+        block = _compress(raw, self.codec)
+
+        if self._segment is None or self._segment_size >= self.segment_bytes:
+            self._segment = os.path.join(self.path, f"{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}")
+            self._segment_size = 0
+
+        with open(self._segment + '.seg', 'ab') as f:
+            offset = f.tell()
+            f.write(block)
+        entry = {
+            'offset': offset,
+            'length': len(block),
+            'codec': self.codec,
+            'count': len(records),
+            'first_fetched_at': min(record['fetched_at'] for record in records),
+            'last_fetched_at': max(record['fetched_at'] for record in records),
+            'names': sorted({record['name'] for record in records}),
+            'kinds': sorted({record['kind'] for record in records})
+        }
+        with open(self._segment + '.idx', 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        self._segment_size = offset + len(block)
+        self.stats['blocks'] += 1
+        self.stats['raw_bytes'] += len(raw)
+        self.stats['stored_bytes'] += len(block)
+
+
+def list_segments(path):
+    """색인이 있는 세그먼트 목록 (오래된 순)"""
+    if not os.path.isdir(path):
+        return []
+    return sorted(
+        os.path.join(path, filename[:-4])
+        for filename in os.listdir(path)
+        if filename.endswith('.idx') and os.path.exists(os.path.join(path, filename[:-4] + '.seg'))
+    )
+
+
+def read_index(segment):
+    """세그먼트의 블록 색인 (마지막 줄이 쓰다 만 줄이면 무시)"""
+    entries = []
+    with open(segment + '.idx', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return entries
+
+
+def _block_matches(entry, names, since, kind=None):
+    if names is not None and not names.intersection(entry['names']):
+        return False
+    if kind and kind not in entry.get('kinds', [kind]):
+        return False
+    if since and entry['last_fetched_at'] < since:
+        return False
+    return True
+
+
+def iter_records(path, names=None, kind=None, since=None, unique=True):
+    """보관된 레코드를 오래된 순으로 하나씩 반환 (전체를 메모리에 올리지 않음)
+
+    names: 이 이름들의 레코드만 (해당 이름이 없는 블록은 풀지 않음)
+    kind: 'product' / 'career' 만
+    since: 이 시각(ISO 문자열) 이후 수집분만
+    unique: 같은 주소의 같은 본문은 처음 것만
+    """
+    names = set(names) if names is not None else None
+    seen = set()
+    for segment in list_segments(path):
+        entries = [entry for entry in read_index(segment) if _block_matches(entry, names, since, kind)]
+        if not entries:
+            continue
+        with open(segment + '.seg', 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                continue
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for entry in entries:
+                    if entry['offset'] + entry['length'] > size:
+                        break
+                    raw = _decompress(data[entry['offset']:entry['offset'] + entry['length']], entry['codec'])
+                    for line in raw.decode('utf-8').splitlines():
+                        record = json.loads(line)
+                        if names is not None and record['name'] not in names:
+                            continue
+                        if kind and record['kind'] != kind:
+                            continue
+                        if since and record['fetched_at'] < since:
+                            continue
+                        if unique:
+                            key = (record['url'], record['content_hash'])
+                            if key in seen:
+                                continue
+                            seen.add(key)
+                        yield record
+
+
+def archive_names(path, kind=None):
+    """보관된 이름 목록 - 색인만 읽음"""
+    names = set()
+    for segment in list_segments(path):
+        for entry in read_index(segment):
+            if _block_matches(entry, None, None, kind):
+                names.update(entry['names'])
+    return sorted(names)
+
+
+def archive_stats(path):
+    """보관소 요약 (세그먼트/블록/레코드 수, 디스크 크기, 이름 수) - 색인만 읽음"""
+    stats = {'segments': 0, 'blocks': 0, 'records': 0, 'bytes': 0, 'names': set(), 'codecs': set()}
+    for segment in list_segments(path):
+        stats['segments'] += 1
+        stats['bytes'] += os.path.getsize(segment + '.seg')
+        for entry in read_index(segment):
+            stats['blocks'] += 1
+            stats['records'] += entry['count']
+            stats['names'].update(entry['names'])
+            stats['codecs'].add(entry['codec'])
+    stats['names'] = len(stats['names'])
+    stats['codecs'] = sorted(stats['codecs'])
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롤링 원문 보관소 확인")
+    parser.add_argument('command', choices=['stats', 'dump'])
+    parser.add_argument('path', nargs='?', default=os.path.join(os.getenv("SMART_CACHE_DIR", ".cache"), "crawl_archive"))
+    parser.add_argument('--name', action='append', help="이 이름의 레코드만 (여러 번 지정 가능)")
+    parser.add_argument('--kind', choices=['product', 'career'])
+    parser.add_argument('--since', help="이 시각(ISO) 이후 수집분만")
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == 'stats':
+        print(json.dumps(archive_stats(args.path), ensure_ascii=False, indent=2))
+        return
+    for i, record in enumerate(iter_records(args.path, names=args.name, kind=args.kind, since=args.since)):
+        if i >= args.limit:
+            break
+        print(f"[{record['fetched_at']}] {record['kind']}/{record['name']} ({record['source_type']}, '{record['query']}') {record['url']}")
+        print(f"    {record['text'][:120]}...")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+크롤링 체크포인트 - 검색 도중 세션이 다시 실행되거나 프로세스가 재시작되어도 이미 받은 페이지와
+GPT 추출 결과를 잃지 않도록, 포스트 1개를 처리할 때마다 로컬 SQLite 에 기록
+
+검색 ID(예: 'product:맥북프로m3')별로 처리를 마친 포스트(주소, 순위, 출처 정보, 추출한 장단점)를 남겨 두고,
+같은 검색을 다시 시작하면 기록된 포스트는 다시 요청/추출하지 않고 결과를 이어받습니다.
+검색 결과가 저장되면 체크포인트를 지우고, max_age 초가 지난 체크포인트는 이어받지 않습니다.
+
+기록 1건은 자동 커밋 INSERT 한 번입니다 (WAL, synchronous=NORMAL - 앱 프로세스가 죽어도 남음).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from crawl_frontier import canonical_link
+
+
+class CrawlCheckpoint:
+    """검색 ID별 처리 완료 포스트 기록
+
+    연결 하나를 락으로 보호해 여러 수집 가지(스레드)에서 함께 씁니다.
+    """
+
+    def __init__(self, path, max_age=86400):
+        self.path = path
+        self.max_age = max_age
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """create table if not exists crawl_posts (
+                search_id text not null, link text not null, rank integer, source text,
+                pros text, cons text, recorded_at real not null, primary key (search_id, link))"""
+        )
+        self._conn.execute("create index if not exists crawl_posts_recorded_idx on crawl_posts (recorded_at)")
+        self.purge()
+
+    def record(self, search_id, post, pros_cons, source=None):
+        """처리를 마친 포스트 1개 기록 (장단점이 없었으면 pros_cons=None, 같은 포스트는 덮어씀)"""
+        with self._lock:
+            self._conn.execute(
+                "insert or replace into crawl_posts values (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    search_id, canonical_link(post['link']), post.get('rank'),
+                    json.dumps(source or {}, ensure_ascii=False),
+                    json.dumps(pros_cons['pros'] if pros_cons else [], ensure_ascii=False),
+                    json.dumps(pros_cons['cons'] if pros_cons else [], ensure_ascii=False),
+                    time.time()
+                )
+            )
+
+    def load(self, search_id):
+        """이어받을 포스트 기록 (후보 순위 순) - [{'link', 'rank', 'source', 'pros', 'cons'}]"""
+        with self._lock:
+            rows = self._conn.execute(
+                "select link, rank, source, pros, cons from crawl_posts where search_id = ? and recorded_at >= ? order by rank",
+                (search_id, time.time() - self.max_age)
+            ).fetchall()
+        return [
+            {'link': link, 'rank': rank, 'source': json.loads(source), 'pros': json.loads(pros), 'cons': json.loads(cons)}
+            for link, rank, source, pros, cons in rows
+        ]
+
+    def clear(self, search_id):
+        """검색 결과가 저장되어 더 이어받을 필요가 없는 검색의 기록 삭제"""
+        with self._lock:
+            self._conn.execute("delete from crawl_posts where search_id = ?", (search_id,))
+
+    def purge(self):
+        """max_age 가 지난 기록 삭제"""
+        with self._lock:
+            self._conn.execute("delete from crawl_posts where recorded_at < ?", (time.time() - self.max_age,))
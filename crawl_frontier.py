@@ -0,0 +1,220 @@
+"""
+우선순위 크롤링 프런티어 - 여러 검색어의 후보를 하나의 큐로 합쳐 가치 높은 순으로 처리
+"""
+
+import heapq
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# 점수 가중치 (합계 1.0)
+DEFAULT_WEIGHTS = {
+    'position': 0.4,   # 검색 결과 내 순위
+    'recency': 0.2,    # 작성일
+    'source': 0.2,     # 출처 유형
+    'frequency': 0.2   # 여러 검색어에서 반복 등장
+}
+
+# 출처 유형별 가중치 (블로그 후기가 뉴스보다 장단점 밀도가 높음)
+SOURCE_WEIGHTS = {
+    'blog': 1.0,
+    'news': 0.6
+}
+
+
+def canonical_link(url):
+    """중복 판별용 정규화 URL (m.blog → blog, 쿼리스트링 제거)"""
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host.startswith('m.'):
+        host = host[2:]
+    path = parsed.path.rstrip('/')
+    if host == 'blog.naver.com':
+        # PostView.naver?blogId=...&logNo=... 형식은 쿼리가 본문 식별자
+        if 'PostView' in path and parsed.query:
+            params = dict(p.split('=', 1) for p in parsed.query.split('&') if '=' in p)
+            if params.get('blogId') and params.get('logNo'):
+                return f"blog.naver.com/{params['blogId']}/{params['logNo']}"
+        return f"{host}{path}"
+    return f"{host}{path}?{parsed.query}" if parsed.query else f"{host}{path}"
+
+
+def parse_post_date(post):
+    """블로그 postdate(YYYYMMDD) 또는 뉴스 pubDate(RFC 822)를 datetime으로 변환"""
+    postdate = post.get('postdate')
+    if postdate:
+        try:
+            return datetime.strptime(postdate, '%Y%m%d')
+        except ValueError:
+            pass
+    pub_date = post.get('pubDate')
+    if pub_date:
+        try:
+            return parsedate_to_datetime(pub_date).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def time_left(deadline):
+    """마감 시각(time.time() 기준)까지 남은 초 (마감이 없으면 None, 지났으면 0)"""
+    if not deadline:
+        return None
+    return max(0.0, deadline - time.time())
+
+
+def request_timeout(deadline, default, minimum=0.5):
+    """요청 1건의 타임아웃 - 기본값과 마감까지 남은 시간 중 작은 값 (최소 minimum 초)"""
+    left = time_left(deadline)
+    if left is None:
+        return default
+    return max(minimum, min(default, left))
+
+
+class CrawlBudget:
+    """검색 1회당 시간 / LLM 호출 / 페이지 요청 예산"""
+
+    def __init__(self, max_seconds=60.0, max_llm_calls=10, max_fetches=None):
+        self.max_seconds = max_seconds
+        self.max_llm_calls = max_llm_calls
+        self.max_fetches = max_fetches
+        self.started_at = time.monotonic()
+        self.llm_calls = 0
+        self.fetches = 0
+
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    def remaining(self):
+        """남은 시간 (초)"""
+        return max(0.0, self.max_seconds - self.elapsed())
+
+    def remaining_fetches(self):
+        """남은 페이지 요청 수 (제한 없으면 None)"""
+        if self.max_fetches is None:
+            return None
+        return max(0, self.max_fetches - self.fetches)
+
+    def remaining_llm_calls(self):
+        """남은 LLM 호출 수 (제한 없으면 None)"""
+        if self.max_llm_calls is None:
+            return None
+        return max(0, self.max_llm_calls - self.llm_calls)
+
+    def charge_fetch(self):
+        self.fetches += 1
+
+    def charge_llm(self):
+        self.llm_calls += 1
+
+    def exhausted(self):
+        """예산 소진 사유 반환 (남아 있으면 None)"""
+        if self.elapsed() >= self.max_seconds:
+            return "시간"
+        if self.max_llm_calls is not None and self.llm_calls >= self.max_llm_calls:
+            return "LLM 호출"
+        if self.max_fetches is not None and self.fetches >= self.max_fetches:
+            return "페이지 요청"
+        return None
+
+
+class CrawlFrontier:
+    """검색어별 결과를 병합해 점수 순으로 꺼내는 크롤링 큐
+
+    같은 포스트가 여러 검색어에 등장하면 하나로 합치고 등장 횟수를 점수에 반영합니다.
+    점수는 후보가 추가될 때마다 바뀌므로 pop() 시점에 힙을 다시 구성합니다.
+    """
+
+    def __init__(self, weights=None, source_weights=None, now=None):
+        self.weights = weights or DEFAULT_WEIGHTS
+        self.source_weights = source_weights or SOURCE_WEIGHTS
+        self.now = now or datetime.now()
+        self._entries = {}
+        self._heap = []
+        self._dirty = False
+        self._popped = set()
+        self._deferred = []
+        self._deferred_keys = set()
+
+    def __len__(self):
+        return len(self._entries) - len(self._popped) + len(self._deferred)
+
+    def add(self, post, rank, query, source_type='blog'):
+        """후보 추가 (rank: 해당 검색 결과 내 0부터 시작하는 순위)"""
+        key = canonical_link(post['link'])
+        if key in self._popped:
+            return
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = {
+                'post': post,
+                'best_rank': rank,
+                'queries': set(),
+                'source_type': post.get('search_type', source_type)
+            }
+            self._entries[key] = entry
+        entry['best_rank'] = min(entry['best_rank'], rank)
+        entry['queries'].add(query)
+        self._dirty = True
+
+    def add_results(self, posts, query, source_type='blog', start_rank=0):
+        """검색 결과 목록을 순위와 함께 추가 (start_rank: 페이지 시작 순위)"""
+        for rank, post in enumerate(posts, start_rank):
+            self.add(post, rank, query, source_type)
+
+    def score(self, entry):
+        """후보 가치 점수 (0 ~ 1)"""
+        position = 1.0 / (1.0 + entry['best_rank'] * 0.2)
+
+        post_date = parse_post_date(entry['post'])
+        if post_date:
+            age_days = max(0, (self.now - post_date).days)
+            recency = 1.0 / (1.0 + age_days / 365.0)
+        else:
+            recency = 0.5
+
+        source = self.source_weights.get(entry['source_type'], 0.5)
+        # 같은 검색어의 다음 페이지에서 다시 나온 것은 세지 않고 서로 다른 검색어 수만 반영
+        frequency = 1.0 - 1.0 / max(1, len(entry['queries']))
+
+        return (
+            self.weights['position'] * position +
+            self.weights['recency'] * recency +
+            self.weights['source'] * source +
+            self.weights['frequency'] * frequency
+        )
+
+    def _rebuild(self):
+        self._heap = [
+            (-self.score(entry), entry['best_rank'], key)
+            for key, entry in self._entries.items()
+            if key not in self._popped
+        ]
+        heapq.heapify(self._heap)
+        self._dirty = False
+
+    def pop(self):
+        """가장 가치 높은 후보 반환 (보류 후보는 마지막에 반환, 없으면 None)"""
+        if self._dirty:
+            self._rebuild()
+        while self._heap:
+            neg_score, _, key = heapq.heappop(self._heap)
+            if key in self._popped:
+                continue
+            self._popped.add(key)
+            post = self._entries[key]['post']
+            post['frontier_score'] = round(-neg_score, 3)
+            return post
+        if self._deferred:
+            return self._deferred.pop(0)
+        return None
+
+    def defer(self, post):
+        """호스트 차단 등으로 처리하지 못한 후보를 뒤로 미룸 (한 번만 허용)"""
+        key = canonical_link(post['link'])
+        if key in self._deferred_keys:
+            return False
+        self._deferred_keys.add(key)
+        self._deferred.append(post)
+        return True
@@ -0,0 +1,141 @@
+"""
+맵리듀스 검색 그래프 도구 - 계획 노드가 분석할 후보를 고르고, 출처별 가지(페이지 요청 → 장단점 추출)가
+동시에 실행된 뒤, 합치기 노드가 가지 결과를 후보 순위대로 모아 중복을 제거
+
+    search_db → plan_crawl ─┬→ crawl_branch (blog) ─┐
+                            ├→ crawl_branch (blog) ─┼→ merge_branches → process
+                            └→ crawl_branch (news) ─┘
+
+가지는 LangGraph Send 로 띄우며, 결과는 리듀서(operator.add)가 붙은 상태 필드로 합쳐집니다.
+가지들은 CrawlSession 으로 예산(시간/페이지 요청/LLM 호출)과 신규성 조기 종료를 함께 씁니다.
+"""
+
+import operator
+import threading
+import typing
+
+
+def reducer_fields(state_type):
+    """상태 정의에서 리듀서가 붙은 필드 이름 (예: Annotated[List[...], operator.add])"""
+    hints = typing.get_type_hints(state_type, include_extras=True)
+    return {name for name, hint in hints.items() if getattr(hint, '__metadata__', None)}
+
+
+def as_update(node, state_type):
+    """상태를 직접 고쳐 반환하는 노드를 LangGraph 갱신값을 반환하는 노드로 감쌈
+
+    LangGraph 는 노드가 반환한 값을 리듀서로 기존 값에 더하므로, 상태 전체를 반환하면
+    messages 같은 리듀서 필드가 중복됩니다. 노드에는 리듀서 필드의 사본을 넘기고
+    새로 추가된 항목만 반환합니다 (나머지 필드는 그대로 반환).
+    """
+    fields = reducer_fields(state_type)
+
+    def wrapped(state):
+        local = dict(state)
+        for name in fields:
+            local[name] = list(state.get(name) or [])
+        result = node(local)
+        if result is not local:
+            return result
+        update = {name: value for name, value in local.items() if name not in fields}
+        for name in fields:
+            added = local[name][len(state.get(name) or []):]
+            if added:
+                update[name] = added
+        return update
+
+    wrapped.__name__ = node.__name__
+    wrapped.__doc__ = node.__doc__
+    return wrapped
+
+
+def partition(candidates, branch_count):
+    """후보를 출처 유형별로 나눈 뒤 가지 branch_count 개에 돌아가며 배정 (각 가지가 가치 높은 후보를 고르게 받도록)
+
+    출처마다 후보 수에 비례해 가지를 나누고 최소 1개를 주되, 전체 가지 수는 branch_count 를 넘지 않습니다. 후보에는 순위('rank')를 붙여
+    합치기 노드가 가지가 끝난 순서와 상관없이 원래 가치 순으로 결과를 모을 수 있게 합니다.
+    """
+    groups = {}
+    for rank, post in enumerate(candidates):
+        post['rank'] = rank
+        groups.setdefault(post.get('search_type', 'blog'), []).append(post)
+
+    branches = []
+    total = len(candidates)
+    for source_type, posts in groups.items():
+        count = max(1, min(len(posts), round(branch_count * len(posts) / total))) if total else 1
+        for i in range(count):
+            branches.append({'id': len(branches), 'source_type': source_type, 'posts': posts[i::count]})
+
+    # 반올림이나 출처별 최소 1개 때문에 가지가 branch_count 개를 넘으면 남는 가지를 가장 작은 가지에 합침
+    limit = max(1, branch_count)
+    for extra in branches[limit:]:
+        target = min(branches[:limit], key=lambda branch: len(branch['posts']))
+        target['posts'] = sorted(target['posts'] + extra['posts'], key=lambda post: post['rank'])
+        if extra['source_type'] not in target['source_type'].split('+'):
+            target['source_type'] += '+' + extra['source_type']
+    return branches[:limit]
+
+
+class CrawlSession:
+    """가지들이 함께 쓰는 검색 1회의 예산과 신규성 추적 (여러 스레드에서 호출)
+
+    take_fetch()/take_llm() 은 예산이 남아 있을 때만 차감하고 True 를 반환합니다.
+    신규성이 수렴하거나(novelty) 장단점이 충분히 모이면(enough_points) 이후 요청을 막습니다.
+    """
+
+    def __init__(self, budget, novelty, enough_points=None):
+        self.budget = budget
+        self.novelty = novelty
+        self.enough_points = enough_points
+        self.converged = False
+        self.enough = False
+        self.attempted = 0
+        self._totals = {'pros': 0, 'cons': 0}
+        self._lock = threading.Lock()
+
+    def should_stop(self):
+        with self._lock:
+            return self.converged or self.enough or bool(self.budget.exhausted())
+
+    def take_fetch(self):
+        with self._lock:
+            if self.converged or self.enough or self.budget.exhausted():
+                return False
+            self.budget.charge_fetch()
+            self.attempted += 1
+            return True
+
+    def take_llm(self):
+        with self._lock:
+            # 페이지를 받는 사이 시간이 다 됐으면 추출하지 않음
+            if self.budget.remaining() <= 0:
+                return False
+            remaining = self.budget.remaining_llm_calls()
+            if remaining is not None and remaining <= 0:
+                return False
+            self.budget.charge_llm()
+            return True
+
+    def observe(self, pros, cons):
+        """포스트 1개의 추출 결과 반영 (추출 실패는 빈 목록)"""
+        with self._lock:
+            self.novelty.observe(pros, cons)
+            self._totals['pros'] += len(pros)
+            self._totals['cons'] += len(cons)
+            if self.novelty.converged():
+                self.converged = True
+            if self.enough_points and min(self._totals.values()) >= self.enough_points:
+                self.enough = True
+
+
+def merge_branch_results(branch_results):
+    """가지 결과를 후보 순위 순으로 합침 → (포스트별 결과 목록, 실패한 가지 목록)"""
+    posts = []
+    failed = []
+    for result in branch_results:
+        posts.extend(result.get('posts', []))
+        if result.get('error'):
+            failed.append(result)
+    posts.sort(key=operator.itemgetter('rank'))
+    return posts, failed
@@ -0,0 +1,166 @@
+"""
+장단점 추출기 - 본문에서 장단점을 뽑는 GPT 프롬프트/응답 해석과 키워드 기반 추출 (앱과 재처리 배치가 함께 사용)
+
+GPT 추출은 OpenAI 호환 클라이언트면 무엇이든 받습니다.
+OPENAI_BASE_URL 을 로컬 대역 서버로 지정하면 실제 API 없이 같은 경로를 실행할 수 있습니다.
+"""
+
+import re
+
+from tracing import span
+
+GPT_MODEL = "gpt-3.5-turbo"
+
+PRODUCT_SYSTEM_PROMPT = "당신은 제품 리뷰 분석 전문가입니다. 실제 사용 경험에 기반한 장단점만 추출합니다."
+CAREER_SYSTEM_PROMPT = "당신은 직업 상담 전문가입니다. 각 직업의 현실적인 장단점을 객관적으로 분석합니다."
+
+_ANSWER_FORMAT = """다음 형식으로 응답해주세요:
+
+장점:
+- (구체적인 장점 1)
+- (구체적인 장점 2)
+- (구체적인 장점 3)
+
+단점:
+- (구체적인 단점 1)
+- (구체적인 단점 2)
+- (구체적인 단점 3)
+
+만약 장단점 정보가 충분하지 않으면 "정보 부족"이라고 답해주세요."""
+
+# 키워드 기반 추출용 (GPT API 없을 때)
+CAREER_PROS_KEYWORDS = [
+    '장점', '좋은점', '좋은 점', '메리트', '이점', '강점',
+    '좋다', '좋았다', '좋습니다', '만족', '추천',
+    '높은 연봉', '워라밸', '안정적', '성장', '발전',
+    '보람', '재미있', '흥미로', '유연한'
+]
+CAREER_CONS_KEYWORDS = [
+    '단점', '나쁜점', '나쁜 점', '어려운점', '힘든점',
+    '어렵다', '힘들다', '스트레스', '야근', '박봉',
+    '불안정', '경쟁', '부담', '압박', '피곤',
+    '지루', '반복적', '단순'
+]
+
+
+def product_prompt(product_name, content):
+    return f"""다음은 "{product_name}"에 대한 블로그 리뷰입니다.
+
+[블로그 내용]
+{content[:1500]}
+
+위 내용에서 {product_name}의 장점과 단점을 추출해주세요.
+실제 사용 경험에 기반한 구체적인 내용만 포함하세요.
+
+{_ANSWER_FORMAT}"""
+
+
+def career_prompt(career_name, content):
+    return f"""다음은 "{career_name}" 직업에 대한 블로그 글입니다.
+
+[블로그 내용]
+{content[:2000]}
+
+위 내용에서 {career_name} 직업의 현실적인 장점과 단점을 추출해주세요.
+실제 경험에 기반한 구체적인 내용만 포함하세요.
+
+{_ANSWER_FORMAT}"""
+
+
+def parse_pros_cons(result):
+    """GPT 응답('장점:' / '단점:' 아래 '- ' 목록)을 {'pros', 'cons'} 로 변환 (내용이 없으면 None)"""
+    if not result or "정보 부족" in result:
+        return None
+
+    pros = []
+    cons = []
+    current_section = None
+
+    for line in result.split('\n'):
+        line = line.strip()
+        if '장점:' in line or '장점 :' in line:
+            current_section = 'pros'
+        elif '단점:' in line or '단점 :' in line:
+            current_section = 'cons'
+        elif line.startswith('-') and current_section:
+            point = line[1:].strip()
+            if point and len(point) > 5:
+                if current_section == 'pros':
+                    pros.append(point)
+                else:
+                    cons.append(point)
+
+    if pros or cons:
+        return {
+            'pros': pros[:5],
+            'cons': cons[:5]
+        }
+    return None
+
+
+def extract_with_gpt(openai_client, system_prompt, prompt, model=GPT_MODEL):
+    """GPT로 장단점 추출 (API 오류는 호출한 쪽에서 처리하도록 그대로 발생)"""
+    with span("llm.extract", model=model, prompt_chars=len(prompt)) as llm_span:
+        response = openai_client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=500
+        )
+        usage = getattr(response, 'usage', None)
+        if usage:
+            llm_span.set(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+    return parse_pros_cons(response.choices[0].message.content.strip())
+
+
+def extract_career_simple(career_name, content):
+    """키워드 기반 간단한 직업 장단점 추출 (직업명과 장단점 키워드가 함께 있는 문장)"""
+    if not content or len(content) < 200:
+        return None
+
+    pros = []
+    cons = []
+    name_lower = career_name.lower()
+
+    # 문장 단위로 분리
+    for sentence in re.split(r'[.!?]\s*', content):
+        sentence = sentence.strip()
+        if len(sentence) < 10 or len(sentence) > 200:
+            continue
+
+        sentence_lower = sentence.lower()
+        if name_lower not in sentence_lower:
+            continue
+
+        if len(pros) < 5 and sentence not in pros and any(keyword in sentence_lower for keyword in CAREER_PROS_KEYWORDS):
+            pros.append(sentence)
+        if len(cons) < 5 and sentence not in cons and any(keyword in sentence_lower for keyword in CAREER_CONS_KEYWORDS):
+            cons.append(sentence)
+
+    if pros or cons:
+        return {
+            'pros': pros[:3],
+            'cons': cons[:3]
+        }
+    return None
+
+
+def deduplicate_points(points, limit=10):
+    """유사한 장단점 중복 제거 (3글자 이상 단어가 절반 이상 겹치면 중복)"""
+    unique_points = []
+    seen_keywords = set()
+
+    for point in points or []:
+        keywords = set(word for word in point.split() if len(word) > 2)
+
+        if len(keywords & seen_keywords) < len(keywords) * 0.5:
+            unique_points.append(point)
+            seen_keywords.update(keywords)
+
+        if len(unique_points) >= limit:
+            break
+
+    return unique_points
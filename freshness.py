@@ -0,0 +1,101 @@
+"""
+신선도 정책 (stale-while-revalidate) - 저장된 분석은 즉시 반환하고, 오래되었으면 백그라운드에서 다시 수집
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+
+def parse_timestamp(value):
+    """Supabase created_at(ISO 8601) 문자열을 UTC datetime으로 변환"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def latest_batch(rows):
+    """가장 최근에 저장된 한 묶음의 행만 반환
+
+    한 번의 insert로 저장된 행은 created_at이 같으므로, 최신 created_at 행만 읽으면
+    새 결과를 insert 하는 순간 읽는 쪽이 통째로 새 결과로 넘어갑니다 (원자적 교체).
+    created_at이 없는 테이블이면 그대로 반환합니다.
+    """
+    stamps = [row.get('created_at') for row in rows if row.get('created_at')]
+    if not stamps:
+        return rows
+    newest = max(stamps, key=lambda value: parse_timestamp(value) or datetime.min.replace(tzinfo=timezone.utc))
+    return [row for row in rows if row.get('created_at') == newest]
+
+
+def swap_in(supabase, table, key_column, name, data):
+    """새 분석 결과 저장 후 이전 결과 정리 (insert → 이전 행 delete 순서)
+
+    먼저 insert 하므로 읽는 쪽에서 결과가 비어 보이는 순간이 없습니다.
+    이전 행은 created_at(없으면 id) 기준으로 지웁니다.
+    """
+    inserted = supabase.table(table).insert(data).execute().data or []
+    if not inserted:
+        return inserted
+
+    created_at = inserted[0].get('created_at')
+    if created_at:
+        supabase.table(table).delete().eq(key_column, name).lt('created_at', created_at).execute()
+        return inserted
+
+    new_ids = [row['id'] for row in inserted if 'id' in row]
+    if new_ids:
+        supabase.table(table).delete().eq(key_column, name).not_.in_('id', new_ids).execute()
+    return inserted
+
+
+class FreshnessPolicy:
+    """저장된 분석의 유효 기간(TTL) 판단 및 재수집 예약 관리
+
+    같은 항목의 재수집은 cooldown 초에 한 번만 예약합니다 (재수집이 실패해도 조회할 때마다
+    크롤링이 다시 시작되지 않도록). 세션 간에 공유되므로 예약 기록은 락으로 보호합니다.
+    """
+
+    def __init__(self, ttl_seconds, cooldown=600):
+        self.ttl_seconds = ttl_seconds
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._scheduled = {}
+        self.stats = {
+            'fresh_hits': 0,
+            'stale_hits': 0,
+            'revalidations': 0
+        }
+
+    def age_seconds(self, rows):
+        """분석 결과의 나이 (created_at이 없으면 None)"""
+        stamps = [parse_timestamp(row.get('created_at')) for row in rows]
+        stamps = [stamp for stamp in stamps if stamp]
+        if not stamps:
+            return None
+        return (datetime.now(timezone.utc) - max(stamps)).total_seconds()
+
+    def is_stale(self, rows):
+        """TTL이 지났는지 여부 (저장 시각을 알 수 없으면 신선한 것으로 간주)"""
+        age = self.age_seconds(rows)
+        stale = age is not None and age > self.ttl_seconds
+        with self._lock:
+            self.stats['stale_hits' if stale else 'fresh_hits'] += 1
+        return stale
+
+    def should_revalidate(self, key):
+        """재수집을 예약해도 되는지 확인하고, 가능하면 예약 시각 기록"""
+        now = time.monotonic()
+        with self._lock:
+            last = self._scheduled.get(key)
+            if last is not None and now - last < self.cooldown:
+                return False
+            self._scheduled[key] = now
+            self.stats['revalidations'] += 1
+            return True
@@ -0,0 +1,191 @@
+"""
+백그라운드 작업 실행기 - 크롤링을 Streamlit 스크립트 스레드와 분리
+"""
+
+import contextvars
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (DONE, FAILED, CANCELLED)
+
+# 작업 스레드에서 현재 실행 중인 작업
+# (contextvars 라서 작업 안에서 컨텍스트를 복사해 띄운 스레드 - LangGraph 병렬 노드 등 - 에서도 보임)
+_current_job = contextvars.ContextVar('current_job', default=None)
+
+
+def current_job():
+    """현재 스레드에서 실행 중인 작업 (작업 스레드가 아니면 None)"""
+    return _current_job.get()
+
+
+def report_progress(message, **data):
+    """현재 작업에 진행 상황 기록 (작업 밖에서 호출하면 무시)"""
+    job = current_job()
+    if job:
+        job.report(message, **data)
+
+
+def report_partial(**values):
+    """현재 작업의 부분 결과 갱신 - 작업이 끝나기 전에 UI 가 보여줄 값 (작업 밖에서 호출하면 무시)"""
+    job = current_job()
+    if job:
+        job.set_partial(**values)
+
+
+def is_cancelled():
+    """현재 작업이 취소되었는지 여부"""
+    job = current_job()
+    return bool(job and job.cancelled())
+
+
+class Job:
+    """작업 1건의 상태와 진행 기록"""
+
+    MAX_PROGRESS = 200
+
+    def __init__(self, name):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.status = QUEUED
+        self.progress = []
+        self.partial = {}
+        self.result = None
+        self.error = ""
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def report(self, message, **data):
+        with self._lock:
+            self.progress.append({'time': time.time(), 'message': message, **data})
+            if len(self.progress) > self.MAX_PROGRESS:
+                del self.progress[:-self.MAX_PROGRESS]
+
+    def set_partial(self, **values):
+        with self._lock:
+            self.partial = {**self.partial, **values}
+
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+    def elapsed(self):
+        if not self.started_at:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def snapshot(self):
+        """UI 표시용 사본 (진행 기록은 복사본)"""
+        with self._lock:
+            progress = list(self.progress)
+            partial = dict(self.partial)
+        return {
+            'id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'progress': progress,
+            'partial': partial,
+            'error': self.error,
+            'elapsed': self.elapsed()
+        }
+
+
+class JobRunner:
+    """스레드 풀 기반 작업 실행기
+
+    @st.cache_resource 로 서버 전체에서 하나만 만들어 쓰므로, 세션이 다시 실행(rerun)되거나
+    사용자가 다른 버튼을 눌러도 작업은 계속 진행됩니다. 세션은 작업 ID만 들고 있다가
+    get()으로 상태를 조회(폴링)합니다. 끝난 작업은 retention 초 동안 보관합니다.
+    """
+
+    def __init__(self, max_workers=4, retention=1800):
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-job")
+        self._jobs = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, name="", **kwargs):
+        """작업 등록 후 작업 ID 즉시 반환"""
+        self._cleanup()
+        job = Job(name)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancelled():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        token = _current_job.set(job)
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = CANCELLED if job.cancelled() else DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+            print(f"백그라운드 작업 오류 ({job.name}): {e}")
+            traceback.print_exc()
+        finally:
+            job.finished_at = time.time()
+            _current_job.reset(token)
+
+    def get(self, job_id):
+        """작업 조회 (없거나 만료되었으면 None)"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """작업 취소 요청 (실행 중인 작업은 다음 확인 지점에서 중단)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            future = self._futures.get(job_id)
+        if not job or job.finished():
+            return False
+        job._cancel_event.set()
+        if future and future.cancel():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        return True
+
+    def active_count(self):
+        """대기 중이거나 실행 중인 작업 수"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished())
+
+    def _cleanup(self):
+        now = time.time()
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished() and job.finished_at and now - job.finished_at > self.retention
+            ]
+            for job_id in expired:
+                self._jobs.pop(job_id, None)
+                self._futures.pop(job_id, None)
+
+    def shutdown(self, wait=False):
+        """남은 작업 취소 후 종료"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job._cancel_event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,308 @@
+"""
+운영 지표 - 크롤러/캐시/저장 상태를 스레드 안전한 카운터와 지연 시간 히스토그램으로 모아
+Prometheus 텍스트 형식(text exposition format 0.0.4)으로 내보냄
+
+    registry = MetricsRegistry()
+    pages = registry.counter("crawler_events_total", "크롤러 이벤트 수", ("event",))
+    pages.inc(event="total_crawled")
+    registry.render()                 # '# HELP smart_crawler_events_total ...' 텍스트
+    registry.serve(9108)              # http://127.0.0.1:9108/metrics
+    registry.write_file(path)         # node_exporter textfile collector 등에서 읽도록 파일로 기록
+
+단계별 지연 시간(검색 API, 페이지 요청, 본문 해석, LLM, DB 읽기/쓰기)은 tracing 구간이 끝날 때
+observe_span() 으로 받아 stage_duration_seconds 히스토그램에 쌓습니다 (tracing.add_listener).
+캐시 적중 수처럼 다른 객체가 이미 세고 있는 값은 callback() 으로 내보낼 때 읽습니다.
+"""
+
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 지연 시간 히스토그램 구간 경계 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# tracing 구간 이름 → 단계
+STAGE_SPANS = {
+    'naver.search': 'search_api',
+    'page.fetch': 'fetch',
+    'page.parse': 'parse',
+    'llm.extract': 'llm',
+    'db.read': 'db_read',
+    'db.write': 'db_write'
+}
+
+# 단계 표시 이름 (사이드바)
+STAGE_LABELS = {
+    'search_api': "검색 API",
+    'fetch': "페이지 요청",
+    'parse': "본문 해석",
+    'llm': "LLM",
+    'db_read': "DB 읽기",
+    'db_write': "DB 쓰기"
+}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label_key(labelnames, labels):
+    if set(labels) != set(labelnames):
+        raise ValueError(f"레이블이 맞지 않습니다: {sorted(labels)} (필요: {list(labelnames)})")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, key, extra=()):
+    pairs = list(zip(labelnames, key)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """증가만 하는 카운터 (레이블 조합별)"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("카운터는 줄일 수 없습니다")
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """레이블 조합의 현재 값 (레이블 일부만 주면 나머지 레이블의 합)"""
+        with self._lock:
+            items = list(self._values.items())
+        return sum(
+            value for key, value in items
+            if all(key[self.labelnames.index(name)] == str(expected) for name, expected in labels.items())
+        )
+
+    def lines(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram:
+    """누적 구간(bucket) 히스토그램 (레이블 조합별 구간별 개수, 합계, 개수)"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][i] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+
+    def count(self, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            series = self._series.get(key)
+            return series['count'] if series else 0
+
+    def quantile(self, q, **labels):
+        """구간 개수로 추정한 분위수 (Prometheus histogram_quantile 과 같은 선형 보간, 관측이 없으면 None)"""
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            series = self._series.get(key)
+            if not series or not series['count']:
+                return None
+            counts = list(series['counts'])
+            total = series['count']
+        target = q * total
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, counts):
+            if cumulative + count >= target and count:
+                if bound == math.inf:
+                    return lower
+                return lower + (bound - lower) * (target - cumulative) / count
+            cumulative += count
+            lower = bound if bound != math.inf else lower
+        return lower
+
+    def lines(self):
+        with self._lock:
+            items = sorted((key, dict(series, counts=list(series['counts']))) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {series['count']}")
+        return lines
+
+
+class Callback:
+    """내보낼 때 fn() 으로 값을 읽는 지표 (다른 객체가 세고 있는 값)
+
+    fn() 은 숫자 하나 또는 {레이블 값 튜플: 숫자} 를 반환합니다.
+    """
+
+    def __init__(self, name, help_text, fn, kind="gauge", labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.fn = fn
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+
+    def lines(self):
+        try:
+            values = self.fn()
+        except Exception as e:
+            print(f"지표 수집 오류 ({self.name}): {e}")
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [
+            f"{self.name}{_format_labels(self.labelnames, tuple(map(str, key)))} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class MetricsRegistry:
+    """지표 모음 - 이름은 prefix 를 붙여 등록하고, 같은 이름을 다시 등록하면 기존 지표를 반환
+
+    @st.cache_resource 로 여러 세션과 크롤링 스레드가 함께 쓰므로 모든 지표는 락으로 보호합니다.
+    """
+
+    def __init__(self, prefix="smart_"):
+        self.prefix = prefix
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self.stage_duration = self.histogram(
+            "stage_duration_seconds", "단계별 소요 시간 (검색 API, 페이지 요청, 본문 해석, LLM, DB 읽기/쓰기)", ("stage",)
+        )
+        self.stage_errors = self.counter("stage_errors_total", "단계별 오류 수", ("stage",))
+        self.llm_tokens = self.counter("llm_tokens_total", "LLM 사용 토큰 수", ("kind",))
+
+    def _register(self, name, factory):
+        full_name = self.prefix + name
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = factory(full_name)
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(name, lambda full_name: Counter(full_name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(name, lambda full_name: Histogram(full_name, help_text, labelnames, buckets))
+
+    def callback(self, name, help_text, fn, kind="gauge", labelnames=()):
+        return self._register(name, lambda full_name: Callback(full_name, help_text, fn, kind, labelnames))
+
+    def observe_span(self, record):
+        """끝난 tracing 구간을 단계별 지연 시간/오류/토큰 수로 반영 (단계가 아닌 구간은 무시)"""
+        stage = STAGE_SPANS.get(record['name'])
+        if stage is None:
+            return
+        self.stage_duration.observe(record['duration'] or 0.0, stage=stage)
+        if record['error']:
+            self.stage_errors.inc(stage=stage)
+        attrs = record['attrs']
+        if attrs.get('prompt_tokens'):
+            self.llm_tokens.inc(attrs['prompt_tokens'], kind="prompt")
+        if attrs.get('completion_tokens'):
+            self.llm_tokens.inc(attrs['completion_tokens'], kind="completion")
+
+    def stage_summary(self):
+        """단계별 호출 수와 p50/p99 (밀리초, 구간 추정치) - 사이드바 표시용"""
+        summary = {}
+        for stage in STAGE_SPANS.values():
+            count = self.stage_duration.count(stage=stage)
+            if not count:
+                continue
+            summary[stage] = {
+                'count': count,
+                'errors': self.stage_errors.value(stage=stage),
+                'p50_ms': round(self.stage_duration.quantile(0.5, stage=stage) * 1000, 1),
+                'p99_ms': round(self.stage_duration.quantile(0.99, stage=stage) * 1000, 1)
+            }
+        return summary
+
+    def render(self):
+        """Prometheus 텍스트 형식"""
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        out = []
+        for metric in metrics:
+            out.append(f"# HELP {metric.name} {metric.help}")
+            out.append(f"# TYPE {metric.name} {metric.kind}")
+            out.extend(metric.lines())
+        return "\n".join(out) + "\n"
+
+    def write_file(self, path):
+        """지표 파일 기록 (임시 파일에 쓴 뒤 교체 - 읽는 쪽이 중간 상태를 보지 않도록)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, port, host="127.0.0.1"):
+        """/metrics 를 제공하는 HTTP 서버를 데몬 스레드로 시작 (이미 시작했으면 그대로 반환)"""
+        if self._server:
+            return self._server
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._server
@@ -0,0 +1,276 @@
+"""
+장단점 전문 검색 - 저장된 모든 장단점에서 검색어가 들어간 항목을 관련도 순으로 찾기 (예: '발열' 단점이 있는 노트북)
+
+저장된 장단점을 한 번 읽어 메모리에 역색인(PointIndex)을 만들고, 새로 저장되는 결과는 바로 반영합니다.
+로컬 SQLite 저장소는 색인이 만들어지는 동안 FTS5 인덱스(storage.SQLiteStorage.search_points)로 대신 검색합니다.
+두 경우 모두 한글 2글자 단위 토큰(storage.bigram_tokens)을 씁니다.
+"""
+
+import math
+import threading
+import time
+from array import array
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from storage import TABLES, bigram_tokens
+
+
+class PointIndex:
+    """장단점 내용 역색인 (토큰 → 장단점 번호와 출현 횟수) + BM25 순위
+
+    검색어의 모든 토큰이 들어간 장단점만 후보로 삼고(가장 드문 토큰부터 교집합),
+    후보 전체의 BM25 점수를 numpy 로 한 번에 계산한 뒤 상위 limit 개만 고릅니다.
+    교체/삭제된 항목은 표시만 해 두고 다음 재구성 때 정리합니다.
+    검색은 색인이 바뀔 때만 새로 만드는 읽기 전용 numpy 배열을 함께 쓰므로 조회마다 복사하지 않습니다.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    TYPE_CODES = {'pro': 1, 'con': 2}
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+        self.built_at = 0.0
+        self._rebuilding = False
+        self._replays = None             # 재구성 중 들어온 replace() (새 색인으로 바꾼 뒤 다시 적용)
+
+    def _reset(self):
+        self._docs = []                  # 번호 → (출처 테이블, 이름, 유형, 내용)
+        self._lengths = array('I')       # 번호 → 토큰 수
+        self._alive = bytearray()        # 번호 → 1 (삭제되면 0)
+        self._source_of = bytearray()    # 번호 → 출처 테이블 코드
+        self._type_of = bytearray()      # 번호 → 유형 코드
+        self._source_codes = {}
+        self._postings = {}              # 토큰 → (번호 array, 출현 횟수 array)
+        self._by_name = defaultdict(list)
+        self._live = 0
+        self._total_length = 0
+        self._frozen = None              # 검색용 읽기 전용 배열 (길이, 삭제 여부, 출처, 유형)
+        self._frozen_postings = {}       # 토큰 → 검색용 읽기 전용 (번호, 출현 횟수) 배열
+
+    def __len__(self):
+        return self._live
+
+    def ready(self):
+        return bool(self.built_at)
+
+    def _add(self, source, name, point_type, content):
+        tokens = bigram_tokens(content)
+        doc_id = len(self._docs)
+        self._docs.append((source, name, point_type, content))
+        self._lengths.append(len(tokens))
+        self._alive.append(1)
+        self._source_of.append(self._source_codes.setdefault(source, len(self._source_codes) + 1))
+        self._type_of.append(self.TYPE_CODES.get(point_type, 0))
+        for token, count in Counter(tokens).items():
+            self._frozen_postings.pop(token, None)
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = (array('I'), array('H'))
+            posting[0].append(doc_id)
+            posting[1].append(min(count, 65535))
+        self._by_name[(source, name)].append(doc_id)
+        self._live += 1
+        self._total_length += len(tokens)
+        self._frozen = None
+
+    def replace(self, source, name, pros, cons):
+        """한 항목(제품/직업)의 장단점을 새 결과로 교체"""
+        with self._lock:
+            if self._replays is not None:
+                self._replays.append((source, name, list(pros), list(cons)))
+            self._remove(source, name)
+            for pro in pros:
+                self._add(source, name, 'pro', pro)
+            for con in cons:
+                self._add(source, name, 'con', con)
+
+    def _remove(self, source, name):
+        for doc_id in self._by_name.pop((source, name), []):
+            if self._alive[doc_id]:
+                self._alive[doc_id] = 0
+                self._live -= 1
+                self._total_length -= self._lengths[doc_id]
+                self._frozen = None
+
+    def build(self, rows):
+        """(출처 테이블, 이름, 유형, 내용) 목록으로 전체 재구성
+
+        rebuild_async() 로 목록을 읽기 시작한 뒤 들어온 replace() 는 읽은 목록에 빠졌을 수 있으므로
+        새 색인으로 바꾼 다음 같은 순서로 다시 적용합니다.
+        """
+        fresh = PointIndex()
+        for source, name, point_type, content in rows:
+            fresh._add(source, name, point_type, content)
+        with self._lock:
+            for attr in ('_docs', '_lengths', '_alive', '_source_of', '_type_of', '_source_codes',
+                         '_postings', '_by_name', '_live', '_total_length', '_frozen', '_frozen_postings'):
+                setattr(self, attr, getattr(fresh, attr))
+            replays, self._replays = self._replays or [], None
+            for source, name, pros, cons in replays:
+                self.replace(source, name, pros, cons)
+            self.built_at = time.time()
+
+    def rebuild_async(self, load_rows, max_age, wait_first=True):
+        """색인이 max_age 초보다 오래되었으면 백그라운드에서 재구성 (그동안 기존 색인으로 검색)"""
+        with self._lock:
+            if self._rebuilding or (self.built_at and time.time() - self.built_at < max_age):
+                return False
+            self._rebuilding = True
+            self._replays = []
+            first_build = not self.built_at
+
+        def run():
+            try:
+                self.build(load_rows())
+            except Exception as e:
+                print(f"장단점 색인 재구성 오류: {e}")
+            finally:
+                with self._lock:
+                    self._rebuilding = False
+                    self._replays = None
+
+        if first_build and wait_first:
+            # 처음에는 색인이 비어 있으므로 만들어질 때까지 기다림
+            run()
+        else:
+            threading.Thread(target=run, name="point-index-rebuild", daemon=True).start()
+        return True
+
+    def _doc_arrays(self):
+        """번호별 (길이, 삭제 여부, 출처, 유형) 읽기 전용 배열 - 색인이 바뀐 뒤 처음 검색할 때만 새로 만듦"""
+        if self._frozen is None:
+            arrays = (
+                np.frombuffer(self._lengths, dtype=np.uint32).astype(np.float64),
+                np.frombuffer(bytes(self._alive), dtype=np.uint8),
+                np.frombuffer(bytes(self._source_of), dtype=np.uint8),
+                np.frombuffer(bytes(self._type_of), dtype=np.uint8)
+            )
+            for values in arrays:
+                values.flags.writeable = False
+            self._frozen = arrays
+        return self._frozen
+
+    def _posting_arrays(self, token):
+        """토큰의 (번호, 출현 횟수) 읽기 전용 배열 (토큰이 없으면 None) - 그 토큰이 추가될 때만 새로 만듦"""
+        frozen = self._frozen_postings.get(token)
+        if frozen is None:
+            posting = self._postings.get(token)
+            if posting is None:
+                return None
+            frozen = (np.array(posting[0], dtype=np.int64), np.array(posting[1], dtype=np.float64))
+            for values in frozen:
+                values.flags.writeable = False
+            self._frozen_postings[token] = frozen
+        return frozen
+
+    def search(self, text, sources=None, point_type=None, limit=20):
+        """검색어의 모든 토큰이 들어간 장단점을 BM25 순으로 반환"""
+        query_tokens = list(dict.fromkeys(bigram_tokens(text)))
+        if not query_tokens:
+            return []
+        with self._lock:
+            postings = [self._posting_arrays(token) for token in query_tokens]
+            if not all(postings):
+                return []
+            # 색인이 바뀌면 새 배열로 갈아끼우므로 잠금 밖에서 그대로 읽어도 됨
+            lengths, alive, source_of, type_of = self._doc_arrays()
+            source_codes = [self._source_codes[s] for s in (sources or []) if s in self._source_codes]
+            n_docs = max(self._live, 1)
+            avg_length = self._total_length / n_docs if self._total_length else 1.0
+            docs = self._docs
+
+        # 가장 드문 토큰부터 교집합 (번호 목록은 오름차순)
+        order = sorted(range(len(postings)), key=lambda i: len(postings[i][0]))
+        candidates = postings[order[0]][0]
+        for i in order[1:]:
+            candidates = np.intersect1d(candidates, postings[i][0], assume_unique=True)
+            if not len(candidates):
+                return []
+
+        keep = alive[candidates] == 1
+        if sources:
+            keep &= np.isin(source_of[candidates], source_codes)
+        if point_type:
+            keep &= type_of[candidates] == self.TYPE_CODES.get(point_type, 0)
+        candidates = candidates[keep]
+        if not len(candidates):
+            return []
+
+        norm = self.K1 * (1 - self.B + self.B * lengths[candidates] / avg_length)
+        scores = np.zeros(len(candidates))
+        for ids, counts in postings:
+            idf = math.log(1 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+            tf = counts[np.searchsorted(ids, candidates)]
+            scores += idf * tf * (self.K1 + 1) / (tf + norm)
+
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        results = []
+        for i in top:
+            source, name, doc_type, content = docs[int(candidates[i])]
+            results.append({'source': source, 'name': name, 'type': doc_type, 'content': content, 'score': float(scores[i])})
+        return results
+
+
+def load_point_rows(storage, sources, page_size=1000):
+    """저장소의 모든 장단점을 (출처 테이블, 이름, 유형, 내용) 목록으로 읽기 (이름마다 최신 버전만)"""
+    from analysis_store import fetch_all_rows
+    from versioned_store import latest_version
+
+    rows = []
+    for table in sources:
+        spec = TABLES[table]
+        key = spec['key']
+        stored = fetch_all_rows(storage, table, page_size=page_size)
+        if spec['kind'] == 'summary':
+            for row in stored:
+                rows += [(table, row[key], 'pro', pro) for pro in row.get('pros') or []]
+                rows += [(table, row[key], 'con', con) for con in row.get('cons') or []]
+            continue
+        grouped = defaultdict(list)
+        for row in stored:
+            grouped[row[key]].append(row)
+        for name, name_rows in grouped.items():
+            rows += [(table, name, row['type'], row['content']) for row in latest_version(name_rows)]
+    return rows
+
+
+def index_item(index, item):
+    """저장 항목(write_behind 항목 형식)을 색인에 바로 반영 - 저장을 기다리지 않고 검색에 보이도록"""
+    if item['mode'] == 'summary':
+        row = item['rows'][0] if item['rows'] else {}
+        pros, cons = row.get('pros') or [], row.get('cons') or []
+    else:
+        pros = [row['content'] for row in item['rows'] if row['type'] == 'pro']
+        cons = [row['content'] for row in item['rows'] if row['type'] == 'con']
+    index.replace(item['table'], item['name'], pros, cons)
+
+
+def group_by_name(results):
+    """검색 결과를 항목(제품/직업)별로 묶어 점수 합계 순으로 정렬"""
+    groups = {}
+    for result in results:
+        group = groups.setdefault(result['name'], {'name': result['name'], 'score': 0.0, 'points': []})
+        group['score'] += result['score']
+        group['points'].append(result)
+    return sorted(groups.values(), key=lambda group: group['score'], reverse=True)
+
+
+def search_stored_points(storage, index, text, sources, point_type=None, limit=20, max_age=600):
+    """저장된 장단점 검색 - 메모리 역색인으로 검색하고, 색인이 처음 만들어지는 동안은 FTS5로 대신 검색
+
+    Supabase 처럼 전문 검색이 없는 저장소는 처음 검색할 때 색인이 만들어질 때까지 기다립니다.
+    """
+    has_fts = hasattr(storage, 'search_points')
+    index.rebuild_async(lambda: load_point_rows(storage, sources), max_age, wait_first=not has_fts)
+    if not index.ready() and has_fts:
+        return storage.search_points(text, sources=sources, point_type=point_type, limit=limit)
+    return index.search(text, sources=sources, point_type=point_type, limit=limit)
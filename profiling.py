@@ -0,0 +1,327 @@
+"""
+검색 1회 프로파일링 - 켜 둔 검색만 표본 추출 프로파일러(sampling profiler)와 tracemalloc 으로 감싸
+어느 함수에서 시간을 쓰고 어디서 메모리를 할당했는지 파일로 남김
+
+    store = ProfileStore(".cache/profiles")
+    capture = store.begin("맥북 프로 M3", app="product")
+    with start_trace("search", profile=capture):          # 추적 구간이 열린 스레드를 모두 표본 추출
+        ...
+    with capture.section():                               # 다른 스레드(결과 화면 그리기 등)도 포함
+        ...
+    summary = store.finish(capture.id)                    # speedscope / folded / 할당 보고서 저장
+
+표본 추출은 별도 스레드가 interval 마다 sys._current_frames() 로 대상 스레드의 호출 스택을 읽는
+방식(벽시계 기준)이라 네트워크 대기도 시간으로 잡힙니다. 대상 스레드는 section() 안에 있는 동안만
+표본을 모으며, 추적(tracing.start_trace(profile=...)) 안의 구간은 LangGraph 병렬 가지 스레드에서도
+자동으로 section 에 들어갑니다.
+
+결과 파일 (directory 아래, 캡처마다)
+    <시각>_<ID>.speedscope.json   https://www.speedscope.app 에 끌어다 놓아 플레임그래프로 보기
+    <시각>_<ID>.folded            flamegraph.pl / inferno 입력 (스택;스택 밀리초)
+    <시각>_<ID>.alloc.txt         tracemalloc 할당 상위 항목 (캡처 동안 늘어난 크기 순)
+
+프로파일러를 쓰지 않으면 표본 추출 스레드도 tracemalloc 도 시작하지 않습니다 (추적 구간에서
+profile 이 None 인지 확인하는 것뿐).
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+DEFAULT_INTERVAL = 0.005   # 표본 추출 간격 (초)
+TOP_ALLOCATIONS = 25
+TOP_FUNCTIONS = 10
+
+# tracemalloc 은 프로세스 전체 설정이므로 동시에 진행 중인 캡처 수를 세어 마지막 캡처가 끝날 때 끔
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def _start_tracemalloc():
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+        return tracemalloc.take_snapshot()
+
+
+def _stop_tracemalloc():
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        _tracemalloc_users = max(_tracemalloc_users - 1, 0)
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+        return snapshot
+
+
+class Capture:
+    """프로파일 캡처 1개 - 대상 스레드의 스택 표본과 캡처 동안의 메모리 할당"""
+
+    def __init__(self, name, interval=DEFAULT_INTERVAL, **attrs):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.attrs = attrs
+        self.interval = interval
+        self.started_at = time.time()
+        self.finished_at = None
+        self._active = {}          # 스레드 ID → 열린 section 수
+        self._thread_names = {}
+        self._samples = {}         # 스레드 ID → [(스택 프레임 번호 튜플, 가중치(초))]
+        self._frames = []          # (함수 이름, 파일, 첫 줄)
+        self._frame_index = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_loop, name=f"profiler-{self.id}", daemon=True)
+        self._snapshot = None
+
+    def start(self):
+        self._snapshot = _start_tracemalloc()
+        self._sampler.start()
+        return self
+
+    def enter(self):
+        """현재 스레드를 표본 추출 대상에 추가 (중첩 가능)"""
+        ident = threading.get_ident()
+        with self._lock:
+            self._active[ident] = self._active.get(ident, 0) + 1
+            self._thread_names[ident] = threading.current_thread().name
+
+    def exit(self):
+        ident = threading.get_ident()
+        with self._lock:
+            depth = self._active.get(ident, 0) - 1
+            if depth > 0:
+                self._active[ident] = depth
+            else:
+                self._active.pop(ident, None)
+
+    @contextmanager
+    def section(self):
+        """with 블록 동안 현재 스레드 표본 추출"""
+        self.enter()
+        try:
+            yield self
+        finally:
+            self.exit()
+
+    def _frame_id(self, code):
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self._frames)
+            self._frames.append(key)
+        return index
+
+    def _sample_loop(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            # 표본 1개의 가중치 = 직전 표본 추출 이후 지난 시간 (GIL 대기로 늦어진 만큼 포함)
+            weight, last = now - last, now
+            with self._lock:
+                targets = list(self._active)
+            if not targets:
+                continue
+            frames = sys._current_frames()
+            for ident in targets:
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_id(frame.f_code))
+                    frame = frame.f_back
+                if stack:
+                    self._samples.setdefault(ident, []).append((tuple(reversed(stack)), weight))
+            del frames
+
+    def stop(self):
+        """표본 추출 중지 후 (끝난 시점의) 할당 스냅샷 반환 - 한 번만 의미 있음"""
+        if self.finished_at is not None:
+            return None
+        self._stop.set()
+        self._sampler.join()
+        self.finished_at = time.time()
+        return _stop_tracemalloc()
+
+    def threads(self):
+        """스레드별 표본 [(스레드 이름, [(스택, 가중치(초))])]"""
+        return [(self._thread_names.get(ident, str(ident)), samples) for ident, samples in self._samples.items()]
+
+    def to_speedscope(self):
+        """speedscope 파일 형식 (https://www.speedscope.app/file-format-schema.json) - 스레드마다 프로파일 1개"""
+        profiles = []
+        for thread_name, samples in self.threads():
+            total = sum(weight for _, weight in samples)
+            profiles.append({
+                'type': 'sampled',
+                'name': f"{self.name} · {thread_name}",
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': total,
+                'samples': [list(stack) for stack, _ in samples],
+                'weights': [weight for _, weight in samples]
+            })
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': self.name,
+            'exporter': 'smart-profiling',
+            'activeProfileIndex': 0,
+            'shared': {'frames': [
+                {'name': name, 'file': filename, 'line': line} for name, filename, line in self._frames
+            ]},
+            'profiles': profiles
+        }
+
+    def to_folded(self):
+        """접힌 스택 (스택;스택 밀리초) - flamegraph.pl / inferno-flamegraph 입력"""
+        totals = {}
+        for thread_name, samples in self.threads():
+            for stack, weight in samples:
+                key = (thread_name, stack)
+                totals[key] = totals.get(key, 0.0) + weight
+        lines = []
+        for (thread_name, stack), seconds in sorted(totals.items(), key=lambda item: -item[1]):
+            names = [thread_name] + [self._frame_label(index) for index in stack]
+            lines.append(f"{';'.join(name.replace(';', ':') for name in names)} {max(round(seconds * 1000), 1)}")
+        return "\n".join(lines) + "\n"
+
+    def _frame_label(self, index):
+        name, filename, line = self._frames[index]
+        return f"{name} ({os.path.basename(filename)}:{line})"
+
+    def top_functions(self, limit=TOP_FUNCTIONS):
+        """자기 시간(스택 맨 위에 있던 시간) 상위 함수 [(함수, 초, 비율)]"""
+        self_time = {}
+        total = 0.0
+        for _, samples in self.threads():
+            for stack, weight in samples:
+                self_time[stack[-1]] = self_time.get(stack[-1], 0.0) + weight
+                total += weight
+        ranked = sorted(self_time.items(), key=lambda item: -item[1])[:limit]
+        return [(self._frame_label(index), round(seconds, 3), round(seconds / total, 3) if total else 0.0) for index, seconds in ranked]
+
+
+def allocation_report(before, after, limit=TOP_ALLOCATIONS):
+    """두 tracemalloc 스냅샷 사이에 늘어난 할당 상위 항목 (파일:줄 기준)"""
+    if before is None or after is None:
+        return []
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, __file__)
+    ]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+    rows = []
+    for stat in diff[:limit]:
+        if stat.size_diff <= 0:
+            break
+        frame = stat.traceback[0]
+        rows.append({
+            'location': f"{frame.filename}:{frame.lineno}",
+            'size_kb': round(stat.size_diff / 1024, 1),
+            'count': stat.count_diff,
+            'total_kb': round(stat.size / 1024, 1)
+        })
+    return rows
+
+
+class ProfileStore:
+    """진행 중인 캡처와 최근 결과 모음 - @st.cache_resource 로 서버 전체에서 하나만 만들어 씀
+
+    검색 작업 스레드에서 시작한 캡처를 결과 화면을 그리는 세션 스레드에서 이어서 기록한 뒤 끝낼 수 있도록
+    캡처 ID 로 찾습니다. max_seconds 가 지나도록 끝나지 않은 캡처(화면을 닫은 경우 등)는 다음 begin() 에서 끝냄.
+    """
+
+    def __init__(self, directory, keep=20, max_seconds=600, interval=DEFAULT_INTERVAL):
+        self.directory = directory
+        self.keep = keep
+        self.max_seconds = max_seconds
+        self.interval = interval
+        self._pending = {}
+        self._results = []
+        self._lock = threading.Lock()
+
+    def begin(self, name, **attrs):
+        """캡처 시작 (현재 스레드는 아직 대상이 아님 - section() / 추적으로 추가)"""
+        for capture_id in self._expired():
+            self.finish(capture_id)
+        capture = Capture(name, interval=self.interval, **attrs).start()
+        with self._lock:
+            self._pending[capture.id] = capture
+        return capture
+
+    def _expired(self):
+        now = time.time()
+        with self._lock:
+            return [capture_id for capture_id, capture in self._pending.items() if now - capture.started_at > self.max_seconds]
+
+    def resume(self, capture_id):
+        """진행 중인 캡처에 현재 스레드 추가 (끝났거나 없으면 None)"""
+        with self._lock:
+            capture = self._pending.get(capture_id)
+        if capture is not None:
+            capture.enter()
+        return capture
+
+    def finish(self, capture_id):
+        """캡처 종료 후 파일 저장 → 요약 dict (이미 끝났으면 저장해 둔 요약)"""
+        with self._lock:
+            capture = self._pending.pop(capture_id, None)
+            if capture is None:
+                return next((result for result in self._results if result['id'] == capture_id), None)
+        capture.exit()
+        after = capture.stop()
+        summary = self._save(capture, allocation_report(capture._snapshot, after))
+        capture._snapshot = None
+        with self._lock:
+            self._results.insert(0, summary)
+            del self._results[self.keep:]
+        return summary
+
+    def _save(self, capture, allocations):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(capture.started_at))
+        base = os.path.join(self.directory, f"{stamp}_{capture.id}")
+        threads = capture.threads()
+        summary = {
+            'id': capture.id,
+            'name': capture.name,
+            'attrs': capture.attrs,
+            'started_at': capture.started_at,
+            'duration': round(capture.finished_at - capture.started_at, 3),
+            'samples': sum(len(samples) for _, samples in threads),
+            'threads': [name for name, _ in threads],
+            'top_functions': capture.top_functions(),
+            'top_allocations': allocations[:10],
+            'speedscope': base + ".speedscope.json",
+            'folded': base + ".folded",
+            'allocations': base + ".alloc.txt"
+        }
+        try:
+            with open(summary['speedscope'], 'w', encoding='utf-8') as f:
+                json.dump(capture.to_speedscope(), f, ensure_ascii=False)
+            with open(summary['folded'], 'w', encoding='utf-8') as f:
+                f.write(capture.to_folded())
+            with open(summary['allocations'], 'w', encoding='utf-8') as f:
+                f.write(f"# {capture.name} - 캡처 동안 늘어난 할당 상위 {len(allocations)}개 (프로세스 전체, 파일:줄)\n")
+                for row in allocations:
+                    f.write(f"{row['size_kb']:>10.1f} KB  {row['count']:>+8}개  {row['location']}\n")
+        except OSError as e:
+            summary['error'] = str(e)
+            print(f"프로파일 저장 오류: {e}")
+        return summary
+
+    def recent(self):
+        """최근 캡처 요약 (최신 순)"""
+        with self._lock:
+            return list(self._results)
@@ -0,0 +1,88 @@
+"""
+검색 진행 스트리밍 - 워크플로우를 stream 모드로 실행하며 노드가 보내는 진행 이벤트를 바로 전달
+
+노드는 emit() 으로 구조화된 진행 이벤트를 보내고, stream_workflow() 는 이벤트가 나오는 즉시
+on_event 로 넘깁니다 (병렬 수집 가지에서 보낸 이벤트도 가지가 끝나기 전에 전달됨).
+장단점이 들어 있는 이벤트는 부분 결과로 모아 on_partial 로 넘기고,
+검색 시작부터 첫 장단점이 나올 때까지의 시간(time to first result)을 잽니다.
+
+이벤트: {'kind', 'message', 'elapsed', ...종류별 값}
+    query      검색 API 호출 (query, source_type, start, found)
+    fetch      페이지 본문 요청 (title, link, source_type)
+    points     장단점 추출 (pros, cons, title)
+    cache_hit  캐시/DB 에 저장된 결과 사용 (source, name, rows)
+"""
+
+import time
+
+from langgraph.config import get_stream_writer
+
+EVENT_QUERY = "query"
+EVENT_FETCH = "fetch"
+EVENT_POINTS = "points"
+EVENT_CACHE_HIT = "cache_hit"
+
+
+def emit(kind, message, **data):
+    """현재 워크플로우 스트림으로 진행 이벤트 보내기 (워크플로우 밖에서 호출하면 무시)"""
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+    writer({'kind': kind, 'message': message, **data})
+
+
+class PartialResult:
+    """스트리밍 중 모인 장단점 (같은 문장은 한 번만, 도착 순서대로)"""
+
+    def __init__(self):
+        self.pros = []
+        self.cons = []
+        self._seen = set()
+
+    def add(self, pros, cons):
+        """새로 더해진 장단점이 있으면 True"""
+        added = False
+        for target, points in ((self.pros, pros), (self.cons, cons)):
+            for point in points or []:
+                if point not in self._seen:
+                    self._seen.add(point)
+                    target.append(point)
+                    added = True
+        return added
+
+
+def stream_workflow(app, initial_state, on_event=None, on_partial=None):
+    """워크플로우를 stream 모드로 실행해 최종 상태 반환
+
+    최종 상태의 results['timing'] 에 첫 결과까지의 시간과 전체 시간(초)을 기록합니다.
+    장단점 이벤트 없이 끝난 경우(샘플 데이터 등) 첫 결과 시간은 전체 시간과 같습니다.
+    """
+    started = time.monotonic()
+    partial = PartialResult()
+    first_result = None
+    final_state = None
+
+    for mode, chunk in app.stream(initial_state, stream_mode=["custom", "values"]):
+        if mode == "values":
+            final_state = chunk
+            continue
+        event = dict(chunk, elapsed=round(time.monotonic() - started, 3))
+        if event.get('pros') or event.get('cons'):
+            if first_result is None:
+                first_result = event['elapsed']
+                event['first_result'] = True
+            if partial.add(event.get('pros'), event.get('cons')) and on_partial:
+                on_partial(pros=list(partial.pros), cons=list(partial.cons), first_result=first_result)
+        if on_event:
+            on_event(event)
+
+    total = round(time.monotonic() - started, 3)
+    if final_state is not None:
+        if first_result is None and (final_state.get("pros") or final_state.get("cons")):
+            first_result = total
+        final_state["results"] = {
+            **(final_state.get("results") or {}),
+            "timing": {'time_to_first_result': first_result, 'total': total}
+        }
+    return final_state
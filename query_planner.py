@@ -0,0 +1,166 @@
+"""
+검색어 플래너 - 과거 수율이 높은 검색어 템플릿부터 큰 페이지로 조회하고, 후보가 떨어질 때만 다음 페이지 요청
+"""
+
+import json
+import os
+import threading
+
+# 네이버 검색 API 제한
+NAVER_MAX_DISPLAY = 100
+NAVER_MAX_START = 1000
+
+
+class QueryPlanner:
+    """검색어 템플릿별 수율(분석에 성공한 포스트 비율)을 학습하는 플래너
+
+    templates 는 (템플릿, 검색 유형) 목록입니다. 예: ("{name} 단점 후기", "blog")
+    수율은 베타 사전분포(prior)로 보정한 성공률이며 history_path 에 JSON 으로 저장됩니다.
+    @st.cache_resource 로 세션 간에 공유되므로 기록 갱신은 락으로 보호합니다.
+    """
+
+    def __init__(self, templates, history_path=None, page_size=30, depth_decay=0.6, prior=(1, 2)):
+        self.templates = templates
+        self.history_path = history_path
+        self.page_size = min(page_size, NAVER_MAX_DISPLAY)
+        self.depth_decay = depth_decay
+        self.prior = prior
+        self._lock = threading.Lock()
+        self._history = {}
+        self._load()
+
+    @staticmethod
+    def template_key(template, source_type):
+        return f"{source_type}:{template}"
+
+    def _load(self):
+        if not self.history_path or not os.path.exists(self.history_path):
+            return
+        try:
+            with open(self.history_path, encoding='utf-8') as f:
+                self._history = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"검색어 수율 기록 로드 오류: {e}")
+
+    def save(self):
+        """수율 기록 저장"""
+        if not self.history_path:
+            return
+        with self._lock:
+            data = json.dumps(self._history, ensure_ascii=False, indent=2)
+        try:
+            os.makedirs(os.path.dirname(self.history_path) or '.', exist_ok=True)
+            tmp_path = f"{self.history_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.history_path)
+        except OSError as e:
+            print(f"검색어 수율 기록 저장 오류: {e}")
+
+    def expected_yield(self, key):
+        """템플릿의 기대 수율 (분석 성공 포스트 / 분석 시도 포스트)"""
+        alpha, beta = self.prior
+        with self._lock:
+            record = self._history.get(key, {})
+            useful = record.get('useful', 0)
+            tried = record.get('tried', 0)
+        return (useful + alpha) / (tried + alpha + beta)
+
+    def record_result(self, key, useful):
+        """템플릿에서 나온 포스트 1개의 분석 결과 기록"""
+        if not key:
+            return
+        with self._lock:
+            record = self._history.setdefault(key, {'tried': 0, 'useful': 0, 'pages': 0, 'items': 0})
+            record['tried'] += 1
+            if useful:
+                record['useful'] += 1
+
+    def record_page(self, key, item_count):
+        """템플릿의 검색 페이지 조회 기록"""
+        with self._lock:
+            record = self._history.setdefault(key, {'tried': 0, 'useful': 0, 'pages': 0, 'items': 0})
+            record['pages'] += 1
+            record['items'] += item_count
+
+    def plan(self, name):
+        """검색 1회용 조회 계획 생성"""
+        return SearchPlan(self, name)
+
+    def snapshot(self):
+        """템플릿별 수율 요약"""
+        return {
+            self.template_key(template, source_type): round(self.expected_yield(self.template_key(template, source_type)), 3)
+            for template, source_type in self.templates
+        }
+
+
+class SearchPlan:
+    """검색 1회 동안의 페이지 조회 상태
+
+    next_request() 는 (기대 수율 × depth_decay^이미 조회한 페이지 수) 가 가장 큰 템플릿의
+    다음 페이지를 반환합니다. 수율 높은 템플릿은 깊이 조회하고 낮은 템플릿은 건너뜁니다.
+    단, 검색 유형(blog/news 등)마다 한 페이지씩은 먼저 조회해 한 유형의 결과만 모이지 않게 합니다.
+    """
+
+    def __init__(self, planner, name):
+        self.planner = planner
+        self.name = name
+        self.pages_fetched = 0
+        self.items_fetched = 0
+        self._types_fetched = set()
+        self._cursor = {}
+        for template, source_type in planner.templates:
+            key = planner.template_key(template, source_type)
+            self._cursor[key] = {
+                'query': template.format(name=name),
+                'source_type': source_type,
+                'start': 1,
+                'pages': 0,
+                'exhausted': False
+            }
+
+    def next_request(self, display=None):
+        """다음에 조회할 페이지 (더 조회할 것이 없으면 None)"""
+        display = min(display or self.planner.page_size, NAVER_MAX_DISPLAY)
+        available = {
+            key: cursor for key, cursor in self._cursor.items()
+            if not cursor['exhausted'] and cursor['start'] <= NAVER_MAX_START
+        }
+        # 아직 한 페이지도 조회하지 않은 검색 유형이 있으면 그 유형의 템플릿부터
+        unseen = {cursor['source_type'] for cursor in available.values()} - self._types_fetched
+        best_key = None
+        best_value = 0.0
+        for key, cursor in available.items():
+            if unseen and cursor['source_type'] not in unseen:
+                continue
+            value = self.planner.expected_yield(key) * (self.planner.depth_decay ** cursor['pages'])
+            if value > best_value:
+                best_key, best_value = key, value
+        if best_key is None:
+            return None
+
+        cursor = self._cursor[best_key]
+        return {
+            'template': best_key,
+            'query': cursor['query'],
+            'source_type': cursor['source_type'],
+            'start': cursor['start'],
+            'display': min(display, NAVER_MAX_START - cursor['start'] + 1)
+        }
+
+    def record_page(self, request, items):
+        """조회 결과 반영 (items: 검색 API가 돌려준 항목 목록)"""
+        cursor = self._cursor[request['template']]
+        cursor['pages'] += 1
+        cursor['start'] += request['display']
+        # 요청보다 적게 오면 마지막 페이지
+        if len(items) < request['display']:
+            cursor['exhausted'] = True
+        for item in items:
+            item['template'] = request['template']
+            item['query'] = request['query']
+        self._types_fetched.add(cursor['source_type'])
+        self.pages_fetched += 1
+        self.items_fetched += len(items)
+        self.planner.record_page(request['template'], len(items))
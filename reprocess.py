@@ -0,0 +1,232 @@
+"""
+보관된 원문 재처리 - 크롤링 원문 보관소(crawl_archive)의 본문으로 장단점을 다시 추출해 저장 (네이버 요청 없음)
+
+프롬프트를 바꾼 뒤 기존 제품/직업을 다시 채우는 용도입니다.
+    python reprocess.py product --extractor gpt --workers 8
+    python reprocess.py career --extractor simple --names "데이터 분석가" "AI 개발자"
+    python reprocess.py product --resume          # 중단된 작업 이어서
+
+추출기:
+    gpt     OpenAI 호환 API (OPENAI_BASE_URL 또는 --base-url 로 로컬 대역 서버 지정 가능)
+    simple  키워드 기반 추출 (직업만, API 키 불필요)
+
+이름 batch_size 개마다 추출 결과를 한 번에 저장(persist_batch)하고, 저장이 끝난 이름을
+체크포인트 파일(JSONL)에 기록합니다. --resume 은 체크포인트에 있는 이름을 건너뜁니다.
+저장소/저장 방식은 앱과 같은 환경 변수(STORAGE_BACKEND, ANALYSIS_STORAGE 등)를 따릅니다.
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from analysis_store import (
+    CAREER_TABLES, PRODUCT_TABLES, STORAGE_SUMMARY, build_career_summary, build_product_summary
+)
+from crawl_archive import archive_names, iter_records
+from extractors import (
+    CAREER_SYSTEM_PROMPT, PRODUCT_SYSTEM_PROMPT, career_prompt, deduplicate_points,
+    extract_career_simple, extract_with_gpt, product_prompt
+)
+from storage import create_storage
+from versioned_store import point_rows
+from write_behind import persist_batch
+
+EXTRACTOR_GPT = "gpt"
+EXTRACTOR_SIMPLE = "simple"
+
+# 추출 실패 표시 (None 은 '장단점 없음')
+_FAILED = object()
+
+
+def make_extractor(kind, extractor, base_url=None):
+    """(이름, 본문) → {'pros', 'cons'} 또는 None 을 반환하는 추출 함수"""
+    if extractor == EXTRACTOR_SIMPLE:
+        if kind != 'career':
+            raise ValueError("키워드 기반 추출은 직업만 지원합니다")
+        return extract_career_simple
+
+    from openai import OpenAI
+
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY") or "local", base_url=base_url)
+    system_prompt, build_prompt = (PRODUCT_SYSTEM_PROMPT, product_prompt) if kind == 'product' else (CAREER_SYSTEM_PROMPT, career_prompt)
+
+    def extract(name, content):
+        if not content or len(content) < 200:
+            return None
+        return extract_with_gpt(client, system_prompt, build_prompt(name, content))
+
+    return extract
+
+
+def build_item(kind, name, pros, cons, sources, storage_mode):
+    """앱과 같은 형식의 저장 항목 (write_behind.persist_batch 입력)"""
+    points_table, summary_table, key_column = PRODUCT_TABLES if kind == 'product' else CAREER_TABLES
+    if storage_mode == STORAGE_SUMMARY:
+        if kind == 'product':
+            row = build_product_summary(name, pros, cons, sources)
+        else:
+            # 연봉/경력 경로는 보관소에 없으므로 비워 두고 조회 시 기본값으로 채움
+            row = build_career_summary(name, pros, cons, sources)
+        return {'mode': 'summary', 'table': summary_table, 'key_column': key_column, 'name': name, 'rows': [row]}
+    return {
+        'mode': 'points', 'table': points_table, 'key_column': key_column, 'name': name,
+        'rows': point_rows(key_column, name, pros, cons)
+    }
+
+
+class Checkpoint:
+    """저장이 끝난 이름 기록 (JSONL, 한 줄에 한 이름 - 중간에 멈춰도 이미 쓴 줄은 유지)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self.done.add(json.loads(line)['name'])
+                    except (json.JSONDecodeError, KeyError):
+                        continue
+
+    def record(self, entries):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(entry['name'] for entry in entries)
+
+
+def reprocess_batch(archive_dir, kind, names, extract, executor, storage_mode):
+    """이름 묶음의 보관 본문을 병렬로 추출해 저장 항목과 기록 목록 반환
+
+    장단점이 없는 이름은 저장하지 않고, 추출 오류가 있던 이름은 기존 결과를 줄이지 않도록
+    저장도 기록도 하지 않습니다 (--resume 때 다시 시도).
+    """
+    records = defaultdict(list)
+    for record in iter_records(archive_dir, names=names, kind=kind):
+        records[record['name']].append(record)
+
+    jobs = [(name, record) for name in names for record in records.get(name, [])]
+    results = list(executor.map(lambda job: _extract_safely(extract, job[0], job[1]['text']), jobs))
+
+    extracted = defaultdict(list)
+    for (name, record), pros_cons in zip(jobs, results):
+        extracted[name].append((record, pros_cons))
+
+    items = []
+    entries = []
+    for name in names:
+        pros, cons, sources, errors = [], [], [], 0
+        for record, pros_cons in extracted.get(name, []):
+            if pros_cons is _FAILED:
+                errors += 1
+                continue
+            if pros_cons:
+                pros.extend(pros_cons['pros'])
+                cons.extend(pros_cons['cons'])
+                sources.append({'title': record.get('title', ''), 'link': record['url'], 'date': record['fetched_at'][:10]})
+        if errors:
+            print(f"  {name}: 추출 오류 {errors}건 - 다음 실행에서 다시 시도")
+            continue
+        pros, cons = deduplicate_points(pros), deduplicate_points(cons)
+        if pros or cons:
+            items.append(build_item(kind, name, pros, cons, sources[:10], storage_mode))
+        entries.append({
+            'name': name, 'texts': len(records.get(name, [])), 'pros': len(pros), 'cons': len(cons),
+            'saved': bool(pros or cons)
+        })
+    return items, entries
+
+
+def _extract_safely(extract, name, text):
+    try:
+        return extract(name, text)
+    except Exception as e:
+        print(f"  추출 오류 ({name}): {str(e)[:100]}")
+        return _FAILED
+
+
+def run(storage, archive_dir, kind, names, extract, checkpoint, workers=4, batch_size=20,
+        storage_mode="points", dry_run=False):
+    """이름 목록 재처리, 저장한 이름 수 반환"""
+    pending = [name for name in names if name not in checkpoint.done]
+    print(f"대상 {len(names)}개 중 {len(names) - len(pending)}개는 이미 처리됨, {len(pending)}개 처리")
+
+    saved = 0
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            items, entries = reprocess_batch(archive_dir, kind, batch, extract, executor, storage_mode)
+            if dry_run:
+                for entry in entries:
+                    print(f"  [dry-run] {entry['name']}: 본문 {entry['texts']}개 → 장점 {entry['pros']}개, 단점 {entry['cons']}개")
+                continue
+            failed = persist_batch(storage, items) if items else []
+            if failed:
+                # 저장에 실패한 이름은 처리 완료로 기록하지 않아 다음 실행에서 다시 처리
+                failed_names = {item['name'] for item, _ in failed}
+                print(f"  저장 실패 {len(failed)}개: {', '.join(sorted(failed_names))} ({failed[-1][1]})")
+                items = [item for item in items if item['name'] not in failed_names]
+                entries = [entry for entry in entries if entry['name'] not in failed_names]
+            if entries:
+                checkpoint.record(entries)
+            saved += len(items)
+            print(f"  {start + len(batch)}/{len(pending)} 처리, {len(items)}개 저장 ({time.monotonic() - started:.1f}초)")
+    return saved
+
+
+def main():
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="보관된 크롤링 원문으로 장단점 재추출 후 저장")
+    parser.add_argument('kind', choices=['product', 'career'])
+    parser.add_argument('--names', nargs='+', help="재처리할 이름 (없으면 보관소의 모든 이름)")
+    parser.add_argument('--names-file', help="재처리할 이름 목록 파일 (한 줄에 하나)")
+    parser.add_argument('--extractor', choices=[EXTRACTOR_GPT, EXTRACTOR_SIMPLE], default=EXTRACTOR_GPT)
+    parser.add_argument('--base-url', default=os.getenv("OPENAI_BASE_URL"), help="OpenAI 호환 API 주소 (로컬 대역 서버)")
+    parser.add_argument('--workers', type=int, default=4, help="동시 추출 수")
+    parser.add_argument('--batch-size', type=int, default=20, help="한 번에 저장할 이름 수")
+    parser.add_argument('--archive', default=None, help="원문 보관소 디렉터리")
+    parser.add_argument('--checkpoint', default=None, help="체크포인트 파일")
+    parser.add_argument('--resume', action='store_true', help="체크포인트에 있는 이름은 건너뜀")
+    parser.add_argument('--dry-run', action='store_true', help="저장하지 않고 추출 결과만 출력")
+    args = parser.parse_args()
+
+    cache_dir = os.getenv("SMART_CACHE_DIR", ".cache")
+    archive_dir = args.archive or os.getenv("CRAWL_ARCHIVE_DIR", os.path.join(cache_dir, "crawl_archive"))
+    checkpoint_path = args.checkpoint or os.path.join(cache_dir, f"reprocess-{args.kind}.jsonl")
+    if not args.resume and os.path.exists(checkpoint_path) and not args.dry_run:
+        os.remove(checkpoint_path)
+
+    names = args.names or []
+    if args.names_file:
+        with open(args.names_file, encoding='utf-8') as f:
+            names += [line.strip() for line in f if line.strip()]
+    if not names:
+        names = archive_names(archive_dir, kind=args.kind)
+
+    storage = None
+    if not args.dry_run:
+        storage = create_storage(
+            os.getenv("STORAGE_BACKEND", "auto"), os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"),
+            os.getenv("LOCAL_DB_PATH", os.path.join(cache_dir, "analysis.db"))
+        )
+        if storage is None:
+            parser.error("저장소가 설정되지 않았습니다 (STORAGE_BACKEND)")
+
+    saved = run(
+        storage, archive_dir, args.kind, names, make_extractor(args.kind, args.extractor, args.base_url),
+        Checkpoint(checkpoint_path), workers=args.workers, batch_size=args.batch_size,
+        storage_mode=os.getenv("ANALYSIS_STORAGE", "points"), dry_run=args.dry_run
+    )
+    print(f"완료: {saved}개 저장")
+
+
+if __name__ == "__main__":
+    main()
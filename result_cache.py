@@ -0,0 +1,107 @@
+"""
+조회 결과 캐시 - 같은 제품/직업을 반복 조회할 때 Supabase 왕복 없이 메모리에서 반환 (LRU + TTL)
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+def percentile(values, pct):
+    """정렬된 목록의 백분위수 (nearest-rank 방식, 빈 목록이면 None)"""
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+class ResultCache:
+    """검색어(정규화된 이름)별 조회 결과를 보관하는 읽기 전용 캐시 (read-through)
+
+    get_or_load() 는 캐시에 있으면 바로 반환하고, 없으면 loader 로 DB를 조회한 뒤 저장합니다.
+    max_entries 를 넘으면 가장 오래 쓰지 않은 항목부터 버리고, ttl_seconds 가 지난 항목은
+    다시 조회합니다 (다른 서버 프로세스가 저장한 결과도 TTL 안에 반영되도록).
+    빈 결과는 저장하지 않으므로 크롤링 직후의 첫 조회는 항상 DB로 갑니다.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=300, sample_size=1000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._latencies = deque(maxlen=sample_size)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        """캐시에 있으면 반환, 없으면 loader() 결과를 저장 후 반환 - (값, 캐시 적중 여부)"""
+        started = time.perf_counter()
+        value = self.get(key)
+        hit = value is not None
+        if not hit:
+            value = loader()
+            if value:
+                self.put(key, value)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._latencies.append(time.perf_counter() - started)
+        return value, hit
+
+    def invalidate(self, key):
+        """새 결과가 저장된 항목 제거"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def snapshot(self):
+        """캐시 상태 요약 (조회 지연은 밀리초)"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            size = len(self._entries)
+        p50 = percentile(latencies, 50)
+        p99 = percentile(latencies, 99)
+        return {
+            'size': size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hit_ratio(), 3),
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'p50_ms': round(p50 * 1000, 2) if p50 is not None else None,
+            'p99_ms': round(p99 * 1000, 2) if p99 is not None else None
+        }
@@ -0,0 +1,155 @@
+"""
+싱글 플라이트 - 같은 제품/직업을 동시에 검색하면 크롤링은 한 번만 실행하고 결과를 공유
+"""
+
+import os
+import re
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+
+from job_runner import current_job, report_progress
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def normalize_key(name):
+    """검색어 정규화 (전각/반각, 대소문자, 공백 차이 무시)"""
+    name = unicodedata.normalize('NFKC', name or '')
+    return re.sub(r'\s+', ' ', name).strip().lower()
+
+
+class ThreadLockBackend:
+    """프로세스 내부 잠금 (Streamlit 서버 1개의 여러 스레드)"""
+
+    def __init__(self):
+        self._locks = {}                 # 키 → [잠금, 잡았거나 기다리는 수]
+        self._guard = threading.Lock()
+
+    @contextmanager
+    def hold(self, key):
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            # 마지막으로 놓는 쪽이 항목을 지워 검색어마다 잠금이 쌓이지 않게 함
+            with self._guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+
+
+class FileLockBackend:
+    """파일 잠금 (같은 서버의 여러 프로세스)
+
+    다른 프로세스가 같은 키를 처리 중이면 끝날 때까지 기다린 뒤 실행합니다.
+    그 사이 결과가 DB에 저장되므로, 뒤따른 검색은 DB 조회 단계에서 바로 끝납니다.
+    """
+
+    def __init__(self, directory, poll_interval=0.5):
+        if fcntl is None:
+            raise RuntimeError("FileLockBackend는 fcntl을 지원하는 OS에서만 사용할 수 있습니다")
+        self.directory = directory
+        self.poll_interval = poll_interval
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        safe = re.sub(r'[^0-9a-zA-Z가-힣_-]+', '_', key)[:80]
+        return os.path.join(self.directory, f"{safe}.lock")
+
+    @contextmanager
+    def hold(self, key):
+        with open(self._path(key), 'a') as f:
+            waiting = False
+            while True:
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if not waiting:
+                        report_progress("⏳ 다른 서버 프로세스에서 같은 검색을 진행 중입니다. 완료를 기다립니다...")
+                        waiting = True
+                    time.sleep(self.poll_interval)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class SingleFlight:
+    """검색어별로 진행 중인 작업을 하나만 유지하는 조정자
+
+    같은 키로 submit() 하면 이미 진행 중인 작업 ID를 돌려주므로, 뒤따른 세션은 같은 작업의
+    진행 기록과 결과를 함께 봅니다. 작업 실행은 lock_backend 로 감싸서 프로세스 간에도
+    같은 키가 동시에 크롤링되지 않게 합니다. 구독한 세션이 모두 취소해야 작업이 취소됩니다.
+    """
+
+    def __init__(self, runner, lock_backend=None):
+        self.runner = runner
+        self.lock_backend = lock_backend or ThreadLockBackend()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._subscribers = {}
+        self.stats = {
+            'leaders': 0,
+            'followers': 0
+        }
+
+    def submit(self, key, fn, *args, name="", **kwargs):
+        """작업 등록 또는 진행 중인 작업에 합류, (작업 ID, 합류 여부) 반환"""
+        with self._lock:
+            job_id = self._inflight.get(key)
+            job = self.runner.get(job_id) if job_id else None
+            if job and not job.finished() and not job.cancelled():
+                self._subscribers[job_id] = self._subscribers.get(job_id, 0) + 1
+                self.stats['followers'] += 1
+                return job_id, True
+
+            def run_exclusive():
+                try:
+                    with self.lock_backend.hold(key):
+                        return fn(*args, **kwargs)
+                finally:
+                    self._finish(key, current_job().id)
+
+            job_id = self.runner.submit(run_exclusive, name=name or key)
+            self._inflight[key] = job_id
+            self._subscribers[job_id] = 1
+            self.stats['leaders'] += 1
+            return job_id, False
+
+    def _finish(self, key, job_id):
+        # 취소된 작업이 늦게 끝날 때 그 사이 같은 키로 등록된 새 작업을 지우지 않도록 작업 ID 확인
+        with self._lock:
+            if self._inflight.get(key) == job_id:
+                del self._inflight[key]
+            self._subscribers.pop(job_id, None)
+
+    def cancel(self, job_id):
+        """구독 해제 - 마지막 구독자가 해제하면 작업 취소"""
+        with self._lock:
+            remaining = self._subscribers.get(job_id, 1) - 1
+            if remaining > 0:
+                self._subscribers[job_id] = remaining
+                return False
+            self._subscribers.pop(job_id, None)
+        cancelled = self.runner.cancel(job_id)
+        job = self.runner.get(job_id)
+        if cancelled and job and not job.started_at:
+            # 시작 전에 취소된 작업은 run_exclusive 가 실행되지 않으므로 여기서 정리
+            with self._lock:
+                for key, inflight_id in list(self._inflight.items()):
+                    if inflight_id == job_id:
+                        del self._inflight[key]
+        return cancelled
+
+    def inflight_count(self):
+        with self._lock:
+            return len(self._inflight)
@@ -0,0 +1,440 @@
+"""
+저장소 백엔드 - Supabase 또는 로컬 SQLite (Supabase 키가 없어도 분석 결과를 저장하고 재사용)
+
+두 백엔드 모두 supabase-py 클라이언트와 같은 방식으로 사용합니다:
+    storage.table('laptop_pros_cons').select("*").eq('product_name', name).execute().data
+    storage.rpc('save_laptop_pros_cons_version', {...}).execute()
+
+SQLite 백엔드는 이 앱에서 쓰는 조회 방식(select/insert/upsert/delete, eq/lt/not_.in_/order/limit/range)만
+지원하며, 장단점 내용과 이름에 FTS5 전문 검색 인덱스(한글 2글자 단위)를 함께 유지합니다.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from datetime import datetime, timezone
+
+from versioned_store import rpc_name
+
+# 저장소 종류
+BACKEND_AUTO = "auto"          # Supabase 키가 있으면 Supabase, 없으면 SQLite
+BACKEND_SUPABASE = "supabase"
+BACKEND_SQLITE = "sqlite"
+BACKEND_NONE = "none"
+
+# 테이블 구성: 장단점 1개당 1행(points) / 제품·직업 1개당 1행(summary)
+TABLES = {
+    'laptop_pros_cons': {'key': 'product_name', 'kind': 'points'},
+    'career_pros_cons': {'key': 'career_name', 'kind': 'points'},
+    'laptop_analysis': {'key': 'product_name', 'kind': 'summary'},
+    'career_analysis': {'key': 'career_name', 'kind': 'summary'},
+}
+
+_WORD_PATTERN = re.compile(r'[0-9a-z가-힣]+')
+
+
+def bigram_tokens(text):
+    """한글 검색용 토큰 - 단어마다 2글자씩 겹쳐 자름 (예: '발열심함' → 발열, 열심, 심함)
+
+    조사가 붙거나 띄어쓰기가 달라도 겹치는 2글자가 있으면 찾을 수 있습니다. 1글자 단어는 그대로 둡니다.
+    """
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    tokens = []
+    for word in _WORD_PATTERN.findall(text):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def fts_query(text, mode='AND'):
+    """검색어를 FTS5 MATCH 식으로 변환 (토큰이 없으면 None)"""
+    tokens = list(dict.fromkeys(bigram_tokens(text)))
+    if not tokens:
+        return None
+    return f" {mode} ".join('"' + token.replace('"', '""') + '"' for token in tokens)
+
+
+def create_storage(backend=BACKEND_AUTO, supabase_url="", supabase_key="", sqlite_path=""):
+    """설정에 맞는 저장소 생성 (사용할 수 없으면 None)"""
+    if backend == BACKEND_AUTO:
+        backend = BACKEND_SUPABASE if supabase_url and supabase_key else BACKEND_SQLITE
+    if backend == BACKEND_SUPABASE:
+        if not (supabase_url and supabase_key):
+            return None
+        from supabase import create_client
+        return create_client(supabase_url, supabase_key)
+    if backend == BACKEND_SQLITE and sqlite_path:
+        return SQLiteStorage(sqlite_path)
+    return None
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Negation:
+    def __init__(self, query):
+        self.query = query
+
+    def in_(self, column, values):
+        return self.query._filter(column, 'NOT IN', list(values))
+
+
+class _Query:
+    """supabase-py 조회 빌더와 같은 방식의 SQLite 조회"""
+
+    def __init__(self, storage, table):
+        if table not in TABLES:
+            raise ValueError(f"알 수 없는 테이블: {table}")
+        self.storage = storage
+        self.table = table
+        self.action = 'select'
+        self.payload = None
+        self.filters = []
+        self.row_limit = None
+        self.row_offset = 0
+        self.order_by = None
+        self.not_ = _Negation(self)
+
+    def select(self, *columns):
+        self.action = 'select'
+        return self
+
+    def insert(self, rows):
+        self.action, self.payload = 'insert', rows
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.action, self.payload = 'upsert', rows
+        return self
+
+    def delete(self):
+        self.action = 'delete'
+        return self
+
+    def _filter(self, column, op, value):
+        self.filters.append((column, op, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, '=', value)
+
+    def lt(self, column, value):
+        return self._filter(column, '<', value)
+
+    def in_(self, column, values):
+        return self._filter(column, 'IN', list(values))
+
+    def order(self, column, desc=False):
+        self.order_by = (column, desc)
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def range(self, start, end):
+        self.row_offset = start
+        self.row_limit = end - start + 1
+        return self
+
+    def execute(self):
+        return _Result(self.storage._execute(self))
+
+
+class _Call:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self):
+        return _Result(self.fn())
+
+
+class SQLiteStorage:
+    """로컬 SQLite 저장소 (FTS5 전문 검색 포함)
+
+    연결 하나를 락으로 보호해 여러 스레드(검색 작업, 지연 저장)에서 함께 씁니다.
+    장단점 행이 추가/삭제되면 트리거가 indexed_points 와 FTS5 인덱스를 함께 갱신합니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.create_function('bigrams', 1, lambda text: ' '.join(bigram_tokens(text)), deterministic=True)
+        self._conn.create_function('compact_name', 1, _compact, deterministic=True)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        statements = [
+            """create table if not exists indexed_points (
+                id integer primary key, source text, ref integer, name text, type text, content text)""",
+            "create index if not exists indexed_points_ref_idx on indexed_points (source, ref)",
+            "create index if not exists indexed_points_name_idx on indexed_points (source, name)",
+            "create virtual table if not exists point_fts using fts5(tokens)",
+            """create trigger if not exists indexed_points_ai after insert on indexed_points begin
+                insert into point_fts (rowid, tokens) values (new.id, bigrams(new.content)); end""",
+            """create trigger if not exists indexed_points_ad after delete on indexed_points begin
+                delete from point_fts where rowid = old.id; end""",
+            "create table if not exists indexed_names (id integer primary key, source text, name text, unique (source, name))",
+            "create virtual table if not exists name_fts using fts5(tokens)",
+            """create trigger if not exists indexed_names_ai after insert on indexed_names begin
+                insert into name_fts (rowid, tokens) values (new.id, bigrams(new.name)); end""",
+            """create trigger if not exists indexed_names_ad after delete on indexed_names begin
+                delete from name_fts where rowid = old.id; end""",
+            # 띄어쓰기/대소문자/전각 차이만 있는 이름을 전문 검색 순위와 상관없이 바로 찾기 위한 색인
+            "create index if not exists indexed_names_compact_idx on indexed_names (source, compact_name(name))",
+        ]
+        for table, spec in TABLES.items():
+            key = spec['key']
+            # 트리거 안의 'insert or ignore' 는 바깥 upsert 의 충돌 처리에 덮이므로 존재 여부를 직접 확인
+            index_name = f"""insert into indexed_names (source, name) select '{table}', new.{key}
+                        where not exists (select 1 from indexed_names where source = '{table}' and name = new.{key});"""
+            if spec['kind'] == 'points':
+                statements += [
+                    f"""create table if not exists {table} (
+                        id integer primary key, {key} text not null, type text, content text,
+                        version integer not null default 0, created_at text)""",
+                    f"create index if not exists {table}_name_version_idx on {table} ({key}, version)",
+                    f"""create trigger if not exists {table}_ai after insert on {table} begin
+                        insert into indexed_points (source, ref, name, type, content)
+                            values ('{table}', new.id, new.{key}, new.type, new.content);
+                        {index_name} end""",
+                    f"""create trigger if not exists {table}_ad after delete on {table} begin
+                        delete from indexed_points where source = '{table}' and ref = old.id; end""",
+                    # 이름의 마지막 행이 지워지면 이름 색인에서도 삭제 (버전 교체는 새 행을 먼저 넣으므로 유지)
+                    f"""create trigger if not exists {table}_names_ad after delete on {table} begin
+                        delete from indexed_names where source = '{table}' and name = old.{key}
+                            and not exists (select 1 from {table} where {key} = old.{key}); end""",
+                    f"""delete from indexed_names where source = '{table}'
+                        and not exists (select 1 from {table} where {key} = indexed_names.name)""",
+                ]
+            else:
+                index_points = f"""
+                        insert into indexed_points (source, name, type, content)
+                            select '{table}', new.{key}, 'pro', value from json_each(new.data, '$.pros')
+                            union all
+                            select '{table}', new.{key}, 'con', value from json_each(new.data, '$.cons');
+                        {index_name}"""
+                statements += [
+                    f"create table if not exists {table} ({key} text primary key, data text, created_at text)",
+                    f"""create trigger if not exists {table}_ai after insert on {table} begin{index_points} end""",
+                    f"""create trigger if not exists {table}_au after update on {table} begin
+                        delete from indexed_points where source = '{table}' and name = old.{key};{index_points} end""",
+                    f"""create trigger if not exists {table}_ad after delete on {table} begin
+                        delete from indexed_points where source = '{table}' and name = old.{key}; end""",
+                    f"""create trigger if not exists {table}_names_ad after delete on {table} begin
+                        delete from indexed_names where source = '{table}' and name = old.{key}; end""",
+                    f"""delete from indexed_names where source = '{table}'
+                        and not exists (select 1 from {table} where {key} = indexed_names.name)""",
+                ]
+        with self._lock:
+            for statement in statements:
+                self._conn.execute(statement)
+
+    def table(self, table):
+        return _Query(self, table)
+
+    def rpc(self, name, params):
+        """버전 저장 프로시저 (versioned_store.versioned_save_sql 과 같은 동작)"""
+        table = next((t for t, spec in TABLES.items() if spec['kind'] == 'points' and rpc_name(t) == name), None)
+        if table is None:
+            error = RuntimeError(f"function {name} does not exist")
+            error.code = 'PGRST202'
+            raise error
+        return _Call(lambda: self._save_version(table, params))
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc).isoformat()
+
+    def _save_version(self, table, params):
+        key = TABLES[table]['key']
+        name = params['p_name']
+        created_at = self._now()
+        rows = [(name, 'pro', pro, created_at) for pro in params['p_pros']]
+        rows += [(name, 'con', con, created_at) for con in params['p_cons']]
+        with self._lock:
+            self._conn.execute("begin immediate")
+            try:
+                version = self._conn.execute(
+                    f"select coalesce(max(version), 0) + 1 from {table} where {key} = ?", (name,)
+                ).fetchone()[0]
+                self._conn.executemany(
+                    f"insert into {table} ({key}, type, content, created_at, version) values (?, ?, ?, ?, {int(version)})", rows
+                )
+                self._conn.execute(f"delete from {table} where {key} = ? and version < ?", (name, version))
+                self._conn.execute("commit")
+            except Exception:
+                self._conn.execute("rollback")
+                raise
+        return version
+
+    def _where(self, query, columns):
+        clauses, params = [], []
+        for column, op, value in query.filters:
+            if column not in columns:
+                raise ValueError(f"{query.table} 에서 지원하지 않는 조건 컬럼: {column}")
+            if op in ('IN', 'NOT IN'):
+                clauses.append(f"{column} {op} ({', '.join('?' for _ in value) or 'null'})")
+                params.extend(value)
+            else:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        return (" where " + " and ".join(clauses) if clauses else ""), params
+
+    def _execute(self, query):
+        spec = TABLES[query.table]
+        key = spec['key']
+        if spec['kind'] == 'points':
+            columns = ('id', key, 'type', 'content', 'version', 'created_at')
+        else:
+            columns = (key, 'created_at')
+        where, params = self._where(query, columns)
+
+        with self._lock:
+            if query.action == 'select':
+                order = "rowid"
+                if query.order_by:
+                    column, desc = query.order_by
+                    if column not in columns:
+                        raise ValueError(f"{query.table} 에서 지원하지 않는 정렬 컬럼: {column}")
+                    order = f"{column} desc" if desc else column
+                sql = f"select * from {query.table}{where} order by {order}"
+                if query.row_limit is not None:
+                    sql += f" limit {int(query.row_limit)} offset {int(query.row_offset)}"
+                rows = [dict(row) for row in self._conn.execute(sql, params)]
+                return rows if spec['kind'] == 'points' else [self._decode_summary(row) for row in rows]
+
+            if query.action == 'delete':
+                self._conn.execute(f"delete from {query.table}{where}", params)
+                return []
+
+            payload = query.payload if isinstance(query.payload, list) else [query.payload]
+            return self._write(query.table, spec, payload, upsert=query.action == 'upsert')
+
+    def _write(self, table, spec, rows, upsert):
+        key = spec['key']
+        created_at = self._now()
+        written = []
+        self._conn.execute("begin immediate")
+        try:
+            for row in rows:
+                if spec['kind'] == 'points':
+                    # 장단점 행은 id로만 구분되므로 upsert 도 id가 없으면 새 행 추가
+                    values = (row.get('id'), row[key], row.get('type'), row.get('content'),
+                              row.get('version', 0), row.get('created_at') or created_at)
+                    verb = "insert or replace" if upsert else "insert"
+                    cursor = self._conn.execute(
+                        f"{verb} into {table} (id, {key}, type, content, version, created_at) values (?, ?, ?, ?, ?, ?)", values
+                    )
+                    written.append(dict(row, id=cursor.lastrowid, version=values[4], created_at=values[5]))
+                else:
+                    stored = dict(row, created_at=row.get('created_at') or created_at)
+                    data = json.dumps(stored, ensure_ascii=False)
+                    if upsert:
+                        self._conn.execute(
+                            f"insert into {table} ({key}, data, created_at) values (?, ?, ?) "
+                            f"on conflict ({key}) do update set data = excluded.data, created_at = excluded.created_at",
+                            (row[key], data, stored['created_at'])
+                        )
+                    else:
+                        self._conn.execute(f"insert into {table} ({key}, data, created_at) values (?, ?, ?)", (row[key], data, stored['created_at']))
+                    written.append(stored)
+            self._conn.execute("commit")
+        except Exception:
+            self._conn.execute("rollback")
+            raise
+        return written
+
+    @staticmethod
+    def _decode_summary(row):
+        data = json.loads(row['data']) if row.get('data') else {}
+        data['created_at'] = row.get('created_at')
+        return data
+
+    def search_names(self, table, text, limit=5):
+        """저장된 이름 중 검색어와 비슷한 이름 (겹치는 2글자가 많은 순) - [(이름, 점수)]"""
+        match = fts_query(text, mode='OR')
+        if not match:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                """select n.name, bm25(name_fts) as score from name_fts
+                   join indexed_names n on n.id = name_fts.rowid
+                   where name_fts match ? and n.source = ? order by score limit ?""",
+                (match, table, limit)
+            ).fetchall()
+        return [(row['name'], -row['score']) for row in rows]
+
+    def find_name(self, table, name):
+        """저장된 이름 중 띄어쓰기/대소문자/전각 차이만 있는 이름 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                """select name from indexed_names indexed by indexed_names_compact_idx
+                   where source = ? and compact_name(name) = ? limit 1""",
+                (table, _compact(name))
+            ).fetchone()
+        return row['name'] if row else None
+
+    def search_points(self, text, sources=None, point_type=None, limit=20):
+        """장단점 내용 전문 검색 (관련도 순) - [{'source', 'name', 'type', 'content', 'score'}]"""
+        match = fts_query(text)
+        if not match:
+            return []
+        sql = """select p.source, p.name, p.type, p.content, bm25(point_fts) as score from point_fts
+                 join indexed_points p on p.id = point_fts.rowid where point_fts match ?"""
+        params = [match]
+        if sources:
+            sql += f" and p.source in ({', '.join('?' for _ in sources)})"
+            params.extend(sources)
+        if point_type:
+            sql += " and p.type = ?"
+            params.append(point_type)
+        sql += " order by score limit ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row, score=-row['score']) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _compact(name):
+    return re.sub(r'\s+', '', unicodedata.normalize('NFKC', name or '')).lower()
+
+
+def find_stored_name(storage, table, name):
+    """저장된 이름 중 띄어쓰기/대소문자/전각 차이만 있는 이름 (이름 검색을 지원하지 않는 저장소면 None)"""
+    if not hasattr(storage, 'search_names'):
+        return None
+    # 정확히 같은 이름(정규화 기준)을 먼저 확인 - 전문 검색 상위 몇 개에 들지 못해도 찾도록
+    if hasattr(storage, 'find_name'):
+        stored = storage.find_name(table, name)
+        if stored:
+            return stored
+    target = _compact(name)
+    for candidate, _ in storage.search_names(table, name):
+        if _compact(candidate) == target:
+            return candidate
+    return None
+
+
+def similar_names(storage, table, name, limit=3):
+    """저장된 이름 중 비슷한 이름 목록 (이름 검색을 지원하지 않는 저장소면 빈 목록)"""
+    if not hasattr(storage, 'search_names'):
+        return []
+    return [candidate for candidate, _ in storage.search_names(table, name, limit=limit)]
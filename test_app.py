@@ -15,7 +15,6 @@ st.set_page_config(
 
 # 필요한 라이브러리 import
 import pandas as pd
-from supabase import create_client
 from openai import OpenAI
 import os
 from dotenv import load_dotenv
@@ -37,9 +36,37 @@ import urllib.request
 # LangGraph 관련
 from typing import TypedDict, Annotated, List, Union, Dict
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
 from langchain_core.messages import HumanMessage, AIMessage
 import operator
 
+# 크롤러 공용 모듈
+from circuit_breaker import HostCircuitBreaker, host_of
+from crawl_frontier import CrawlFrontier, CrawlBudget, canonical_link, time_left, request_timeout
+from convergence import NoveltyTracker, estimate_savings
+from query_planner import QueryPlanner
+from job_runner import JobRunner, report_progress, report_partial, is_cancelled, FAILED, CANCELLED
+from single_flight import SingleFlight, ThreadLockBackend, FileLockBackend, normalize_key
+from freshness import FreshnessPolicy
+from versioned_store import latest_version, point_rows
+from result_cache import ResultCache
+from storage import create_storage, find_stored_name, similar_names
+from write_behind import WriteBehindQueue, persist_batch
+from crawl_archive import CrawlArchive
+from crawl_checkpoint import CrawlCheckpoint
+from crawl_graph import CrawlSession, as_update, partition, merge_branch_results
+from tracing import JsonlExporter, add_listener, start_trace, span, traced, waterfall_rows, summarize, to_chrome_trace
+from profiling import ProfileStore
+from metrics import MetricsRegistry, STAGE_LABELS
+from progress_stream import emit, stream_workflow, EVENT_QUERY, EVENT_FETCH, EVENT_POINTS, EVENT_CACHE_HIT
+from extractors import PRODUCT_SYSTEM_PROMPT, product_prompt, extract_with_gpt, deduplicate_points
+from point_search import PointIndex, index_item, search_stored_points, group_by_name
+from analysis_store import (
+    STORAGE_SUMMARY, PRODUCT_STOPWORDS, PRODUCT_CATEGORIES,
+    extract_keywords as extract_point_keywords, categorize_points,
+    build_product_summary, fetch_summary
+)
+
 # 앱 시작 시 폰트 자동 다운로드
 @st.cache_resource
 def ensure_font():
@@ -80,12 +107,81 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY") or st.secrets.get("OPENAI_API_KEY",
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID") or st.secrets.get("NAVER_CLIENT_ID", "")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET") or st.secrets.get("NAVER_CLIENT_SECRET", "")
 
+# 외부 서비스 주소 (벤치마크/테스트에서 로컬 대역 서버로 바꿔 실행 - benchmarks/e2e.py)
+NAVER_API_BASE = os.getenv("NAVER_API_BASE", "https://openapi.naver.com").rstrip("/")
+BLOG_MOBILE_BASE = os.getenv("BLOG_MOBILE_BASE", "https://m.blog.naver.com").rstrip("/")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
 # 쿠팡 파트너스 설정
 COUPANG_PARTNER_ID = os.getenv("COUPANG_PARTNER_ID") or st.secrets.get("COUPANG_PARTNER_ID", "")
 COUPANG_ACCESS_KEY = os.getenv("COUPANG_ACCESS_KEY") or st.secrets.get("COUPANG_ACCESS_KEY", "")
 # 이 줄을 추가하세요:
 COUPANG_PARTNER_TAG = os.getenv("COUPANG_PARTNER_TAG") or st.secrets.get("COUPANG_PARTNER_TAG", "AF2834321")
 
+# 검색 1회당 크롤링 예산
+CRAWL_TIME_BUDGET = 45        # 초
+CRAWL_LLM_BUDGET = 10         # GPT 호출 수
+CRAWL_FETCH_BUDGET = 15       # 페이지 요청 수
+CRAWL_BRANCHES = 4            # 동시에 실행할 수집 가지 수 (페이지 요청 → 장단점 추출)
+
+# 검색 1회의 응답 시간 한도 - 지나면 그때까지 수집한 결과를 부분 결과로 반환 (백그라운드 재수집은 CRAWL_TIME_BUDGET)
+SEARCH_DEADLINE = float(os.getenv("SEARCH_DEADLINE", "8"))   # 초
+DEADLINE_RESERVE = 1.0        # 합치기/저장에 남겨 둘 시간 (초)
+
+# 검색어 템플릿 (수율 높은 템플릿부터 큰 페이지로 조회)
+SEARCH_TEMPLATES = [
+    ("{name} 장단점 실사용", "blog"),
+    ("{name} 단점 후기", "blog"),
+    ("{name} 장점 리뷰", "blog")
+]
+SEARCH_PAGE_SIZE = 30         # 검색 API 1회당 결과 수 (최대 100)
+SEARCH_INITIAL_PAGES = 2      # 처음에 조회할 페이지 수
+
+# 로컬 캐시 디렉터리 (검색어 수율 기록 등)
+CACHE_DIR = os.getenv("SMART_CACHE_DIR", ".cache")
+
+# 저장된 분석의 유효 기간 - 지나면 저장된 결과를 먼저 보여주고 백그라운드에서 다시 수집
+ANALYSIS_TTL_DAYS = 7
+
+# 저장소: auto (Supabase 키가 있으면 Supabase, 없으면 로컬 SQLite) / supabase / sqlite / none
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "auto")
+LOCAL_DB_PATH = os.getenv("LOCAL_DB_PATH", os.path.join(CACHE_DIR, "analysis.db"))
+
+# 분석 결과 저장 방식: points (장단점 1개당 1행) / summary (제품 1개당 1행, laptop_analysis 테이블)
+ANALYSIS_STORAGE = os.getenv("ANALYSIS_STORAGE", "points")
+
+# 수집한 본문 원문 보관 (프롬프트 변경/새 분석 시 다시 크롤링하지 않고 재사용, 0이면 끔)
+CRAWL_ARCHIVE_ENABLED = os.getenv("CRAWL_ARCHIVE", "1") != "0"
+CRAWL_ARCHIVE_DIR = os.getenv("CRAWL_ARCHIVE_DIR", os.path.join(CACHE_DIR, "crawl_archive"))
+
+# 크롤링 체크포인트 - 중단된 검색을 다시 하면 처리를 마친 포스트는 다시 요청/추출하지 않고 이어받음 (0이면 끔)
+CRAWL_CHECKPOINT_ENABLED = os.getenv("CRAWL_CHECKPOINT", "1") != "0"
+CRAWL_CHECKPOINT_PATH = os.getenv("CRAWL_CHECKPOINT_PATH", os.path.join(CACHE_DIR, "crawl_checkpoints.db"))
+
+# 검색 구간 추적 기록 (JSONL, `python tracing.py chrome` 으로 Chrome 추적 형식 변환, 0이면 파일에 남기지 않음)
+TRACE_EXPORT_ENABLED = os.getenv("TRACE_EXPORT", "1") != "0"
+TRACE_PATH = os.getenv("TRACE_PATH", os.path.join(CACHE_DIR, "traces.jsonl"))
+# 검색 1회 프로파일링 결과 (speedscope / folded / 메모리 할당 보고서) - 사이드바에서 켜거나 주소에 ?profile=1
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(CACHE_DIR, "profiles"))
+# 운영 지표 (Prometheus 텍스트 형식) - METRICS_PORT 를 주면 http://127.0.0.1:<포트>/metrics 로 제공,
+# 검색이 끝날 때마다 METRICS_PATH 파일에도 기록 (빈 값이면 기록 안 함)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_PATH = os.getenv("METRICS_PATH", os.path.join(CACHE_DIR, "metrics_product.prom"))
+
+# 분석 결과를 저장 대기열에 넘기고 바로 결과 표시 (0이면 검색 흐름 안에서 바로 저장)
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND", "1") != "0"
+
+# 조회 결과 메모리 캐시 (최대 항목 수, 유효 시간(초))
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_TTL = 300
+
+# 장단점 검색 대상 테이블과 색인 재구성 주기(초)
+POINT_SEARCH_SOURCES = ['laptop_pros_cons', 'laptop_analysis']
+POINT_INDEX_MAX_AGE = 600
+
+# 여러 서버 프로세스가 같은 검색을 중복 실행하지 않도록 할 때 잠금 파일 디렉터리 지정
+SINGLE_FLIGHT_LOCK_DIR = os.getenv("SINGLE_FLIGHT_LOCK_DIR", "")
+
 # LangSmith 설정 (선택적)
 LANGSMITH_API_KEY = os.getenv("LANGSMITH_API_KEY") or st.secrets.get("LANGSMITH_API_KEY", "")
 if LANGSMITH_API_KEY:
@@ -360,6 +456,13 @@ with st.sidebar:
     st.markdown("### ⚙️ 설정")
     dark_mode = st.checkbox("🌙 다크모드", value=st.session_state.dark_mode)
     st.session_state.dark_mode = dark_mode
+    # 켜 두면 이 세션의 다음 검색(워크플로우 실행 + 결과 화면)을 프로파일링 - 끄면 비용 없음
+    profiling_enabled = st.toggle(
+        "🔬 프로파일링", value=st.query_params.get("profile") == "1",
+        help="검색 1회를 표본 추출 프로파일러와 tracemalloc 으로 기록해 speedscope 파일로 저장합니다"
+    )
+    # 프로파일링 결과 (검색 결과를 그린 뒤 채움)
+    profile_panel = st.container()
     
     st.markdown("### 📌 북마크")
     if st.session_state.bookmarks:
@@ -372,6 +475,8 @@ with st.sidebar:
     st.markdown("### 📊 사용 통계")
     st.metric("총 검색 수", f"{st.session_state.total_searches}회")
     st.metric("저장된 제품", f"{st.session_state.saved_products}개")
+    # 서버 전체 지표 (아래에서 지표 모음을 만든 뒤 채움)
+    server_stats = st.container()
     
     # 사이드바 하단에 쿠팡 배너 추가
     st.markdown("---")
@@ -422,25 +527,38 @@ class SearchState(TypedDict):
     sources: List[dict]
     messages: Annotated[List[Union[HumanMessage, AIMessage]], operator.add]
     error: str
+    refresh: bool  # True면 저장된 결과를 무시하고 다시 수집 (백그라운드 재수집)
+    analysis: dict  # 요약 행에 미리 계산된 집계 (키워드 빈도, 카테고리별 개수)
+    crawl_plan: dict  # 계획 노드가 나눈 수집 가지와 가지들이 공유하는 예산 (plan_crawl → crawl_branch → merge_branches)
+    branch_results: Annotated[List[dict], operator.add]  # 가지별 수집 결과 (동시에 끝난 가지의 결과도 모두 합쳐짐)
+    deadline: float  # 검색 마감 시각 (time.time() 기준) - 모든 노드와 요청이 남은 시간 안에서만 실행
+    search_id: str  # 크롤링 체크포인트 키 (같은 검색을 다시 하면 중단된 곳부터 이어받음)
 
 # ========================
 # 크롤링 클래스
 # ========================
 
 class ProConsLaptopCrawler:
-    def __init__(self, naver_client_id, naver_client_secret):
+    def __init__(self, naver_client_id, naver_client_secret, metrics=None):
         self.naver_headers = {
             "X-Naver-Client-Id": naver_client_id,
             "X-Naver-Client-Secret": naver_client_secret
         }
-        self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        self.openai_client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
         
-        # 통계
-        self.stats = {
-            'total_crawled': 0,
-            'valid_pros_cons': 0,
-            'api_errors': 0
-        }
+        # 호스트별 서킷 브레이커 (스로틀링/타임아웃 호스트 차단)
+        self.breaker = HostCircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+        self.fetch_timeout = 10
+        self.llm_timeout = 30
+        
+        # 통계 (여러 세션과 수집 가지가 함께 쓰므로 지표 모음의 카운터로 셈)
+        self.metrics = metrics or MetricsRegistry()
+        self.stats = self.metrics.counter("crawler_events_total", "크롤러 이벤트 수 (수집 페이지, 유효 추출, API 오류, 조기 종료 등)", ("event",))
+        self.metrics.callback("breaker_trips_total", "호스트 차단 횟수", self.breaker.total_trips, kind="counter")
+        self.metrics.callback(
+            "breaker_open_hosts", "차단 중인 호스트 수",
+            lambda: sum(entry['state'] != 'closed' for entry in self.breaker.snapshot().values())
+        )
     
     def remove_html_tags(self, text):
         """HTML 태그 제거"""
@@ -448,164 +566,133 @@ class ProConsLaptopCrawler:
         text = re.sub(r'<[^>]+>', '', text)
         return text.strip()
     
-    def search_blog(self, query, display=20):
-        """네이버 블로그 검색"""
-        url = "https://openapi.naver.com/v1/search/blog"
+    def search_blog(self, query, display=20, start=1, timeout=None):
+        """네이버 블로그 검색 (display 최대 100, start 최대 1000, timeout 은 검색 마감에 맞춰 줄인 값)"""
+        url = f"{NAVER_API_BASE}/v1/search/blog"
         params = {
             "query": query,
             "display": display,
+            "start": start,
             "sort": "sim"
         }
         
-        try:
-            response = requests.get(url, headers=self.naver_headers, params=params)
-            if response.status_code == 200:
-                result = response.json()
-                for item in result.get('items', []):
-                    item['title'] = self.remove_html_tags(item['title'])
-                    item['description'] = self.remove_html_tags(item['description'])
-                return result
-        except Exception as e:
-            print(f"검색 오류: {e}")
+        with span("naver.search", source_type="blog", query=query, start=start, display=display) as search_span:
+            try:
+                response = requests.get(url, headers=self.naver_headers, params=params, timeout=timeout or self.fetch_timeout)
+                search_span.set(status=response.status_code, bytes=len(response.content))
+                if response.status_code == 200:
+                    result = response.json()
+                    for item in result.get('items', []):
+                        item['title'] = self.remove_html_tags(item['title'])
+                        item['description'] = self.remove_html_tags(item['description'])
+                    return result
+            except Exception as e:
+                search_span.fail(e)
+                print(f"검색 오류: {e}")
         return None
     
-    def crawl_content(self, url):
-        """블로그 본문 크롤링"""
-        try:
-            if "blog.naver.com" in url:
-                parts = url.split('/')
-                if len(parts) >= 5:
-                    blog_id = parts[3]
-                    post_no = parts[4].split('?')[0]
-                    mobile_url = f"https://m.blog.naver.com/{blog_id}/{post_no}"
-                    
-                    response = requests.get(mobile_url, headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    })
-                    
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        
-                        content = ""
-                        for selector in ['div.se-main-container', 'div#postViewArea', 'div.post_ct']:
-                            elem = soup.select_one(selector)
-                            if elem:
-                                content = elem.get_text(separator='\n', strip=True)
-                                break
-                        
-                        if not content:
-                            content = soup.get_text(separator='\n', strip=True)
-                        
-                        content = re.sub(r'\s+', ' ', content)
-                        content = content.replace('\u200b', '')
-                        
-                        return content if len(content) > 300 else None
-        except Exception as e:
-            print(f"크롤링 오류: {e}")
+    def resolve_fetch_url(self, url):
+        """실제 요청할 URL 반환 (네이버 블로그는 모바일 주소로 변환)"""
+        if "blog.naver.com" in url:
+            parts = url.split('/')
+            if len(parts) >= 5:
+                blog_id = parts[3]
+                post_no = parts[4].split('?')[0]
+                return f"{BLOG_MOBILE_BASE}/{blog_id}/{post_no}"
         return None
     
-    def extract_pros_cons_with_gpt(self, product_name, content):
-        """ChatGPT로 장단점 추출"""
-        if not content or len(content) < 200:
+    def is_host_available(self, url):
+        """포스트의 호스트가 차단되지 않았는지 확인"""
+        fetch_url = self.resolve_fetch_url(url)
+        return not fetch_url or self.breaker.is_available(host_of(fetch_url))
+    
+    def crawl_content(self, url, timeout=None):
+        """블로그 본문 크롤링"""
+        fetch_url = self.resolve_fetch_url(url)
+        if not fetch_url:
             return None
         
-        content_preview = content[:1500]
+        host = host_of(fetch_url)
+        if not self.breaker.allow(host):
+            self.stats.inc(event='breaker_skipped')
+            return None
         
-        prompt = f"""다음은 "{product_name}"에 대한 블로그 리뷰입니다.
-
-[블로그 내용]
-{content_preview}
-
-위 내용에서 {product_name}의 장점과 단점을 추출해주세요.
-실제 사용 경험에 기반한 구체적인 내용만 포함하세요.
-
-다음 형식으로 응답해주세요:
-
-장점:
-- (구체적인 장점 1)
-- (구체적인 장점 2)
-- (구체적인 장점 3)
-
-단점:
-- (구체적인 단점 1)
-- (구체적인 단점 2)
-- (구체적인 단점 3)
-
-만약 장단점 정보가 충분하지 않으면 "정보 부족"이라고 답해주세요."""
+        timeout = timeout or self.fetch_timeout
+        with span("page.fetch", url=fetch_url, host=host, timeout=round(timeout, 2)) as fetch_span:
+            try:
+                response = requests.get(fetch_url, headers={
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                }, timeout=timeout)
+            except requests.Timeout as e:
+                fetch_span.fail(e)
+                # 검색 마감 때문에 줄인 타임아웃으로 끊긴 요청은 호스트 장애로 보지 않음
+                if timeout < self.fetch_timeout:
+                    self.breaker.release(host)
+                else:
+                    self.breaker.record_failure(host)
+                print(f"크롤링 오류: {e}")
+                return None
+            except requests.RequestException as e:
+                fetch_span.fail(e)
+                self.breaker.record_failure(host)
+                print(f"크롤링 오류: {e}")
+                return None
+            fetch_span.set(status=response.status_code, bytes=len(response.content))
         
-        try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "당신은 제품 리뷰 분석 전문가입니다. 실제 사용 경험에 기반한 장단점만 추출합니다."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=500
-            )
-            
-            result = response.choices[0].message.content.strip()
-            
-            if result and "정보 부족" not in result:
-                pros = []
-                cons = []
-                
-                lines = result.split('\n')
-                current_section = None
-                
-                for line in lines:
-                    line = line.strip()
-                    if '장점:' in line or '장점 :' in line:
-                        current_section = 'pros'
-                    elif '단점:' in line or '단점 :' in line:
-                        current_section = 'cons'
-                    elif line.startswith('-') and current_section:
-                        point = line[1:].strip()
-                        if point and len(point) > 5:
-                            if current_section == 'pros':
-                                pros.append(point)
-                            else:
-                                cons.append(point)
-                
-                if pros or cons:
-                    self.stats['valid_pros_cons'] += 1
-                    return {
-                        'pros': pros[:5],
-                        'cons': cons[:5]
-                    }
-            
+        # 스로틀링(429)과 서버 오류(5xx)는 호스트 장애로 간주
+        if response.status_code == 429 or response.status_code >= 500:
+            self.breaker.record_failure(host)
             return None
-                
+        
+        self.breaker.record_success(host)
+        
+        with span("page.parse", url=fetch_url, bytes=len(response.content)):
+            try:
+                if response.status_code == 200:
+                    return self.parse_content(response.content)
+            except Exception as e:
+                print(f"크롤링 오류: {e}")
+        return None
+    
+    def parse_content(self, html):
+        """받은 페이지(또는 저장해 둔 HTML)에서 블로그 본문 추출 (300자 이하면 None)"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        content = ""
+        for selector in ['div.se-main-container', 'div#postViewArea', 'div.post_ct']:
+            elem = soup.select_one(selector)
+            if elem:
+                content = elem.get_text(separator='\n', strip=True)
+                break
+        
+        if not content:
+            content = soup.get_text(separator='\n', strip=True)
+        
+        content = re.sub(r'\s+', ' ', content)
+        content = content.replace('\u200b', '')
+        
+        return content if len(content) > 300 else None
+    
+    def extract_pros_cons_with_gpt(self, product_name, content, timeout=None):
+        """ChatGPT로 장단점 추출 (timeout 을 주면 그 안에 응답이 없을 때 재시도 없이 포기)"""
+        if not content or len(content) < 200:
+            return None
+        
+        client = self.openai_client.with_options(timeout=timeout, max_retries=0) if timeout else self.openai_client
+        try:
+            pros_cons = extract_with_gpt(client, PRODUCT_SYSTEM_PROMPT, product_prompt(product_name, content))
         except Exception as e:
-            self.stats['api_errors'] += 1
+            self.stats.inc(event='api_errors')
             print(f"GPT API 오류: {str(e)[:100]}")
             return None
+        
+        if pros_cons:
+            self.stats.inc(event='valid_pros_cons')
+        return pros_cons
     
     def deduplicate_points(self, points):
         """유사한 장단점 중복 제거"""
-        if not points:
-            return []
-        
-        unique_points = []
-        seen_keywords = set()
-        
-        for point in points:
-            keywords = set(word for word in point.split() if len(word) > 2)
-            
-            if len(keywords & seen_keywords) < len(keywords) * 0.5:
-                unique_points.append(point)
-                seen_keywords.update(keywords)
-            
-            if len(unique_points) >= 10:
-                break
-        
-        return unique_points
+        return deduplicate_points(points)
 
 # ========================
 # 유틸리티 함수들
@@ -627,6 +714,90 @@ def show_loading_animation():
     """, unsafe_allow_html=True)
     return loading_placeholder
 
+def show_server_stats():
+    """사용 통계 - 서버 전체(모든 세션) 크롤링/캐시/토큰 지표와 단계별 지연 시간"""
+    metrics = get_metrics()
+    crawler = get_crawler()
+    st.caption("서버 전체 (모든 세션)")
+    searches = metrics.counter("searches_total", "검색 수 (결과 출처별: cache, database, web)", ("source",))
+    total = searches.value()
+    if total:
+        reused = searches.value(source="cache") + searches.value(source="database")
+        st.metric("저장 결과 재사용", f"{reused / total * 100:.1f}%",
+                  help=f"캐시 {searches.value(source='cache')}회 / DB {searches.value(source='database')}회 / 웹 수집 {searches.value(source='web')}회")
+    if crawler:
+        col1, col2 = st.columns(2)
+        col1.metric("수집 페이지", f"{crawler.stats.value(event='total_crawled')}개")
+        col2.metric("유효 추출", f"{crawler.stats.value(event='valid_pros_cons')}개")
+        st.caption(f"API 오류 {crawler.stats.value(event='api_errors')}회 · 호스트 차단 {crawler.breaker.total_trips()}회 · 조기 종료 {crawler.stats.value(event='early_stops')}회")
+    tokens = metrics.llm_tokens.value()
+    if tokens:
+        st.metric("LLM 토큰", f"{tokens:,}", help=f"입력 {metrics.llm_tokens.value(kind='prompt'):,} / 출력 {metrics.llm_tokens.value(kind='completion'):,}")
+    for stage, entry in metrics.stage_summary().items():
+        errors = f" · 오류 {entry['errors']}회" if entry['errors'] else ""
+        st.caption(f"{STAGE_LABELS[stage]} {entry['count']}회 · p50 {entry['p50_ms']:.0f}ms · p99 {entry['p99_ms']:.0f}ms{errors}")
+
+def show_profile_result(summary):
+    """프로파일링 결과 - 자기 시간 상위 함수, 메모리 할당 상위 항목, speedscope 파일"""
+    st.caption(f"🔬 '{summary['name']}' {summary['duration']:.1f}초 · 표본 {summary['samples']}개 · 스레드 {len(summary['threads'])}개")
+    for label, seconds, ratio in summary['top_functions'][:5]:
+        st.caption(f"{ratio * 100:.0f}% · {seconds:.2f}초 · {label}")
+    if summary['top_allocations']:
+        with st.expander("메모리 할당 상위", expanded=False):
+            for row in summary['top_allocations'][:5]:
+                st.caption(f"{row['size_kb']:,.0f}KB · {row['location']}")
+    if os.path.exists(summary['speedscope']):
+        with open(summary['speedscope'], 'rb') as f:
+            st.download_button(
+                "📥 speedscope 파일", f.read(), file_name=os.path.basename(summary['speedscope']),
+                mime="application/json", key=f"profile_{summary['id']}"
+            )
+        st.link_button("🔥 speedscope 에서 열기", "https://www.speedscope.app/", help="받은 파일을 끌어다 놓으면 플레임그래프로 볼 수 있습니다")
+        st.caption(f"저장 위치: {os.path.dirname(summary['speedscope'])}")
+
+def show_trace_waterfall(spans):
+    """검색 1회의 구간별 소요 시간 표시 (폭포 차트 + 구간 이름별 합계 + Chrome 추적 파일)"""
+    rows = waterfall_rows(spans)
+    if not rows:
+        st.write("기록된 구간이 없습니다.")
+        return
+    
+    colors = {'search': '#667eea', 'node': '#764ba2', 'naver': '#03c75a', 'page': '#17a2b8', 'llm': '#fd7e14'}
+    labels = [f"{'  ' * row['depth']}{row['label']}" for row in rows]
+    fig = go.Figure(go.Bar(
+        y=list(range(len(rows))),
+        x=[row['duration_ms'] for row in rows],
+        base=[row['start_ms'] for row in rows],
+        orientation='h',
+        marker_color=['#dc3545' if row['error'] else colors.get(row['name'].split('.')[0], '#999999') for row in rows],
+        hovertext=[
+            f"{row['name']} {row['duration_ms']:.0f}ms ({row['thread']})<br>" + ', '.join(f"{k}={v}" for k, v in row['attrs'].items())
+            + (f"<br>오류: {row['error']}" if row['error'] else '')
+            for row in rows
+        ],
+        hoverinfo='text'
+    ))
+    fig.update_layout(
+        height=max(300, 20 * len(rows)),
+        margin=dict(l=0, r=0, t=10, b=0),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(title='ms', showgrid=True),
+        yaxis=dict(autorange='reversed', tickmode='array', tickvals=list(range(len(rows))), ticktext=labels)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    summary = pd.DataFrame(summarize(spans)).rename(columns={
+        'name': '구간', 'count': '횟수', 'total_ms': '합계(ms)', 'max_ms': '최대(ms)', 'errors': '오류'
+    })
+    st.dataframe(summary.round(1), hide_index=True, use_container_width=True)
+    st.download_button(
+        "📥 Chrome 추적 파일 (chrome://tracing, ui.perfetto.dev)",
+        json.dumps(to_chrome_trace(spans), ensure_ascii=False),
+        file_name="search-trace.json",
+        mime="application/json"
+    )
+
 def create_pros_cons_chart(pros_count, cons_count):
     """장단점 차트 생성"""
     fig = go.Figure(data=[
@@ -668,79 +839,16 @@ def create_pros_cons_chart(pros_count, cons_count):
 
 def extract_keywords(texts):
     """텍스트에서 핵심 키워드 추출"""
-    # 확장된 불용어 정의
-    stopwords = {
-        # 일반 불용어
-        '수', '있습니다', '있어요', '있음', '좋습니다', '좋아요', '좋음', 
-        '나쁩니다', '나빠요', '나쁨', '않습니다', '않아요', '않음',
-        '입니다', '이다', '되다', '하다', '있다', '없다', '같다',
-        '위해', '통해', '대해', '매우', '정말', '너무', '조금',
-        '그리고', '하지만', '그러나', '또한', '때문', '경우',
-        '제공합니다', '제공', '합니다', '해요', '드립니다', '드려요',
-        '위한', '위하여', '따라', '따른', '통한', '대한', '관한',
-        '됩니다', '됨', '되어', '되었습니다', '했습니다', '하는',
-        '이', '그', '저', '것', '것이', '것을', '것은', '것도',
-        '더', '덜', '꽤', '약간', '살짝', '많이', '적게', '조금',
-        '모든', '각', '각각', '여러', '몇', '몇몇', '전체', '일부',
-        '항상', '가끔', '종종', '자주', '언제나', '절대', '전혀',
-        '만', '도', '까지', '부터', '에서', '에게', '으로', '로',
-        '와', '과', '하고', '이고', '이며', '거나', '든지', '라고',
-        '들', '등', '등등', '따위', '및', '또는', '혹은', '즉',
-        '의', '를', '을', '에', '가', '이', '은', '는', '와', '과',
-        '했다', '한다', '하며', '하여', '해서', '하고', '하니', '하면',
-        '그래서', '그러니', '그러므로', '따라서', '때문에', '왜냐하면',
-        '비해', '보다', '처럼', '같이', '만큼', '대로', '듯이',
-        '점', '면', '측면', '부분', '경우', '상황', '상태', '정도',
-        '이런', '저런', '그런', '어떤', '무슨', '어느', '어떻게',
-        '가능', '불가능', '필요', '불필요', '중요', '사용', '이용',
-        '느낌', '기분', '마음', '생각', '의견', '감정', '인상',
-        '한', '두', '세', '네', '몇', '여러', '많은', '적은',
-        '첫', '둘', '셋', '넷', '첫째', '둘째', '셋째', '마지막',
-        '좀', '꼭', '딱', '막', '참', '진짜', '정말로', '확실히',
-        '거의', '대부분', '대체로', '보통', '일반적', '평균적',
-        '특히', '특별히', '주로', '대개', '대체로', '전반적'
-    }
-    
-    # 모든 텍스트를 결합하고 키워드 추출
-    all_text = ' '.join(texts)
-    
-    # 한글만 추출 (영어, 숫자 제외)
-    words = re.findall(r'[가-힣]+', all_text)
-    
-    # 필터링 조건 강화
-    # 1. 2글자 이상
-    # 2. 불용어가 아님
-    # 3. 너무 일반적인 단어 제외
-    filtered_words = []
-    for word in words:
-        if (len(word) >= 2 and 
-            word not in stopwords and
-            not word.endswith('습니다') and
-            not word.endswith('합니다') and
-            not word.endswith('입니다') and
-            not word.endswith('됩니다') and
-            not word.startswith('있') and
-            not word.startswith('없') and
-            not word.startswith('하') and
-            not word.startswith('되') and
-            not word.startswith('않')):
-            filtered_words.append(word)
-    
-    # 단어 빈도 계산
-    word_freq = Counter(filtered_words)
-    
-    # 빈도수가 1인 단어는 제외 (더 중요한 키워드만 남김)
-    word_freq = {word: freq for word, freq in word_freq.items() if freq > 1}
-    
-    return word_freq
-
-def create_wordcloud(texts, title, color_scheme):
-    """워드클라우드 생성"""
+    # 불용어와 필터링 기준은 요약 저장소와 공유 (요약 행에 미리 계산한 빈도와 같은 결과)
+    return extract_point_keywords(texts, PRODUCT_STOPWORDS, strict=True)
+
+def create_wordcloud(texts, title, color_scheme, word_freq=None):
+    """워드클라우드 생성 (word_freq: 미리 계산된 키워드 빈도)"""
     if not texts:
         return None
     
     # 키워드 추출
-    word_freq = extract_keywords(texts)
+    word_freq = word_freq or extract_keywords(texts)
     
     if not word_freq:
         return None
@@ -808,13 +916,13 @@ def create_wordcloud(texts, title, color_scheme):
         st.warning(f"한글 폰트를 찾을 수 없습니다. NanumGothic.ttf 파일을 프로젝트 루트에 추가해주세요.")
         return None
 
-def create_text_cloud(texts, title, color):
+def create_text_cloud(texts, title, color, word_freq=None):
     """워드클라우드 대신 텍스트 기반 시각화"""
     if not texts:
         return
     
     # 키워드 추출
-    word_freq = extract_keywords(texts)
+    word_freq = word_freq or extract_keywords(texts)
     
     if not word_freq:
         return
@@ -853,8 +961,11 @@ def create_text_cloud(texts, title, color):
     </div>
     """, unsafe_allow_html=True)
 
-def display_wordclouds(pros, cons):
-    """장단점 워드클라우드 표시"""
+def display_wordclouds(pros, cons, keywords=None):
+    """장단점 워드클라우드 표시 (keywords: 요약 행에 미리 계산된 {'pros': 빈도, 'cons': 빈도})"""
+    keywords = keywords or {}
+    pros_freq = keywords.get('pros') or extract_keywords(pros)
+    cons_freq = keywords.get('cons') or extract_keywords(cons)
     col1, col2 = st.columns(2)
     
     with col1:
@@ -868,15 +979,15 @@ def display_wordclouds(pros, cons):
             """, unsafe_allow_html=True)
             
             # 장점 워드클라우드 생성 시도
-            pros_wordcloud = create_wordcloud(pros, "", "Greens")
+            pros_wordcloud = create_wordcloud(pros, "", "Greens", word_freq=pros_freq)
             if pros_wordcloud:
                 st.image(pros_wordcloud, use_container_width=True)
             else:
                 # 워드클라우드 실패 시 텍스트 기반 시각화
-                create_text_cloud(pros, "장점 키워드 분석", "#28a745")
+                create_text_cloud(pros, "장점 키워드 분석", "#28a745", word_freq=pros_freq)
             
             # 주요 키워드 표시
-            keywords = extract_keywords(pros)
+            keywords = pros_freq
             if keywords and isinstance(keywords, dict):
                 # Counter가 아닌 dict인 경우 처리
                 sorted_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)[:5]
@@ -897,15 +1008,15 @@ def display_wordclouds(pros, cons):
             """, unsafe_allow_html=True)
             
             # 단점 워드클라우드 생성 시도
-            cons_wordcloud = create_wordcloud(cons, "", "Reds")
+            cons_wordcloud = create_wordcloud(cons, "", "Reds", word_freq=cons_freq)
             if cons_wordcloud:
                 st.image(cons_wordcloud, use_container_width=True)
             else:
                 # 워드클라우드 실패 시 텍스트 기반 시각화
-                create_text_cloud(cons, "단점 키워드 분석", "#dc3545")
+                create_text_cloud(cons, "단점 키워드 분석", "#dc3545", word_freq=cons_freq)
             
             # 주요 키워드 표시
-            keywords = extract_keywords(cons)
+            keywords = cons_freq
             if keywords and isinstance(keywords, dict):
                 # Counter가 아닌 dict인 경우 처리
                 sorted_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)[:5]
@@ -915,48 +1026,18 @@ def display_wordclouds(pros, cons):
                                             for word, count in sorted_keywords])
                     st.markdown(keyword_html, unsafe_allow_html=True)
 
-def create_comparison_chart(pros, cons):
-    """장단점 비교 시각화"""
-    # 카테고리별 분류
-    categories = {
-        '성능': ['성능', '속도', '빠르', '느리', '렉', '버벅', '프로세서', 'CPU', 'GPU', '메모리'],
-        '디자인': ['디자인', '외관', '예쁘', '이쁘', '못생', '색상', '모양', '두께', '얇'],
-        '가격': ['가격', '비싸', '저렴', '가성비', '비용', '돈', '할인', '세일'],
-        '품질': ['품질', '마감', '재질', '튼튼', '약하', '고장', '내구성', '견고'],
-        '기능': ['기능', '편의', '편리', '불편', '사용', '조작', '인터페이스'],
-        '배터리': ['배터리', '충전', '전원', '지속', '방전'],
-        '화면': ['화면', '디스플레이', '선명', '밝기', '해상도'],
-        '기타': []
-    }
-    
-    # 각 카테고리별 장단점 수 계산
-    category_pros = {cat: 0 for cat in categories}
-    category_cons = {cat: 0 for cat in categories}
-    
-    # 장점 분류
-    for pro in pros:
-        categorized = False
-        for cat, keywords in categories.items():
-            if cat != '기타' and any(keyword in pro for keyword in keywords):
-                category_pros[cat] += 1
-                categorized = True
-                break
-        if not categorized:
-            category_pros['기타'] += 1
-    
-    # 단점 분류
-    for con in cons:
-        categorized = False
-        for cat, keywords in categories.items():
-            if cat != '기타' and any(keyword in con for keyword in keywords):
-                category_cons[cat] += 1
-                categorized = True
-                break
-        if not categorized:
-            category_cons['기타'] += 1
+def create_comparison_chart(pros, cons, category_counts=None):
+    """장단점 비교 시각화 (category_counts: 요약 행에 미리 계산된 카테고리별 개수)"""
+    # 카테고리별 장단점 수 계산
+    if category_counts:
+        category_pros = category_counts.get('pros', {})
+        category_cons = category_counts.get('cons', {})
+    else:
+        category_pros = categorize_points(pros, PRODUCT_CATEGORIES)
+        category_cons = categorize_points(cons, PRODUCT_CATEGORIES)
     
     # 데이터가 있는 카테고리만 필터링
-    active_categories = [cat for cat in categories if category_pros[cat] > 0 or category_cons[cat] > 0]
+    active_categories = [cat for cat in PRODUCT_CATEGORIES if category_pros.get(cat, 0) > 0 or category_cons.get(cat, 0) > 0]
     
     if not active_categories:
         return None
@@ -966,7 +1047,7 @@ def create_comparison_chart(pros, cons):
     
     # 장점 데이터
     fig.add_trace(go.Scatterpolar(
-        r=[category_pros[cat] for cat in active_categories],
+        r=[category_pros.get(cat, 0) for cat in active_categories],
         theta=active_categories,
         fill='toself',
         fillcolor='rgba(40, 167, 69, 0.3)',
@@ -977,7 +1058,7 @@ def create_comparison_chart(pros, cons):
     
     # 단점 데이터
     fig.add_trace(go.Scatterpolar(
-        r=[category_cons[cat] for cat in active_categories],
+        r=[category_cons.get(cat, 0) for cat in active_categories],
         theta=active_categories,
         fill='toself',
         fillcolor='rgba(220, 53, 69, 0.3)',
@@ -1078,11 +1159,113 @@ def get_sample_coupang_product(product_name):
 # 클라이언트 초기화
 @st.cache_resource
 def get_supabase_client():
-    return create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+    # Supabase 클라이언트 또는 같은 방식으로 쓰는 로컬 SQLite 저장소
+    return create_storage(STORAGE_BACKEND, SUPABASE_URL, SUPABASE_KEY, LOCAL_DB_PATH)
 
 @st.cache_resource
 def get_crawler():
-    return ProConsLaptopCrawler(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET) if NAVER_CLIENT_ID and NAVER_CLIENT_SECRET else None
+    return ProConsLaptopCrawler(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, metrics=get_metrics()) if NAVER_CLIENT_ID and NAVER_CLIENT_SECRET else None
+
+@st.cache_resource
+def get_freshness_policy():
+    return FreshnessPolicy(ttl_seconds=ANALYSIS_TTL_DAYS * 86400)
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(max_entries=RESULT_CACHE_SIZE, ttl_seconds=RESULT_CACHE_TTL)
+
+@st.cache_resource
+def get_write_behind():
+    supabase = get_supabase_client()
+    cache = get_result_cache()
+    checkpoint = get_crawl_checkpoint()
+    return WriteBehindQueue(
+        lambda batch: persist_batch(supabase, batch),
+        # 저장이 끝나야 캐시와 체크포인트를 정리 (저장에 실패하면 체크포인트가 남아 다음 검색이 이어받음)
+        on_written=lambda item: analysis_written(item, cache, checkpoint),
+        on_failed=lambda item: print(f"'{item['name']}' 분석 저장 실패 - 체크포인트를 남겨 다음 검색에서 다시 저장")
+    )
+
+@st.cache_resource
+def get_crawl_archive():
+    return CrawlArchive(CRAWL_ARCHIVE_DIR) if CRAWL_ARCHIVE_ENABLED else None
+
+@st.cache_resource
+def get_crawl_checkpoint():
+    return CrawlCheckpoint(CRAWL_CHECKPOINT_PATH) if CRAWL_CHECKPOINT_ENABLED else None
+
+@st.cache_resource
+def get_trace_exporter():
+    return JsonlExporter(TRACE_PATH) if TRACE_EXPORT_ENABLED else None
+
+@st.cache_resource
+def get_profile_store():
+    return ProfileStore(PROFILE_DIR)
+
+@st.cache_resource
+def get_metrics():
+    metrics = MetricsRegistry()
+    # 단계별 소요 시간과 LLM 토큰 수는 끝난 구간에서 받음 (검색 API, 페이지 요청, 본문 해석, LLM, DB 읽기/쓰기)
+    add_listener(metrics.observe_span)
+    metrics.counter("searches_total", "검색 수 (결과 출처별: cache, database, web)", ("source",))
+    cache = get_result_cache()
+    metrics.callback(
+        "result_cache_requests_total", "조회 캐시 요청 수",
+        lambda: {('hit',): cache.hits, ('miss',): cache.misses}, kind="counter", labelnames=("result",)
+    )
+    metrics.callback("result_cache_hit_ratio", "조회 캐시 적중률", cache.hit_ratio)
+    if WRITE_BEHIND_ENABLED:
+        queue = get_write_behind()
+        metrics.callback("write_behind_depth", "저장 대기열 길이", lambda: queue.snapshot()['depth'])
+    if METRICS_PORT:
+        try:
+            metrics.serve(METRICS_PORT)
+        except OSError as e:
+            print(f"지표 서버 시작 실패 (포트 {METRICS_PORT}): {e}")
+    return metrics
+
+def count_search(source):
+    """검색 결과 출처별 횟수 (cache / database / web)"""
+    get_metrics().counter("searches_total", "검색 수 (결과 출처별: cache, database, web)", ("source",)).inc(source=source)
+
+@st.cache_resource
+def get_point_index():
+    return PointIndex()
+
+def analysis_table():
+    """현재 저장 방식의 제품 분석 테이블"""
+    return 'laptop_analysis' if ANALYSIS_STORAGE == STORAGE_SUMMARY else 'laptop_pros_cons'
+
+def analysis_written(item, cache, checkpoint):
+    """저장이 끝난 분석 결과 후처리 - 다음 조회가 저장된 결과를 읽도록 캐시를 비우고 더 이어받을 필요 없는 체크포인트 삭제"""
+    cache.invalidate(normalize_key(item['name']))
+    if checkpoint and item.get('search_id'):
+        checkpoint.clear(item['search_id'])
+
+def persist_analysis(supabase, item):
+    """분석 결과 저장 - 지연 저장이 켜져 있으면 대기열에 넘기고 바로 반환 (여러 프로세스 잠금을 쓰면 바로 저장, 저장 완료 여부 반환)"""
+    key = normalize_key(item['name'])
+    # 장단점 검색 색인에는 저장을 기다리지 않고 바로 반영
+    index_item(get_point_index(), item)
+    # 여러 프로세스가 잠금 파일을 나눠 쓰면 잠금이 풀리기 전에 DB에 있어야 다음 프로세스가 다시 수집하지 않음 - 바로 저장
+    if WRITE_BEHIND_ENABLED and not SINGLE_FLIGHT_LOCK_DIR:
+        get_write_behind().enqueue((item['table'], key), item)
+        # 대기 중인 결과가 다음 조회에 보이도록 캐시 비움
+        get_result_cache().invalidate(key)
+        return False
+    failed = persist_batch(supabase, [item])
+    if failed:
+        raise failed[0][1]
+    analysis_written(item, get_result_cache(), get_crawl_checkpoint())
+    return True
+
+@st.cache_resource
+def get_query_planner():
+    return QueryPlanner(
+        SEARCH_TEMPLATES,
+        history_path=os.path.join(CACHE_DIR, "query_yield_product.json"),
+        page_size=SEARCH_PAGE_SIZE
+    )
 
 def search_database(state: SearchState) -> SearchState:
     """데이터베이스에서 제품 검색"""
@@ -1096,24 +1279,73 @@ def search_database(state: SearchState) -> SearchState:
         state["results"] = {"data": None}
         return state
     
+    if state.get("refresh"):
+        state["messages"].append(
+            HumanMessage(content=f"♻️ 저장된 '{product_name}' 분석이 오래되어 다시 수집합니다...")
+        )
+        state["results"] = {"data": None}
+        return state
+    
     state["messages"].append(
         HumanMessage(content=f"📊 데이터베이스에서 '{product_name}' 검색 중...")
     )
     
     try:
-        # 정확한 매칭만 시도
-        exact_match = supabase.table('laptop_pros_cons').select("*").eq('product_name', product_name).execute()
-        if exact_match.data:
+        def load_rows(name):
+            # 아직 저장 대기 중인 결과가 있으면 그 결과 사용 (방금 수집한 결과가 DB보다 최신)
+            pending = get_write_behind().pending((analysis_table(), normalize_key(name))) if WRITE_BEHIND_ENABLED else None
+            if pending:
+                return pending['rows']
+            with span("db.read", table=analysis_table(), key=name):
+                if ANALYSIS_STORAGE == STORAGE_SUMMARY:
+                    # 제품 1개당 1행 - 한 행만 읽으면 바로 표시 가능
+                    return fetch_summary(supabase, 'laptop_analysis', 'product_name', name)
+                # 정확한 매칭만 시도
+                exact_match = supabase.table('laptop_pros_cons').select("*").eq('product_name', name).execute()
+                # 가장 최신 버전의 행만 사용 (재수집 결과로 교체되는 중에도 온전한 결과만 보임)
+                return latest_version(exact_match.data) if exact_match.data else []
+        
+        # 같은 검색어는 메모리 캐시에서 바로 반환 (새 결과가 저장되면 merge_branches에서 무효화)
+        rows, cache_hit = get_result_cache().get_or_load(normalize_key(product_name), lambda: load_rows(product_name))
+        if not rows:
+            # 띄어쓰기/대소문자만 다른 이름으로 저장된 분석이 있으면 사용 (로컬 저장소의 이름 전문 검색)
+            stored_name = find_stored_name(supabase, analysis_table(), product_name)
+            if stored_name and stored_name != product_name:
+                rows, cache_hit = get_result_cache().get_or_load(normalize_key(stored_name), lambda: load_rows(stored_name))
+                if rows:
+                    state["messages"].append(
+                        AIMessage(content=f"🔎 '{product_name}'와(과) 같은 항목으로 저장된 '{stored_name}' 분석을 사용합니다")
+                    )
+                    product_name = state["product_name"] = stored_name
+        if rows:
             state["search_method"] = "database"
-            state["results"] = {"data": exact_match.data}
+            state["results"] = {"data": rows}
+            source = "캐시" if cache_hit else "데이터베이스"
+            count_search("cache" if cache_hit else "database")
             state["messages"].append(
-                AIMessage(content=f"✅ 데이터베이스에서 '{product_name}' 정보를 찾았습니다! ({len(exact_match.data)}개 항목)")
+                AIMessage(content=f"✅ {source}에서 '{product_name}' 정보를 찾았습니다! ({len(rows)}개 항목)")
             )
+            emit(EVENT_CACHE_HIT, f"✅ {source}에서 '{product_name}' 정보를 찾았습니다!", source=source, name=product_name, rows=len(rows))
+            
+            # 유효 기간이 지났으면 저장된 결과는 그대로 보여주고 백그라운드에서 다시 수집
+            policy = get_freshness_policy()
+            refresh_key = f"refresh:{normalize_key(product_name)}"
+            if policy.is_stale(rows) and policy.should_revalidate(refresh_key):
+                get_single_flight().submit(refresh_key, run_search, product_name, refresh=True, name=f"{product_name} 재수집")
+                age_days = policy.age_seconds(rows) / 86400
+                state["messages"].append(
+                    AIMessage(content=f"♻️ 저장된 분석이 {age_days:.0f}일 지나 백그라운드에서 최신 리뷰를 다시 수집합니다")
+                )
             return state
         
         state["messages"].append(
             AIMessage(content=f"❌ 데이터베이스에서 '{product_name}'을(를) 찾을 수 없습니다. 웹에서 검색합니다...")
         )
+        suggestions = similar_names(supabase, analysis_table(), product_name)
+        if suggestions:
+            state["messages"].append(
+                AIMessage(content=f"💡 비슷한 저장 항목: {', '.join(suggestions)}")
+            )
         state["results"] = {"data": None}
         return state
         
@@ -1125,13 +1357,15 @@ def search_database(state: SearchState) -> SearchState:
         state["results"] = {"data": None}
         return state
 
-def crawl_web(state: SearchState) -> SearchState:
-    """웹에서 제품 정보 크롤링"""
+def plan_crawl(state: SearchState) -> SearchState:
+    """웹 수집 계획 - 검색 API 결과를 가치 순으로 골라 출처별 수집 가지로 나눔"""
+    state["crawl_plan"] = {}
     if state["results"].get("data"):  # 이미 DB에서 찾은 경우
         return state
     
     product_name = state["product_name"]
     state["search_method"] = "web_crawling"
+    count_search("web")
     crawler = get_crawler()
     
     if not crawler:
@@ -1163,104 +1397,303 @@ def crawl_web(state: SearchState) -> SearchState:
         )
         return state
     
-    all_pros = []
-    all_cons = []
-    sources = []
-    
-    # 검색 쿼리
-    search_queries = [
-        f"{product_name} 장단점 실사용",
-        f"{product_name} 단점 후기",
-        f"{product_name} 장점 리뷰"
-    ]
-    
-    for query in search_queries:
+    # 모든 검색어의 결과를 하나의 우선순위 큐로 병합
+    frontier = CrawlFrontier()
+    planner = get_query_planner()
+    plan = planner.plan(product_name)
+    # 수집은 합치기/저장에 쓸 시간을 남겨 두고 끝냄
+    crawl_deadline = state["deadline"] - DEADLINE_RESERVE
+    cut_short = False
+    
+    # 중단된 같은 검색의 체크포인트가 있으면 처리를 마친 포스트는 다시 요청/추출하지 않고 결과를 이어받음
+    checkpoint = get_crawl_checkpoint()
+    resumed = checkpoint.load(state["search_id"]) if checkpoint else []
+    done_links = {record['link'] for record in resumed}
+    if resumed:
+        resumed_pros = [point for record in resumed for point in record['pros']]
+        resumed_cons = [point for record in resumed for point in record['cons']]
+        message = f"♻️ 중단된 검색에서 처리를 마친 포스트 {len(resumed)}개를 이어받습니다 (장점 {len(resumed_pros)}개, 단점 {len(resumed_cons)}개)"
+        state["messages"].append(AIMessage(content=message))
+        emit(EVENT_POINTS, message, pros=resumed_pros, cons=resumed_cons)
+    
+    def fetch_next_page():
+        """다음 검색 페이지를 조회해 프런티어에 추가 (더 조회할 페이지가 없거나 시간이 다 됐으면 False)"""
+        nonlocal cut_short
+        if not time_left(crawl_deadline):
+            cut_short = True
+            return False
+        request = plan.next_request()
+        if not request:
+            return False
+        
         state["messages"].append(
-            AIMessage(content=f"🔍 검색어: '{query}'")
+            AIMessage(content=f"🔍 검색어: '{request['query']}' ({request['start']}위부터 {request['display']}개)")
         )
         
         # 네이버 검색
-        result = crawler.search_blog(query, display=10)
-        if not result or 'items' not in result:
-            continue
+        result = crawler.search_blog(request['query'], display=request['display'], start=request['start'],
+                                     timeout=request_timeout(crawl_deadline, crawler.fetch_timeout))
+        posts = result.get('items', []) if result else []
+        plan.record_page(request, posts)
         
-        posts = result['items']
         state["messages"].append(
             AIMessage(content=f"→ {len(posts)}개 포스트 발견")
         )
+        emit(EVENT_QUERY, f"🔍 '{request['query']}' → {len(posts)}개 포스트 발견",
+             query=request['query'], source_type=request['source_type'], start=request['start'], found=len(posts))
+        frontier.add_results(posts, query=request['query'], source_type=request['source_type'], start_rank=request['start'] - 1)
+        return True
+    
+    for _ in range(SEARCH_INITIAL_PAGES):
+        if not fetch_next_page():
+            break
+    
+    # 가지에 나눠 줄 후보를 가치 순으로 선택 (본문이 없는 포스트가 있어 페이지 요청 예산의 두 배까지)
+    candidates = []
+    while len(candidates) < CRAWL_FETCH_BUDGET * 2 and not is_cancelled():
+        # 후보가 떨어졌을 때만 다음 페이지 조회
+        if not len(frontier):
+            if not fetch_next_page():
+                break
+            continue
         
-        # 각 포스트 처리
-        for idx, post in enumerate(posts[:5]):
-            state["messages"].append(
+        post = frontier.pop()
+        
+        # 이전 시도에서 처리를 마친 포스트
+        if canonical_link(post['link']) in done_links:
+            continue
+        
+        # 차단된 호스트의 포스트는 뒤로 미룸 (한 번만)
+        if not crawler.is_host_available(post['link']):
+            if not frontier.defer(post):
+                crawler.stats.inc(event='breaker_skipped')
+            continue
+        candidates.append(post)
+    
+    # 가치 높은 포스트부터 예산 안에서 처리 (모든 가지가 예산과 조기 종료 기준을 공유)
+    budget = CrawlBudget(
+        max_seconds=min(CRAWL_TIME_BUDGET, time_left(crawl_deadline)),
+        max_llm_calls=CRAWL_LLM_BUDGET,
+        max_fetches=CRAWL_FETCH_BUDGET
+    )
+    session = CrawlSession(budget, NoveltyTracker(window=3, min_novelty=1.0, min_posts=4))
+    for record in resumed:
+        session.observe(record['pros'], record['cons'])
+    branches = partition(candidates, CRAWL_BRANCHES)
+    state["crawl_plan"] = {
+        'branches': branches,
+        'session': session,
+        'plan': plan,
+        'candidates': len(candidates),
+        'frontier_left': len(frontier),
+        'deadline': crawl_deadline,
+        'cut_short': cut_short,
+        'search_id': state["search_id"],
+        # 이어받은 포스트의 결과 (합치기 노드에서 새로 수집한 결과와 후보 순위 순으로 합침)
+        'resumed': [
+            {'rank': record['rank'], 'pros': record['pros'], 'cons': record['cons'], 'source': record['source']}
+            for record in resumed if record['pros'] or record['cons']
+        ]
+    }
+    
+    state["messages"].append(
+        AIMessage(content=f"🧭 중복을 제외한 후보 {len(candidates)}개를 가지 {len(branches)}개로 나눠 동시에 분석합니다")
+    )
+    return state
+
+def dispatch_branches(state: SearchState):
+    """수집 가지 띄우기 (가지마다 Send 하나, 가지가 없으면 바로 합치기)"""
+    branches = (state.get("crawl_plan") or {}).get("branches")
+    if not branches:
+        return "merge_branches"
+    return [
+        Send("crawl_branch", {"product_name": state["product_name"], "crawl_plan": state["crawl_plan"], "branch": branch})
+        for branch in branches
+    ]
+
+def crawl_branch(branch_state):
+    """수집 가지 - 배정된 후보를 순서대로 페이지 요청 → 장단점 추출 (오류가 나도 다른 가지는 계속)"""
+    product_name = branch_state["product_name"]
+    branch = branch_state["branch"]
+    session = branch_state["crawl_plan"]["session"]
+    deadline = branch_state["crawl_plan"]["deadline"]
+    search_id = branch_state["crawl_plan"]["search_id"]
+    crawler = get_crawler()
+    archive = get_crawl_archive()
+    checkpoint = get_crawl_checkpoint()
+    planner = get_query_planner()
+    
+    result = {'id': branch['id'], 'source_type': branch['source_type'], 'posts': [], 'error': ''}
+    messages = []
+    try:
+        for post in branch['posts']:
+            # 취소, 예산 소진, 조기 종료면 중단
+            if is_cancelled() or not session.take_fetch():
+                break
+            
+            messages.append(
                 AIMessage(content=f"📖 분석 중: {post['title'][:40]}...")
             )
             
             # 크롤링
-            content = crawler.crawl_content(post['link'])
+            content = crawler.crawl_content(post['link'], timeout=request_timeout(deadline, crawler.fetch_timeout))
             if not content:
                 continue
+            emit(EVENT_FETCH, f"📖 분석 중: {post['title'][:40]}...",
+                 title=post['title'], link=post['link'], source_type=post.get('search_type', 'blog'))
+            
+            crawler.stats.inc(event='total_crawled')
             
-            crawler.stats['total_crawled'] += 1
+            # 원문 보관 (다시 분석할 때 재크롤링하지 않도록)
+            if archive:
+                archive.append(canonical_link(post['link']), content, 'product', product_name,
+                               query=post.get('query', ''), source_type=post.get('search_type', 'blog'), title=post['title'])
             
             # 장단점 추출
-            pros_cons = crawler.extract_pros_cons_with_gpt(product_name, content)
+            if not session.take_llm():
+                break
+            pros_cons = crawler.extract_pros_cons_with_gpt(product_name, content, timeout=request_timeout(deadline, crawler.llm_timeout))
+            planner.record_result(post.get('template'), useful=bool(pros_cons))
+            source = {
+                'title': post['title'],
+                'link': post['link'],
+                'date': post.get('postdate', '')
+            }
+            
+            # 처리를 마친 포스트 기록 (검색이 중단돼도 다시 검색하면 이어받음)
+            if checkpoint:
+                checkpoint.record(search_id, post, pros_cons, source=source)
             
             if pros_cons:
-                all_pros.extend(pros_cons['pros'])
-                all_cons.extend(pros_cons['cons'])
-                sources.append({
-                    'title': post['title'],
-                    'link': post['link'],
-                    'date': post.get('postdate', '')
+                result['posts'].append({
+                    'rank': post['rank'],
+                    'pros': pros_cons['pros'],
+                    'cons': pros_cons['cons'],
+                    'source': source
                 })
                 
-                state["messages"].append(
+                messages.append(
                     AIMessage(content=f"✓ 장점 {len(pros_cons['pros'])}개, 단점 {len(pros_cons['cons'])}개 추출")
                 )
+                emit(EVENT_POINTS, f"✓ 장점 {len(pros_cons['pros'])}개, 단점 {len(pros_cons['cons'])}개 추출",
+                     pros=pros_cons['pros'], cons=pros_cons['cons'], title=post['title'])
             
-            time.sleep(1)
-        
-        time.sleep(2)
+            # 최근 포스트들이 새로운 장단점을 거의 더하지 못하면 모든 가지 조기 종료
+            session.observe(pros_cons['pros'] if pros_cons else [], pros_cons['cons'] if pros_cons else [])
+            
+            # 마감을 넘기지 않도록 대기
+            time.sleep(min(1, time_left(deadline)))
+    except Exception as e:
+        result['error'] = str(e)
+        messages.append(
+            AIMessage(content=f"⚠️ 수집 가지 {branch['id'] + 1} 오류: {str(e)[:100]}")
+        )
+    
+    return {"branch_results": [result], "messages": messages}
+
+def merge_branches(state: SearchState) -> SearchState:
+    """가지 결과 합치기 - 후보 순위대로 모아 중복 제거 후 저장"""
+    crawl_plan = state.get("crawl_plan") or {}
+    if not crawl_plan.get("session"):  # DB에서 찾았거나 샘플 데이터
+        return state
+    
+    product_name = state["product_name"]
+    crawler = get_crawler()
+    archive = get_crawl_archive()
+    planner = get_query_planner()
+    session = crawl_plan['session']
+    budget = session.budget
+    plan = crawl_plan['plan']
+    
+    # 이어받은 포스트도 한 가지의 결과처럼 함께 합쳐 후보 순위 순서를 유지
+    posts, failed = merge_branch_results([{'posts': crawl_plan['resumed']}] + state["branch_results"])
+    if is_cancelled():
+        state["messages"].append(
+            AIMessage(content="⏹️ 사용자가 검색을 취소했습니다")
+        )
+    if failed:
+        state["messages"].append(
+            AIMessage(content=f"⚠️ 수집 가지 {len(failed)}개가 중간에 실패해 오류 전까지 수집한 결과만 합칩니다")
+        )
+    
+    remaining = crawl_plan['candidates'] - session.attempted + crawl_plan['frontier_left']
+    if session.converged:
+        posts_saved, llm_calls_saved = estimate_savings(remaining, budget)
+        convergence = session.novelty.summary(posts_saved=posts_saved, llm_calls_saved=llm_calls_saved)
+        crawler.stats.inc(event='early_stops')
+        crawler.stats.inc(posts_saved, event='posts_saved')
+        crawler.stats.inc(llm_calls_saved, event='llm_calls_saved')
+        state["messages"].append(
+            AIMessage(content=f"🛑 신규 장단점이 수렴하여 조기 종료: 최근 포스트당 평균 {convergence['marginal_novelty']}개, "
+                              f"포스트 {posts_saved}개 / LLM 호출 {llm_calls_saved}회 절약, "
+                              f"최근 {session.novelty.window}개 포스트 기여율 {convergence['window_change'] * 100:.0f}%")
+        )
+    
+    exhausted = budget.exhausted()
+    if crawl_plan['cut_short'] or (exhausted == "시간" and remaining):
+        # 검색 마감으로 후보를 다 보지 못함 - 지금까지 수집한 결과를 부분 결과로 반환
+        state["results"]["partial"] = True
+        state["messages"].append(
+            AIMessage(content=f"⏱️ 검색 제한 시간이 되어 지금까지 수집한 결과로 마칩니다 (부분 결과, 남은 후보 {remaining}개)")
+        )
+    elif exhausted and remaining:
+        state["messages"].append(
+            AIMessage(content=f"⏱️ {exhausted} 예산 소진으로 수집 종료 (남은 후보 {remaining}개)")
+        )
+    state["messages"].append(
+        AIMessage(content=f"📈 검색 API {plan.pages_fetched}회(결과 {plan.items_fetched}개), 페이지 요청 {budget.fetches}회, LLM 호출 {budget.llm_calls}회, {budget.elapsed():.1f}초 소요")
+    )
+    planner.save()
+    if archive:
+        archive.flush()
     
-    # 중복 제거 및 정리
-    unique_pros = crawler.deduplicate_points(all_pros)
-    unique_cons = crawler.deduplicate_points(all_cons)
+    # 중복 제거 및 정리 (가지가 끝난 순서와 상관없이 가치 높은 포스트의 장단점이 앞에 오도록)
+    unique_pros = crawler.deduplicate_points([point for post in posts for point in post['pros']])
+    unique_cons = crawler.deduplicate_points([point for post in posts for point in post['cons']])
     
     state["pros"] = unique_pros
     state["cons"] = unique_cons
-    state["sources"] = sources[:10]
+    state["sources"] = [post['source'] for post in posts][:10]
     
     if state["pros"] or state["cons"]:
         state["messages"].append(
             AIMessage(content=f"🎉 웹 크롤링 완료! 총 장점 {len(state['pros'])}개, 단점 {len(state['cons'])}개 수집")
         )
         
-        # DB에 저장
+        # DB에 저장 (취소된 검색의 부분 결과는 저장하지 않음)
         try:
             supabase = get_supabase_client()
-            if supabase:
-                data = []
-                
-                for pro in state["pros"]:
-                    data.append({
-                        'product_name': product_name,
-                        'type': 'pro',
-                        'content': pro
-                    })
-                
-                for con in state["cons"]:
-                    data.append({
-                        'product_name': product_name,
-                        'type': 'con',
-                        'content': con
-                    })
+            can_save = supabase and not is_cancelled()
+            if can_save and state["results"].get("partial"):
+                # 마감으로 잘린 결과를 저장하면 신선도 기간 내내 전체 분석처럼 제공됨 - 저장하지 않고 다음 검색이 체크포인트에서 이어서 수집
+                state["messages"].append(
+                    AIMessage(content="📝 부분 결과라 저장하지 않았습니다. 다음 검색에서 이어서 수집합니다.")
+                )
+            elif can_save:
+                item = None
+                if ANALYSIS_STORAGE == STORAGE_SUMMARY:
+                    # 제품 1개당 1행 (키워드 빈도, 카테고리 집계를 미리 계산해 저장)
+                    summary = build_product_summary(product_name, state["pros"], state["cons"], state["sources"])
+                    state["analysis"] = {'keywords': summary['keywords'], 'category_counts': summary['category_counts']}
+                    item = {'mode': 'summary', 'table': 'laptop_analysis', 'key_column': 'product_name', 'name': product_name, 'rows': [summary]}
+                elif state["pros"] or state["cons"]:
+                    # 새 버전 저장과 이전 버전 삭제를 저장 프로시저 한 번의 호출로 처리 (원자적 교체)
+                    rows = point_rows('product_name', product_name, state["pros"], state["cons"])
+                    item = {'mode': 'points', 'table': 'laptop_pros_cons', 'key_column': 'product_name', 'name': product_name, 'rows': rows}
                 
-                if data:
-                    supabase.table('laptop_pros_cons').insert(data).execute()
-                    state["messages"].append(
-                        AIMessage(content="💾 데이터베이스에 저장 완료!")
-                    )
-                    st.session_state.saved_products += 1
+                if item:
+                    # 저장이 끝난 뒤 이 검색의 체크포인트를 지우도록 함께 넘김
+                    item['search_id'] = crawl_plan['search_id']
+                    # 지연 저장이 켜져 있으면 대기열에 넘기고 결과는 바로 표시
+                    if persist_analysis(supabase, item):
+                        state["messages"].append(
+                            AIMessage(content="💾 데이터베이스에 저장 완료!")
+                        )
+                    else:
+                        state["messages"].append(
+                            AIMessage(content="💾 분석 결과를 저장 대기열에 넣었습니다 (백그라운드에서 저장)")
+                        )
+                    state["results"]["saved"] = True
         except Exception as e:
             state["messages"].append(
                 AIMessage(content=f"⚠️ DB 저장 실패: {str(e)}")
@@ -1272,7 +1705,7 @@ def crawl_web(state: SearchState) -> SearchState:
     
     # 최종 통계
     state["messages"].append(
-        AIMessage(content=f"📊 크롤링 통계: 총 {crawler.stats['total_crawled']}개 페이지, 유효 추출 {crawler.stats['valid_pros_cons']}개")
+        AIMessage(content=f"📊 크롤링 통계: 총 {crawler.stats.value(event='total_crawled')}개 페이지, 유효 추출 {crawler.stats.value(event='valid_pros_cons')}개, 호스트 차단 {crawler.breaker.total_trips()}회")
     )
     
     return state
@@ -1282,13 +1715,26 @@ def process_results(state: SearchState) -> SearchState:
     if state["search_method"] == "database" and state["results"].get("data"):
         # DB 결과 처리
         data = state["results"]["data"]
-        state["pros"] = [item['content'] for item in data if item['type'] == 'pro']
-        state["cons"] = [item['content'] for item in data if item['type'] == 'con']
-        state["sources"] = []
+        if ANALYSIS_STORAGE == STORAGE_SUMMARY:
+            # 요약 행에 장단점과 집계가 모두 들어 있어 다시 계산할 필요 없음
+            row = data[0]
+            state["pros"] = row.get('pros') or []
+            state["cons"] = row.get('cons') or []
+            state["sources"] = row.get('sources') or []
+            state["analysis"] = {
+                'keywords': row.get('keywords') or {},
+                'category_counts': row.get('category_counts') or {}
+            }
+        else:
+            state["pros"] = [item['content'] for item in data if item['type'] == 'pro']
+            state["cons"] = [item['content'] for item in data if item['type'] == 'con']
+            state["sources"] = []
         
         state["messages"].append(
             AIMessage(content=f"📋 결과 정리 완료: 장점 {len(state['pros'])}개, 단점 {len(state['cons'])}개")
         )
+        emit(EVENT_POINTS, f"📋 저장된 분석: 장점 {len(state['pros'])}개, 단점 {len(state['cons'])}개",
+             pros=state["pros"], cons=state["cons"])
     
     return state
 
@@ -1307,22 +1753,26 @@ def should_search_web(state: SearchState) -> str:
 def create_search_workflow():
     workflow = StateGraph(SearchState)
     
-    # 노드 추가
-    workflow.add_node("search_db", search_database)
-    workflow.add_node("crawl_web", crawl_web)
-    workflow.add_node("process", process_results)
+    # 노드 추가 (상태를 고쳐 반환하는 노드는 바뀐 값만 반환하도록 감싸고, 노드마다 구간 기록)
+    workflow.add_node("search_db", traced("node.search_db", as_update(search_database, SearchState)))
+    workflow.add_node("plan_crawl", traced("node.plan_crawl", as_update(plan_crawl, SearchState)))
+    workflow.add_node("crawl_branch", traced("node.crawl_branch", crawl_branch))
+    workflow.add_node("merge_branches", traced("node.merge_branches", as_update(merge_branches, SearchState)))
+    workflow.add_node("process", traced("node.process", as_update(process_results, SearchState)))
     
-    # 엣지 설정
+    # 엣지 설정: 계획 → 가지별 수집(동시 실행) → 합치기
     workflow.set_entry_point("search_db")
     workflow.add_conditional_edges(
         "search_db",
         should_search_web,
         {
-            "crawl": "crawl_web",
+            "crawl": "plan_crawl",
             "process": "process"
         }
     )
-    workflow.add_edge("crawl_web", "process")
+    workflow.add_conditional_edges("plan_crawl", dispatch_branches, ["crawl_branch", "merge_branches"])
+    workflow.add_edge("crawl_branch", "merge_branches")
+    workflow.add_edge("merge_branches", "process")
     workflow.add_edge("process", END)
     
     return workflow.compile()
@@ -1330,6 +1780,113 @@ def create_search_workflow():
 # 워크플로우 인스턴스 생성
 search_app = create_search_workflow()
 
+# ========================
+# 백그라운드 검색 작업
+# ========================
+
+@st.cache_resource
+def get_job_runner():
+    return JobRunner(max_workers=4)
+
+@st.cache_resource
+def get_single_flight():
+    # 같은 검색어의 동시 검색은 하나의 작업으로 합침
+    lock_backend = FileLockBackend(SINGLE_FLIGHT_LOCK_DIR) if SINGLE_FLIGHT_LOCK_DIR else ThreadLockBackend()
+    return SingleFlight(get_job_runner(), lock_backend=lock_backend)
+
+def initial_search_state(search_term, refresh=False):
+    """워크플로우 초기 상태 (마감 시각은 지금부터 SEARCH_DEADLINE 초, 재수집은 CRAWL_TIME_BUDGET 초)"""
+    return {
+        "product_name": search_term,
+        "search_method": "",
+        "results": {},
+        "pros": [],
+        "cons": [],
+        "sources": [],
+        "messages": [],
+        "error": "",
+        "refresh": refresh,
+        "analysis": {},
+        "crawl_plan": {},
+        "branch_results": [],
+        "deadline": time.time() + (CRAWL_TIME_BUDGET if refresh else SEARCH_DEADLINE),
+        "search_id": f"product:{normalize_key(search_term)}"
+    }
+
+def run_search(search_term, refresh=False, profile=False):
+    """백그라운드 스레드에서 검색 워크플로우 실행 (profile: 실행을 프로파일링 - 결과 화면을 그린 뒤 저장)"""
+    report_progress(f"🚀 '{search_term}' 검색 시작")
+    
+    # LangGraph 실행
+    initial_state = initial_search_state(search_term, refresh)
+    
+    # 스트리밍으로 실행해 진행 이벤트와 부분 결과를 작업에 바로 기록 (UI가 1초마다 조회)
+    # 검색 1회를 추적 1개로 기록 (노드/네이버 API/페이지 요청/본문 해석/LLM 호출 구간)
+    capture = get_profile_store().begin(search_term, app="product") if profile else None
+    try:
+        with start_trace("search", exporter=get_trace_exporter(), profile=capture, app="product", term=search_term, refresh=refresh) as trace:
+            final_state = stream_workflow(search_app, initial_state, on_event=lambda event: report_progress(**event), on_partial=report_partial)
+    except Exception:
+        if capture:
+            get_profile_store().finish(capture.id)
+        raise
+    if final_state is not None:
+        final_state["results"]["trace"] = trace.spans()
+        if capture:
+            final_state["results"]["profile_id"] = capture.id
+    elif capture:
+        get_profile_store().finish(capture.id)
+    if METRICS_PATH:
+        try:
+            get_metrics().write_file(METRICS_PATH)
+        except OSError as e:
+            print(f"지표 기록 오류: {e}")
+    return final_state
+
+@st.fragment(run_every=1)
+def show_job_progress(job_id, search_term):
+    """진행 중인 검색 작업 표시 (1초마다 이 영역만 다시 그림)"""
+    job = get_job_runner().get(job_id)
+    if job is None or job.finished():
+        # 작업이 끝나면 전체 페이지를 다시 그려 결과 표시
+        st.rerun()
+    
+    snapshot = job.snapshot()
+    partial = snapshot['partial']
+    if not partial.get('pros') and not partial.get('cons'):
+        # 첫 장단점이 나오기 전까지만 로딩 애니메이션 표시
+        show_loading_animation()
+    
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        caption = f"⏳ '{search_term}' 분석 중... ({snapshot['elapsed']:.0f}초 경과)"
+        if partial.get('first_result') is not None:
+            caption += f" · 첫 결과 {partial['first_result']:.1f}초"
+        st.caption(caption)
+        
+        kinds = Counter(entry.get('kind') for entry in snapshot['progress'])
+        st.caption(f"🔍 검색 {kinds[EVENT_QUERY]}회 · 📖 페이지 {kinds[EVENT_FETCH]}개 · ✓ 추출 {kinds[EVENT_POINTS]}건")
+        for entry in snapshot['progress'][-5:]:
+            st.write(entry['message'])
+    with col2:
+        if st.button("⏹️ 취소", key="cancel_search_job"):
+            # 같은 검색을 보고 있는 다른 사용자가 있으면 이 세션만 구독 해제
+            get_single_flight().cancel(job_id)
+            st.session_state.search_job = None
+            st.rerun()
+    
+    # 지금까지 추출된 장단점 (최종 결과는 중복 제거 후 순위대로 다시 정리됨)
+    if partial.get('pros') or partial.get('cons'):
+        pros_col, cons_col = st.columns(2)
+        with pros_col:
+            st.markdown(f"**👍 지금까지 수집된 장점 {len(partial.get('pros', []))}개**")
+            for pro in partial.get('pros', [])[:10]:
+                st.write(f"✅ {pro}")
+        with cons_col:
+            st.markdown(f"**👎 지금까지 수집된 단점 {len(partial.get('cons', []))}개**")
+            for con in partial.get('cons', [])[:10]:
+                st.write(f"❌ {con}")
+
 # ========================
 # Streamlit UI
 # ========================
@@ -1477,6 +2034,27 @@ with col2:
     
     st.markdown('</div></div>', unsafe_allow_html=True)
 
+# 사용 통계 - 서버 전체 지표
+with server_stats:
+    show_server_stats()
+
+# 조회 캐시 상태 (서버 전체에서 공유)
+with st.sidebar:
+    with st.expander("⚡ 조회 캐시", expanded=False):
+        cache_stats = get_result_cache().snapshot()
+        st.metric("캐시 적중률", f"{cache_stats['hit_ratio'] * 100:.1f}%", help=f"적중 {cache_stats['hits']}회 / 미적중 {cache_stats['misses']}회")
+        if cache_stats['p50_ms'] is not None:
+            st.caption(f"조회 지연 p50 {cache_stats['p50_ms']}ms · p99 {cache_stats['p99_ms']}ms")
+        st.caption(f"보관 {cache_stats['size']}개 · 무효화 {cache_stats['invalidations']}회 · 제거 {cache_stats['evictions']}회")
+    if WRITE_BEHIND_ENABLED:
+        with st.expander("💾 저장 대기열", expanded=False):
+            queue_stats = get_write_behind().snapshot()
+            st.metric("대기 중", f"{queue_stats['depth']}건", help=f"저장 {queue_stats['written']}건 / 실패 {queue_stats['failed']}건 / 재시도 {queue_stats['retries']}회")
+            if queue_stats['p50_ms'] is not None:
+                st.caption(f"저장 지연 p50 {queue_stats['p50_ms']}ms · p99 {queue_stats['p99_ms']}ms · 묶음 {queue_stats['batches']}회")
+            if queue_stats['last_error']:
+                st.caption(f"최근 오류: {queue_stats['last_error']}")
+
 # 검색 실행
 if search_button:
     # 인기 검색어로 선택된 경우 해당 검색어 사용
@@ -1488,26 +2066,45 @@ if search_button:
         search_term = product_name
     
     if search_term:
-        loading_placeholder = show_loading_animation()
-        
-        # LangGraph 실행
-        initial_state = {
-            "product_name": search_term,
-            "search_method": "",
-            "results": {},
-            "pros": [],
-            "cons": [],
-            "sources": [],
-            "messages": [],
-            "error": ""
-        }
-        
-        # 워크플로우 실행
-        final_state = search_app.invoke(initial_state)
-        
-        # 로딩 애니메이션 제거
-        loading_placeholder.empty()
+        # 워크플로우는 백그라운드 작업으로 실행하고 세션에는 작업 ID만 보관
+        # 같은 검색어가 이미 진행 중이면 새로 크롤링하지 않고 그 작업에 합류
+        job_id, joined = get_single_flight().submit(normalize_key(search_term), run_search, search_term, profile=profiling_enabled, name=search_term)
+        st.session_state.search_job = {'id': job_id, 'term': search_term, 'joined': joined, 'counted': False}
+
+# 검색 작업 상태 확인 (페이지가 다시 실행되어도 작업은 계속 진행)
+search_job = st.session_state.get('search_job')
+if search_job:
+    search_term = search_job['term']
+    job = get_job_runner().get(search_job['id'])
+    final_state = None
+    profile_capture = None
+    
+    if job is None:
+        st.session_state.search_job = None
+        st.warning("검색 작업이 만료되었습니다. 다시 검색해주세요.")
+    elif not job.finished():
+        if search_job['joined']:
+            st.info("👥 다른 사용자가 같은 검색을 진행 중이어서 그 결과를 함께 받아옵니다.")
+        show_job_progress(job.id, search_term)
+    elif job.status == FAILED:
+        st.error(f"검색 중 오류가 발생했습니다: {job.error}")
+    else:
+        final_state = job.result
+        # 프로파일링한 검색이면 결과 화면 그리기도 같은 캡처에 기록 (다 그린 뒤 저장)
+        if final_state and not search_job['joined']:
+            profile_capture = get_profile_store().resume(final_state["results"].get("profile_id"))
+        if job.status == CANCELLED:
+            st.info("⏹️ 검색이 취소되었습니다. 취소 전까지 수집한 결과를 표시합니다.")
+        elif final_state and final_state["results"].get("partial"):
+            st.info(f"⏱️ 제한 시간({SEARCH_DEADLINE:.0f}초) 안에 수집한 부분 결과입니다.")
         
+        # 저장 통계는 작업을 시작한 세션에서 한 번만 반영
+        if not search_job['counted']:
+            search_job['counted'] = True
+            if final_state and final_state["results"].get("saved") and not search_job['joined']:
+                st.session_state.saved_products += 1
+    
+    if final_state:
         # 프로세스 로그 표시
         if show_process and final_state["messages"]:
             with st.expander("🔧 검색 프로세스", expanded=False):
@@ -1517,8 +2114,15 @@ if search_button:
                     else:
                         st.write(f"🤖 {msg.content}")
         
+        # 성능 패널 - 이 검색의 구간별 소요 시간 (노드, 네이버 API, 페이지 요청/해석, LLM 호출)
+        if show_process and final_state["results"].get("trace"):
+            with st.expander("⏱️ 성능", expanded=False):
+                show_trace_waterfall(final_state["results"]["trace"])
+        
         # 결과 표시
         if final_state["pros"] or final_state["cons"]:
+            # 첫 결과까지 걸린 시간 (스트리밍 실행에서 측정)
+            timing = final_state["results"].get("timing") or {}
             # 검색 정보
             st.markdown(f"""
             <div class="process-info fade-in">
@@ -1526,7 +2130,8 @@ if search_button:
                     '데이터베이스' if final_state["search_method"] == "database" else '웹 크롤링'
                 } | 
                 <strong><i class="fas fa-thumbs-up"></i> 장점:</strong> {len(final_state["pros"])}개 | 
-                <strong><i class="fas fa-thumbs-down"></i> 단점:</strong> {len(final_state["cons"])}개
+                <strong><i class="fas fa-thumbs-down"></i> 단점:</strong> {len(final_state["cons"])}개 | 
+                <strong><i class="fas fa-bolt"></i> 첫 결과:</strong> {timing.get('time_to_first_result') or 0:.1f}초 (전체 {timing.get('total') or 0:.1f}초)
             </div>
             """, unsafe_allow_html=True)
             
@@ -1581,7 +2186,8 @@ if search_button:
             # 워드클라우드 표시
             st.markdown("---")
             st.markdown("### 🔤 키워드 분석")
-            display_wordclouds(final_state["pros"], final_state["cons"])
+            analysis = final_state.get("analysis") or {}
+            display_wordclouds(final_state["pros"], final_state["cons"], keywords=analysis.get("keywords"))
             
             # 심층 분석 섹션 - 수정된 부분
             st.markdown("---")
@@ -1591,7 +2197,7 @@ if search_button:
             col1, col2 = st.columns([1, 1])
             
             with col1:
-                comparison_chart = create_comparison_chart(final_state["pros"], final_state["cons"])
+                comparison_chart = create_comparison_chart(final_state["pros"], final_state["cons"], category_counts=analysis.get("category_counts"))
                 if comparison_chart:
                     st.plotly_chart(comparison_chart, use_container_width=True)
                 else:
@@ -1600,43 +2206,15 @@ if search_button:
             with col2:
                 # 레이더 차트 해석 섹션
                 if final_state["pros"] or final_state["cons"]:
-                    # 카테고리별 분석을 위한 데이터 추출
-                    categories = {
-                        '성능': ['성능', '속도', '빠르', '느리', '렉', '버벅', '프로세서', 'CPU', 'GPU', '메모리'],
-                        '디자인': ['디자인', '외관', '예쁘', '이쁘', '못생', '색상', '모양', '두께', '얇'],
-                        '가격': ['가격', '비싸', '저렴', '가성비', '비용', '돈', '할인', '세일'],
-                        '품질': ['품질', '마감', '재질', '튼튼', '약하', '고장', '내구성', '견고'],
-                        '기능': ['기능', '편의', '편리', '불편', '사용', '조작', '인터페이스'],
-                        '배터리': ['배터리', '충전', '전원', '지속', '방전'],
-                        '화면': ['화면', '디스플레이', '선명', '밝기', '해상도'],
-                        '기타': []
-                    }
-                    
-                    # 각 카테고리별 장단점 수 계산
-                    category_pros = {cat: 0 for cat in categories}
-                    category_cons = {cat: 0 for cat in categories}
-                    
-                    # 장점 분류
-                    for pro in final_state["pros"]:
-                        categorized = False
-                        for cat, keywords in categories.items():
-                            if cat != '기타' and any(keyword in pro for keyword in keywords):
-                                category_pros[cat] += 1
-                                categorized = True
-                                break
-                        if not categorized:
-                            category_pros['기타'] += 1
-                    
-                    # 단점 분류
-                    for con in final_state["cons"]:
-                        categorized = False
-                        for cat, keywords in categories.items():
-                            if cat != '기타' and any(keyword in con for keyword in keywords):
-                                category_cons[cat] += 1
-                                categorized = True
-                                break
-                        if not categorized:
-                            category_cons['기타'] += 1
+                    # 카테고리별 장단점 수 (요약 행에 미리 계산된 값이 있으면 사용)
+                    categories = PRODUCT_CATEGORIES
+                    category_counts = analysis.get("category_counts") or {}
+                    if category_counts:
+                        category_pros = {cat: category_counts.get('pros', {}).get(cat, 0) for cat in categories}
+                        category_cons = {cat: category_counts.get('cons', {}).get(cat, 0) for cat in categories}
+                    else:
+                        category_pros = categorize_points(final_state["pros"], categories)
+                        category_cons = categorize_points(final_state["cons"], categories)
                     
                     # 가장 강한 장점 카테고리
                     strongest_pro_cat = max(category_pros.items(), key=lambda x: x[1])
@@ -1720,7 +2298,7 @@ if search_button:
             
             with col1:
                 # 장점에서 가장 많이 언급된 구체적인 키워드 추출
-                pros_keywords = extract_keywords(final_state["pros"])
+                pros_keywords = (analysis.get("keywords") or {}).get("pros") or extract_keywords(final_state["pros"])
                 if pros_keywords and isinstance(pros_keywords, dict):
                     # 제품 특성과 관련된 키워드만 필터링
                     product_keywords = {
@@ -1766,7 +2344,7 @@ if search_button:
             
             with col2:
                 # 단점에서 가장 많이 언급된 구체적인 키워드 추출
-                cons_keywords = extract_keywords(final_state["cons"])
+                cons_keywords = (analysis.get("keywords") or {}).get("cons") or extract_keywords(final_state["cons"])
                 if cons_keywords and isinstance(cons_keywords, dict):
                     # 제품 특성과 관련된 키워드만 필터링
                     product_keywords = {
@@ -1959,6 +2537,38 @@ if search_button:
                 """, unsafe_allow_html=True)
         else:
             st.error(f"'{search_term}'에 대한 정보를 찾을 수 없습니다.")
+    
+    if profile_capture:
+        st.session_state.last_profile = get_profile_store().finish(profile_capture.id)
+
+if st.session_state.get('last_profile'):
+    with profile_panel:
+        show_profile_result(st.session_state.last_profile)
+
+# 저장된 장단점 검색 (모든 제품의 장단점에서 검색어가 들어간 항목 찾기)
+st.markdown("---")
+with st.expander("🔎 저장된 장단점 검색 (예: '발열' 단점이 있는 노트북)", expanded=False):
+    point_query = st.text_input("검색어", placeholder="예: 발열, 배터리 오래, 키보드 소음", key="point_search_input")
+    point_type_label = st.radio("유형", ["전체", "장점", "단점"], horizontal=True, key="point_search_type")
+    if point_query:
+        point_type = {'장점': 'pro', '단점': 'con'}.get(point_type_label)
+        start_time = time.perf_counter()
+        try:
+            point_results = search_stored_points(
+                get_supabase_client(), get_point_index(), point_query, POINT_SEARCH_SOURCES,
+                point_type=point_type, limit=50, max_age=POINT_INDEX_MAX_AGE
+            )
+        except Exception as e:
+            point_results = []
+            st.error(f"장단점 검색 오류: {str(e)}")
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        groups = group_by_name(point_results)
+        st.caption(f"{len(groups)}개 제품 · 장단점 {len(point_results)}개 · {elapsed_ms:.1f}ms")
+        for group in groups[:10]:
+            st.markdown(f"**{group['name']}**")
+            for point in group['points'][:5]:
+                icon = "✅" if point['type'] == 'pro' else "⚠️"
+                st.markdown(f"- {icon} {point['content']}")
 
 # 하단 정보
 st.markdown("---")
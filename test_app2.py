@@ -11,7 +11,6 @@ st.set_page_config(
 
 # 필요한 라이브러리 import
 import pandas as pd
-from supabase import create_client
 from openai import OpenAI
 import os
 from dotenv import load_dotenv
@@ -33,9 +32,36 @@ import urllib.request
 # LangGraph 관련
 from typing import TypedDict, Annotated, List, Union, Dict
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
 from langchain_core.messages import HumanMessage, AIMessage
 import operator
 
+# 크롤러 공용 모듈
+from circuit_breaker import HostCircuitBreaker, host_of
+from crawl_frontier import CrawlFrontier, CrawlBudget, canonical_link, time_left, request_timeout
+from convergence import NoveltyTracker, estimate_savings
+from query_planner import QueryPlanner
+from job_runner import JobRunner, report_progress, report_partial, is_cancelled, FAILED, CANCELLED
+from single_flight import SingleFlight, ThreadLockBackend, FileLockBackend, normalize_key
+from freshness import FreshnessPolicy
+from versioned_store import latest_version, point_rows
+from result_cache import ResultCache
+from storage import create_storage, find_stored_name, similar_names
+from write_behind import WriteBehindQueue, persist_batch
+from crawl_archive import CrawlArchive
+from crawl_checkpoint import CrawlCheckpoint
+from crawl_graph import CrawlSession, as_update, partition, merge_branch_results
+from tracing import JsonlExporter, add_listener, start_trace, span, traced, waterfall_rows, summarize, to_chrome_trace
+from profiling import ProfileStore
+from metrics import MetricsRegistry, STAGE_LABELS
+from progress_stream import emit, stream_workflow, EVENT_QUERY, EVENT_FETCH, EVENT_POINTS, EVENT_CACHE_HIT
+from extractors import CAREER_SYSTEM_PROMPT, career_prompt, extract_with_gpt, extract_career_simple, deduplicate_points
+from point_search import PointIndex, index_item, search_stored_points, group_by_name
+from analysis_store import (
+    STORAGE_SUMMARY, CAREER_STOPWORDS, extract_keywords as extract_point_keywords,
+    build_career_summary, fetch_summary
+)
+
 # 앱 시작 시 폰트 자동 다운로드
 @st.cache_resource
 def ensure_font():
@@ -76,6 +102,83 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY") or st.secrets.get("OPENAI_API_KEY",
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID") or st.secrets.get("NAVER_CLIENT_ID", "")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET") or st.secrets.get("NAVER_CLIENT_SECRET", "")
 
+# 외부 서비스 주소 (벤치마크/테스트에서 로컬 대역 서버로 바꿔 실행 - benchmarks/e2e.py)
+NAVER_API_BASE = os.getenv("NAVER_API_BASE", "https://openapi.naver.com").rstrip("/")
+BLOG_MOBILE_BASE = os.getenv("BLOG_MOBILE_BASE", "https://m.blog.naver.com").rstrip("/")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+# 검색 1회당 크롤링 예산
+CRAWL_TIME_BUDGET = 60        # 초
+CRAWL_LLM_BUDGET = 12         # GPT 호출 수
+CRAWL_FETCH_BUDGET = 15       # 페이지 요청 수
+CRAWL_BRANCHES = 4            # 동시에 실행할 수집 가지 수 (페이지 요청 → 장단점 추출)
+
+# 검색 1회의 응답 시간 한도 - 지나면 그때까지 수집한 결과를 부분 결과로 반환 (백그라운드 재수집은 CRAWL_TIME_BUDGET)
+SEARCH_DEADLINE = float(os.getenv("SEARCH_DEADLINE", "15"))   # 초
+DEADLINE_RESERVE = 1.0        # 합치기/저장에 남겨 둘 시간 (초)
+
+# 직업 관련 검색어 템플릿 (수율 높은 템플릿부터 큰 페이지로 조회)
+_CAREER_QUERIES = [
+    "{name} 직업 장단점",
+    "{name} 현실 단점",
+    "{name} 실제 장점",
+    "{name} 연봉 워라밸",
+    "{name} 직업 후기",
+    "{name} 직업 현실",
+    "{name} 일하면서 느낀점",
+    "{name} 직업 추천",
+    "{name} 직업 경험담",
+    "{name} 커리어 조언"
+]
+CAREER_SEARCH_TEMPLATES = [(query, "blog") for query in _CAREER_QUERIES] + [(query, "news") for query in _CAREER_QUERIES]
+SEARCH_PAGE_SIZE = 40         # 검색 API 1회당 결과 수 (최대 100)
+SEARCH_INITIAL_PAGES = 3      # 처음에 조회할 페이지 수
+
+# 로컬 캐시 디렉터리 (검색어 수율 기록 등)
+CACHE_DIR = os.getenv("SMART_CACHE_DIR", ".cache")
+
+# 저장된 분석의 유효 기간 - 지나면 저장된 결과를 먼저 보여주고 백그라운드에서 다시 수집
+ANALYSIS_TTL_DAYS = 30
+
+# 저장소: auto (Supabase 키가 있으면 Supabase, 없으면 로컬 SQLite) / supabase / sqlite / none
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "auto")
+LOCAL_DB_PATH = os.getenv("LOCAL_DB_PATH", os.path.join(CACHE_DIR, "analysis.db"))
+
+# 분석 결과 저장 방식: points (장단점 1개당 1행) / summary (직업 1개당 1행, career_analysis 테이블)
+ANALYSIS_STORAGE = os.getenv("ANALYSIS_STORAGE", "points")
+
+# 수집한 본문 원문 보관 (프롬프트 변경/새 분석 시 다시 크롤링하지 않고 재사용, 0이면 끔)
+CRAWL_ARCHIVE_ENABLED = os.getenv("CRAWL_ARCHIVE", "1") != "0"
+CRAWL_ARCHIVE_DIR = os.getenv("CRAWL_ARCHIVE_DIR", os.path.join(CACHE_DIR, "crawl_archive"))
+
+# 크롤링 체크포인트 - 중단된 검색을 다시 하면 처리를 마친 포스트는 다시 요청/추출하지 않고 이어받음 (0이면 끔)
+CRAWL_CHECKPOINT_ENABLED = os.getenv("CRAWL_CHECKPOINT", "1") != "0"
+CRAWL_CHECKPOINT_PATH = os.getenv("CRAWL_CHECKPOINT_PATH", os.path.join(CACHE_DIR, "crawl_checkpoints.db"))
+
+# 검색 구간 추적 기록 (JSONL, `python tracing.py chrome` 으로 Chrome 추적 형식 변환, 0이면 파일에 남기지 않음)
+TRACE_EXPORT_ENABLED = os.getenv("TRACE_EXPORT", "1") != "0"
+TRACE_PATH = os.getenv("TRACE_PATH", os.path.join(CACHE_DIR, "traces.jsonl"))
+# 검색 1회 프로파일링 결과 (speedscope / folded / 메모리 할당 보고서) - 사이드바에서 켜거나 주소에 ?profile=1
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(CACHE_DIR, "profiles"))
+# 운영 지표 (Prometheus 텍스트 형식) - METRICS_PORT 를 주면 http://127.0.0.1:<포트>/metrics 로 제공,
+# 검색이 끝날 때마다 METRICS_PATH 파일에도 기록 (빈 값이면 기록 안 함)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_PATH = os.getenv("METRICS_PATH", os.path.join(CACHE_DIR, "metrics_career.prom"))
+
+# 분석 결과를 저장 대기열에 넘기고 바로 결과 표시 (0이면 검색 흐름 안에서 바로 저장)
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND", "1") != "0"
+
+# 조회 결과 메모리 캐시 (최대 항목 수, 유효 시간(초))
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_TTL = 300
+
+# 장단점 검색 대상 테이블과 색인 재구성 주기(초)
+POINT_SEARCH_SOURCES = ['career_pros_cons', 'career_analysis']
+POINT_INDEX_MAX_AGE = 600
+
+# 여러 서버 프로세스가 같은 검색을 중복 실행하지 않도록 할 때 잠금 파일 디렉터리 지정
+SINGLE_FLIGHT_LOCK_DIR = os.getenv("SINGLE_FLIGHT_LOCK_DIR", "")
+
 # LangSmith 설정 (선택적)
 LANGSMITH_API_KEY = os.getenv("LANGSMITH_API_KEY") or st.secrets.get("LANGSMITH_API_KEY", "")
 if LANGSMITH_API_KEY:
@@ -622,6 +725,13 @@ with st.sidebar:
     st.markdown("### ⚙️ 설정")
     dark_mode = st.checkbox("🌙 다크모드", value=st.session_state.dark_mode)
     st.session_state.dark_mode = dark_mode
+    # 켜 두면 이 세션의 다음 검색(워크플로우 실행 + 결과 화면)을 프로파일링 - 끄면 비용 없음
+    profiling_enabled = st.toggle(
+        "🔬 프로파일링", value=st.query_params.get("profile") == "1",
+        help="검색 1회를 표본 추출 프로파일러와 tracemalloc 으로 기록해 speedscope 파일로 저장합니다"
+    )
+    # 프로파일링 결과 (검색 결과를 그린 뒤 채움)
+    profile_panel = st.container()
     
     st.markdown("### 📌 북마크")
     if st.session_state.bookmarks:
@@ -634,6 +744,8 @@ with st.sidebar:
     st.markdown("### 📊 사용 통계")
     st.metric("총 검색 수", f"{st.session_state.total_searches}회")
     st.metric("저장된 직업", f"{st.session_state.saved_careers}개")
+    # 서버 전체 지표 (아래에서 지표 모음을 만든 뒤 채움)
+    server_stats = st.container()
     
 # 헤더 - 커리어 인사이트
 st.markdown("""
@@ -751,25 +863,38 @@ class CareerState(TypedDict):
     career_path: List[str]
     messages: Annotated[List[Union[HumanMessage, AIMessage]], operator.add]
     error: str
+    refresh: bool  # True면 저장된 결과를 무시하고 다시 수집 (백그라운드 재수집)
+    analysis: dict  # 요약 행에 미리 계산된 집계 (키워드 빈도)
+    crawl_plan: dict  # 계획 노드가 나눈 수집 가지와 가지들이 공유하는 예산 (plan_crawl → crawl_branch → merge_branches)
+    branch_results: Annotated[List[dict], operator.add]  # 가지별 수집 결과 (동시에 끝난 가지의 결과도 모두 합쳐짐)
+    deadline: float  # 검색 마감 시각 (time.time() 기준) - 모든 노드와 요청이 남은 시간 안에서만 실행
+    search_id: str  # 크롤링 체크포인트 키 (같은 검색을 다시 하면 중단된 곳부터 이어받음)
 
 # ========================
 # 크롤링 클래스
 # ========================
 
 class CareerInfoCrawler:
-    def __init__(self, naver_client_id, naver_client_secret):
+    def __init__(self, naver_client_id, naver_client_secret, metrics=None):
         self.naver_headers = {
             "X-Naver-Client-Id": naver_client_id,
             "X-Naver-Client-Secret": naver_client_secret
         }
-        self.openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+        self.openai_client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL) if OPENAI_API_KEY else None
         
-        # 통계
-        self.stats = {
-            'total_crawled': 0,
-            'valid_pros_cons': 0,
-            'api_errors': 0
-        }
+        # 호스트별 서킷 브레이커 (스로틀링/타임아웃 호스트 차단)
+        self.breaker = HostCircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+        self.fetch_timeout = 10
+        self.llm_timeout = 30
+        
+        # 통계 (여러 세션과 수집 가지가 함께 쓰므로 지표 모음의 카운터로 셈)
+        self.metrics = metrics or MetricsRegistry()
+        self.stats = self.metrics.counter("crawler_events_total", "크롤러 이벤트 수 (수집 페이지, 유효 추출, API 오류, 조기 종료 등)", ("event",))
+        self.metrics.callback("breaker_trips_total", "호스트 차단 횟수", self.breaker.total_trips, kind="counter")
+        self.metrics.callback(
+            "breaker_open_hosts", "차단 중인 호스트 수",
+            lambda: sum(entry['state'] != 'closed' for entry in self.breaker.snapshot().values())
+        )
     
     def remove_html_tags(self, text):
         """HTML 태그 제거"""
@@ -777,290 +902,164 @@ class CareerInfoCrawler:
         text = re.sub(r'<[^>]+>', '', text)
         return text.strip()
     
-    def search_career_info(self, query, display=20):
-        """네이버 검색 API를 통해 직업 정보 검색"""
-        all_results = []
-        
-        # 직업 관련 다양한 검색어 조합
-        search_queries = [
-            f"{query} 직업 장단점",
-            f"{query} 현실 단점",
-            f"{query} 실제 장점",
-            f"{query} 연봉 워라밸",
-            f"{query} 직업 후기",
-            f"{query} 직업 현실",
-            f"{query} 일하면서 느낀점",
-            f"{query} 직업 추천",
-            f"{query} 직업 경험담",
-            f"{query} 커리어 조언"
-        ]
-        
-        # 블로그와 뉴스 모두 검색
-        search_types = [
-            ("blog", "https://openapi.naver.com/v1/search/blog"),
-            ("news", "https://openapi.naver.com/v1/search/news")
-        ]
+    def search_naver(self, search_type, query, display=10, start=1, timeout=None):
+        """네이버 블로그/뉴스 검색 1페이지 (display 최대 100, start 최대 1000, timeout 은 검색 마감에 맞춰 줄인 값)"""
+        url = f"{NAVER_API_BASE}/v1/search/{search_type}"
+        params = {
+            "query": query,
+            "display": display,
+            "start": start,
+            "sort": "sim"
+        }
         
-        for search_type, url in search_types:
-            for search_query in search_queries[:5]:  # 각 타입별로 5개 쿼리만 사용
-                params = {
-                    "query": search_query,
-                    "display": 10,
-                    "sort": "sim"
-                }
-                
-                try:
-                    response = requests.get(url, headers=self.naver_headers, params=params)
-                    if response.status_code == 200:
-                        result = response.json()
-                        for item in result.get('items', []):
-                            item['title'] = self.remove_html_tags(item['title'])
-                            item['description'] = self.remove_html_tags(item['description'])
-                            item['search_type'] = search_type  # 블로그인지 뉴스인지 구분
-                        all_results.extend(result.get('items', []))
-                    time.sleep(0.1)  # API 호출 제한을 위한 짧은 대기
-                except Exception as e:
-                    print(f"{search_type} 검색 오류: {e}")
-        
-        # 중복 제거 (제목 기준)
-        seen_titles = set()
-        unique_results = []
-        for item in all_results:
-            if item['title'] not in seen_titles:
-                seen_titles.add(item['title'])
-                unique_results.append(item)
-        
-        return unique_results[:30]  # 최대 30개 결과 반환
-    
-    def crawl_content(self, url):
-        """블로그 및 뉴스 본문 크롤링"""
-        try:
-            # 네이버 블로그 처리
-            if "blog.naver.com" in url:
-                parts = url.split('/')
-                if len(parts) >= 5:
-                    blog_id = parts[3]
-                    post_no = parts[4].split('?')[0]
-                    mobile_url = f"https://m.blog.naver.com/{blog_id}/{post_no}"
-                    
-                    response = requests.get(mobile_url, headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    })
-                    
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        
-                        content = ""
-                        for selector in ['div.se-main-container', 'div#postViewArea', 'div.post_ct']:
-                            elem = soup.select_one(selector)
-                            if elem:
-                                content = elem.get_text(separator='\n', strip=True)
-                                break
-                        
-                        if not content:
-                            content = soup.get_text(separator='\n', strip=True)
-                        
-                        content = re.sub(r'\s+', ' ', content)
-                        content = content.replace('\u200b', '')
-                        
-                        return content if len(content) > 300 else None
-            
-            # 일반 웹페이지 및 뉴스 처리
-            else:
-                response = requests.get(url, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                
+        with span("naver.search", source_type=search_type, query=query, start=start, display=display) as search_span:
+            try:
+                response = requests.get(url, headers=self.naver_headers, params=params, timeout=timeout or self.fetch_timeout)
+                search_span.set(status=response.status_code, bytes=len(response.content))
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # 뉴스 기사 본문 추출 시도
-                    content = ""
-                    article_selectors = [
-                        'article', 'div.article_body', 'div.news_body', 
-                        'div.content', 'main', 'div#articleBody',
-                        'div.article_content', 'div.news_content'
-                    ]
-                    
-                    for selector in article_selectors:
-                        elem = soup.select_one(selector)
-                        if elem:
-                            content = elem.get_text(separator='\n', strip=True)
-                            break
-                    
-                    if not content:
-                        # 일반적인 텍스트 추출
-                        content = soup.get_text(separator='\n', strip=True)
-                    
-                    content = re.sub(r'\s+', ' ', content)
-                    content = content.replace('\u200b', '')
-                    
-                    return content if len(content) > 300 else None
-                    
-        except Exception as e:
-            print(f"크롤링 오류: {e}")
-        return None
+                    result = response.json()
+                    for rank, item in enumerate(result.get('items', []), start - 1):
+                        item['title'] = self.remove_html_tags(item['title'])
+                        item['description'] = self.remove_html_tags(item['description'])
+                        item['search_type'] = search_type  # 블로그인지 뉴스인지 구분
+                        item['query'] = query
+                        item['rank'] = rank
+                    return result.get('items', [])
+            except Exception as e:
+                search_span.fail(e)
+                print(f"{search_type} 검색 오류: {e}")
+        return []
+    
+    def resolve_fetch_url(self, url):
+        """실제 요청할 URL 반환 (네이버 블로그는 모바일 주소로 변환)"""
+        if "blog.naver.com" in url:
+            parts = url.split('/')
+            if len(parts) >= 5:
+                blog_id = parts[3]
+                post_no = parts[4].split('?')[0]
+                return f"{BLOG_MOBILE_BASE}/{blog_id}/{post_no}"
+            return None
+        return url
     
-    def extract_career_pros_cons_with_gpt(self, career_name, content):
-        """ChatGPT로 직업 장단점 추출"""
-        if not content or len(content) < 200 or not self.openai_client:
+    def is_host_available(self, url):
+        """포스트의 호스트가 차단되지 않았는지 확인"""
+        fetch_url = self.resolve_fetch_url(url)
+        return not fetch_url or self.breaker.is_available(host_of(fetch_url))
+    
+    def crawl_content(self, url, timeout=None):
+        """블로그 및 뉴스 본문 크롤링"""
+        fetch_url = self.resolve_fetch_url(url)
+        if not fetch_url:
             return None
         
-        content_preview = content[:2000]
+        host = host_of(fetch_url)
+        if not self.breaker.allow(host):
+            self.stats.inc(event='breaker_skipped')
+            return None
         
-        prompt = f"""다음은 "{career_name}" 직업에 대한 블로그 글입니다.
-
-[블로그 내용]
-{content_preview}
-
-위 내용에서 {career_name} 직업의 현실적인 장점과 단점을 추출해주세요.
-실제 경험에 기반한 구체적인 내용만 포함하세요.
-
-다음 형식으로 응답해주세요:
-
-장점:
-- (구체적인 장점 1)
-- (구체적인 장점 2)
-- (구체적인 장점 3)
-
-단점:
-- (구체적인 단점 1)
-- (구체적인 단점 2)
-- (구체적인 단점 3)
-
-만약 장단점 정보가 충분하지 않으면 "정보 부족"이라고 답해주세요."""
+        timeout = timeout or self.fetch_timeout
+        with span("page.fetch", url=fetch_url, host=host, timeout=round(timeout, 2)) as fetch_span:
+            try:
+                response = requests.get(fetch_url, headers={
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                }, timeout=timeout)
+            except requests.Timeout as e:
+                fetch_span.fail(e)
+                # 검색 마감 때문에 줄인 타임아웃으로 끊긴 요청은 호스트 장애로 보지 않음
+                if timeout < self.fetch_timeout:
+                    self.breaker.release(host)
+                else:
+                    self.breaker.record_failure(host)
+                print(f"크롤링 오류: {e}")
+                return None
+            except requests.RequestException as e:
+                fetch_span.fail(e)
+                self.breaker.record_failure(host)
+                print(f"크롤링 오류: {e}")
+                return None
+            fetch_span.set(status=response.status_code, bytes=len(response.content))
         
-        try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "당신은 직업 상담 전문가입니다. 각 직업의 현실적인 장단점을 객관적으로 분석합니다."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=500
-            )
-            
-            result = response.choices[0].message.content.strip()
-            
-            if result and "정보 부족" not in result:
-                pros = []
-                cons = []
-                
-                lines = result.split('\n')
-                current_section = None
-                
-                for line in lines:
-                    line = line.strip()
-                    if '장점:' in line or '장점 :' in line:
-                        current_section = 'pros'
-                    elif '단점:' in line or '단점 :' in line:
-                        current_section = 'cons'
-                    elif line.startswith('-') and current_section:
-                        point = line[1:].strip()
-                        if point and len(point) > 5:
-                            if current_section == 'pros':
-                                pros.append(point)
-                            else:
-                                cons.append(point)
-                
-                if pros or cons:
-                    self.stats['valid_pros_cons'] += 1
-                    return {
-                        'pros': pros[:5],
-                        'cons': cons[:5]
-                    }
-            
-            return None
-                
-        except Exception as e:
-            self.stats['api_errors'] += 1
-            print(f"GPT API 오류: {str(e)[:100]}")
+        # 스로틀링(429)과 서버 오류(5xx)는 호스트 장애로 간주
+        if response.status_code == 429 or response.status_code >= 500:
+            self.breaker.record_failure(host)
             return None
+        
+        self.breaker.record_success(host)
+        
+        with span("page.parse", url=fetch_url, bytes=len(response.content)):
+            try:
+                if response.status_code != 200:
+                    return None
+                return self.parse_content(url, response.content)
+            except Exception as e:
+                print(f"크롤링 오류: {e}")
+        return None
     
-    def extract_career_pros_cons_simple(self, career_name, content):
-        """키워드 기반 간단한 장단점 추출 (GPT API 없을 때 사용)"""
-        if not content or len(content) < 200:
-            return None
+    def parse_content(self, url, html):
+        """받은 페이지(또는 저장해 둔 HTML)에서 본문 추출 - 블로그는 본문 영역, 뉴스/일반 페이지는 기사 영역 (300자 이하면 None)"""
+        soup = BeautifulSoup(html, 'html.parser')
         
-        content_lower = content.lower()
+        # 네이버 블로그 처리
+        if "blog.naver.com" in url:
+            content = ""
+            for selector in ['div.se-main-container', 'div#postViewArea', 'div.post_ct']:
+                elem = soup.select_one(selector)
+                if elem:
+                    content = elem.get_text(separator='\n', strip=True)
+                    break
         
-        # 장점 관련 키워드
-        pros_keywords = [
-            '장점', '좋은점', '좋은 점', '메리트', '이점', '강점',
-            '좋다', '좋았다', '좋습니다', '만족', '추천',
-            '높은 연봉', '워라밸', '안정적', '성장', '발전',
-            '보람', '재미있', '흥미로', '유연한'
-        ]
+            if not content:
+                content = soup.get_text(separator='\n', strip=True)
         
-        # 단점 관련 키워드
-        cons_keywords = [
-            '단점', '나쁜점', '나쁜 점', '어려운점', '힘든점',
-            '어렵다', '힘들다', '스트레스', '야근', '박봉',
-            '불안정', '경쟁', '부담', '압박', '피곤',
-            '지루', '반복적', '단순'
-        ]
+        # 일반 웹페이지 및 뉴스 처리
+        else:
+            # 뉴스 기사 본문 추출 시도
+            content = ""
+            article_selectors = [
+                'article', 'div.article_body', 'div.news_body', 
+                'div.content', 'main', 'div#articleBody',
+                'div.article_content', 'div.news_content'
+            ]
+        
+            for selector in article_selectors:
+                elem = soup.select_one(selector)
+                if elem:
+                    content = elem.get_text(separator='\n', strip=True)
+                    break
         
-        pros = []
-        cons = []
+            if not content:
+                # 일반적인 텍스트 추출
+                content = soup.get_text(separator='\n', strip=True)
         
-        # 문장 단위로 분리
-        sentences = re.split(r'[.!?]\s*', content)
+        content = re.sub(r'\s+', ' ', content)
+        content = content.replace('\u200b', '')
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) < 10 or len(sentence) > 200:
-                continue
-            
-            sentence_lower = sentence.lower()
-            
-            # 장점 추출
-            for keyword in pros_keywords:
-                if keyword in sentence_lower and career_name.lower() in sentence_lower:
-                    if len(pros) < 5 and sentence not in pros:
-                        pros.append(sentence)
-                        break
-            
-            # 단점 추출
-            for keyword in cons_keywords:
-                if keyword in sentence_lower and career_name.lower() in sentence_lower:
-                    if len(cons) < 5 and sentence not in cons:
-                        cons.append(sentence)
-                        break
+        return content if len(content) > 300 else None
+    
+    def extract_career_pros_cons_with_gpt(self, career_name, content, timeout=None):
+        """ChatGPT로 직업 장단점 추출 (timeout 을 주면 그 안에 응답이 없을 때 재시도 없이 포기)"""
+        if not content or len(content) < 200 or not self.openai_client:
+            return None
         
-        if pros or cons:
-            return {
-                'pros': pros[:3],
-                'cons': cons[:3]
-            }
+        client = self.openai_client.with_options(timeout=timeout, max_retries=0) if timeout else self.openai_client
+        try:
+            pros_cons = extract_with_gpt(client, CAREER_SYSTEM_PROMPT, career_prompt(career_name, content))
+        except Exception as e:
+            self.stats.inc(event='api_errors')
+            print(f"GPT API 오류: {str(e)[:100]}")
+            return None
         
-        return None
+        if pros_cons:
+            self.stats.inc(event='valid_pros_cons')
+        return pros_cons
+    
+    def extract_career_pros_cons_simple(self, career_name, content):
+        """키워드 기반 간단한 장단점 추출 (GPT API 없을 때 사용)"""
+        return extract_career_simple(career_name, content)
     
     def deduplicate_points(self, points):
         """유사한 장단점 중복 제거"""
-        if not points:
-            return []
-        
-        unique_points = []
-        seen_keywords = set()
-        
-        for point in points:
-            keywords = set(word for word in point.split() if len(word) > 2)
-            
-            if len(keywords & seen_keywords) < len(keywords) * 0.5:
-                unique_points.append(point)
-                seen_keywords.update(keywords)
-            
-            if len(unique_points) >= 10:
-                break
-        
-        return unique_points
+        return deduplicate_points(points)
     
     def get_career_salary_info(self, career_name):
         """직업 연봉 정보 추출 (샘플)"""
@@ -1127,6 +1126,90 @@ def show_loading_animation():
     """, unsafe_allow_html=True)
     return loading_placeholder
 
+def show_server_stats():
+    """사용 통계 - 서버 전체(모든 세션) 크롤링/캐시/토큰 지표와 단계별 지연 시간"""
+    metrics = get_metrics()
+    crawler = get_crawler()
+    st.caption("서버 전체 (모든 세션)")
+    searches = metrics.counter("searches_total", "검색 수 (결과 출처별: cache, database, web)", ("source",))
+    total = searches.value()
+    if total:
+        reused = searches.value(source="cache") + searches.value(source="database")
+        st.metric("저장 결과 재사용", f"{reused / total * 100:.1f}%",
+                  help=f"캐시 {searches.value(source='cache')}회 / DB {searches.value(source='database')}회 / 웹 수집 {searches.value(source='web')}회")
+    if crawler:
+        col1, col2 = st.columns(2)
+        col1.metric("수집 페이지", f"{crawler.stats.value(event='total_crawled')}개")
+        col2.metric("유효 추출", f"{crawler.stats.value(event='valid_pros_cons')}개")
+        st.caption(f"API 오류 {crawler.stats.value(event='api_errors')}회 · 호스트 차단 {crawler.breaker.total_trips()}회 · 조기 종료 {crawler.stats.value(event='early_stops')}회")
+    tokens = metrics.llm_tokens.value()
+    if tokens:
+        st.metric("LLM 토큰", f"{tokens:,}", help=f"입력 {metrics.llm_tokens.value(kind='prompt'):,} / 출력 {metrics.llm_tokens.value(kind='completion'):,}")
+    for stage, entry in metrics.stage_summary().items():
+        errors = f" · 오류 {entry['errors']}회" if entry['errors'] else ""
+        st.caption(f"{STAGE_LABELS[stage]} {entry['count']}회 · p50 {entry['p50_ms']:.0f}ms · p99 {entry['p99_ms']:.0f}ms{errors}")
+
+def show_profile_result(summary):
+    """프로파일링 결과 - 자기 시간 상위 함수, 메모리 할당 상위 항목, speedscope 파일"""
+    st.caption(f"🔬 '{summary['name']}' {summary['duration']:.1f}초 · 표본 {summary['samples']}개 · 스레드 {len(summary['threads'])}개")
+    for label, seconds, ratio in summary['top_functions'][:5]:
+        st.caption(f"{ratio * 100:.0f}% · {seconds:.2f}초 · {label}")
+    if summary['top_allocations']:
+        with st.expander("메모리 할당 상위", expanded=False):
+            for row in summary['top_allocations'][:5]:
+                st.caption(f"{row['size_kb']:,.0f}KB · {row['location']}")
+    if os.path.exists(summary['speedscope']):
+        with open(summary['speedscope'], 'rb') as f:
+            st.download_button(
+                "📥 speedscope 파일", f.read(), file_name=os.path.basename(summary['speedscope']),
+                mime="application/json", key=f"profile_{summary['id']}"
+            )
+        st.link_button("🔥 speedscope 에서 열기", "https://www.speedscope.app/", help="받은 파일을 끌어다 놓으면 플레임그래프로 볼 수 있습니다")
+        st.caption(f"저장 위치: {os.path.dirname(summary['speedscope'])}")
+
+def show_trace_waterfall(spans):
+    """검색 1회의 구간별 소요 시간 표시 (폭포 차트 + 구간 이름별 합계 + Chrome 추적 파일)"""
+    rows = waterfall_rows(spans)
+    if not rows:
+        st.write("기록된 구간이 없습니다.")
+        return
+    
+    colors = {'search': '#667eea', 'node': '#764ba2', 'naver': '#03c75a', 'page': '#17a2b8', 'llm': '#fd7e14'}
+    labels = [f"{'  ' * row['depth']}{row['label']}" for row in rows]
+    fig = go.Figure(go.Bar(
+        y=list(range(len(rows))),
+        x=[row['duration_ms'] for row in rows],
+        base=[row['start_ms'] for row in rows],
+        orientation='h',
+        marker_color=['#dc3545' if row['error'] else colors.get(row['name'].split('.')[0], '#999999') for row in rows],
+        hovertext=[
+            f"{row['name']} {row['duration_ms']:.0f}ms ({row['thread']})<br>" + ', '.join(f"{k}={v}" for k, v in row['attrs'].items())
+            + (f"<br>오류: {row['error']}" if row['error'] else '')
+            for row in rows
+        ],
+        hoverinfo='text'
+    ))
+    fig.update_layout(
+        height=max(300, 20 * len(rows)),
+        margin=dict(l=0, r=0, t=10, b=0),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(title='ms', showgrid=True),
+        yaxis=dict(autorange='reversed', tickmode='array', tickvals=list(range(len(rows))), ticktext=labels)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    summary = pd.DataFrame(summarize(spans)).rename(columns={
+        'name': '구간', 'count': '횟수', 'total_ms': '합계(ms)', 'max_ms': '최대(ms)', 'errors': '오류'
+    })
+    st.dataframe(summary.round(1), hide_index=True, use_container_width=True)
+    st.download_button(
+        "📥 Chrome 추적 파일 (chrome://tracing, ui.perfetto.dev)",
+        json.dumps(to_chrome_trace(spans), ensure_ascii=False),
+        file_name="search-trace.json",
+        mime="application/json"
+    )
+
 def create_pros_cons_chart(pros_count, cons_count):
     """장단점 차트 생성"""
     fig = go.Figure(data=[
@@ -1168,47 +1251,16 @@ def create_pros_cons_chart(pros_count, cons_count):
 
 def extract_keywords(texts):
     """텍스트에서 핵심 키워드 추출"""
-    # 직업 관련 불용어
-    stopwords = {
-        '수', '있습니다', '있어요', '있음', '좋습니다', '좋아요', '좋음', 
-        '나쁩니다', '나빠요', '나쁨', '않습니다', '않아요', '않음',
-        '입니다', '이다', '되다', '하다', '있다', '없다', '같다',
-        '직업', '일', '업무', '근무', '회사', '직장', '분야',
-        '위해', '통해', '대해', '매우', '정말', '너무', '조금',
-        '그리고', '하지만', '그러나', '또한', '때문', '경우',
-        '제공합니다', '제공', '합니다', '해요', '드립니다', '드려요'
-    }
-    
-    # 모든 텍스트를 결합하고 키워드 추출
-    all_text = ' '.join(texts)
-    
-    # 한글만 추출
-    words = re.findall(r'[가-힣]+', all_text)
-    
-    # 필터링
-    filtered_words = []
-    for word in words:
-        if (len(word) >= 2 and 
-            word not in stopwords and
-            not word.endswith('습니다') and
-            not word.endswith('합니다')):
-            filtered_words.append(word)
-    
-    # 단어 빈도 계산
-    word_freq = Counter(filtered_words)
-    
-    # 빈도수가 1인 단어는 제외
-    word_freq = {word: freq for word, freq in word_freq.items() if freq > 1}
-    
-    return word_freq
+    # 불용어와 필터링 기준은 요약 저장소와 공유 (요약 행에 미리 계산한 빈도와 같은 결과)
+    return extract_point_keywords(texts, CAREER_STOPWORDS)
 
-def create_wordcloud(texts, title, color_scheme):
-    """워드클라우드 생성"""
+def create_wordcloud(texts, title, color_scheme, word_freq=None):
+    """워드클라우드 생성 (word_freq: 미리 계산된 키워드 빈도)"""
     if not texts:
         return None
     
     # 키워드 추출
-    word_freq = extract_keywords(texts)
+    word_freq = word_freq or extract_keywords(texts)
     
     if not word_freq:
         return None
@@ -1258,8 +1310,9 @@ def create_wordcloud(texts, title, color_scheme):
         st.warning(f"한글 폰트를 찾을 수 없습니다.")
         return None
 
-def display_wordclouds(pros, cons):
-    """장단점 워드클라우드 표시"""
+def display_wordclouds(pros, cons, keywords=None):
+    """장단점 워드클라우드 표시 (keywords: 요약 행에 미리 계산된 {'pros': 빈도, 'cons': 빈도})"""
+    keywords = keywords or {}
     col1, col2 = st.columns(2)
     
     with col1:
@@ -1272,7 +1325,7 @@ def display_wordclouds(pros, cons):
             </div>
             """, unsafe_allow_html=True)
             
-            pros_wordcloud = create_wordcloud(pros, "", "Greens")
+            pros_wordcloud = create_wordcloud(pros, "", "Greens", word_freq=keywords.get('pros'))
             if pros_wordcloud:
                 st.image(pros_wordcloud, use_container_width=True)
     
@@ -1286,7 +1339,7 @@ def display_wordclouds(pros, cons):
             </div>
             """, unsafe_allow_html=True)
             
-            cons_wordcloud = create_wordcloud(cons, "", "Reds")
+            cons_wordcloud = create_wordcloud(cons, "", "Reds", word_freq=keywords.get('cons'))
             if cons_wordcloud:
                 st.image(cons_wordcloud, use_container_width=True)
 
@@ -1395,11 +1448,113 @@ def create_career_path_timeline(career_path):
 # 클라이언트 초기화
 @st.cache_resource
 def get_supabase_client():
-    return create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+    # Supabase 클라이언트 또는 같은 방식으로 쓰는 로컬 SQLite 저장소
+    return create_storage(STORAGE_BACKEND, SUPABASE_URL, SUPABASE_KEY, LOCAL_DB_PATH)
 
 @st.cache_resource
 def get_crawler():
-    return CareerInfoCrawler(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET) if NAVER_CLIENT_ID and NAVER_CLIENT_SECRET else None
+    return CareerInfoCrawler(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, metrics=get_metrics()) if NAVER_CLIENT_ID and NAVER_CLIENT_SECRET else None
+
+@st.cache_resource
+def get_freshness_policy():
+    return FreshnessPolicy(ttl_seconds=ANALYSIS_TTL_DAYS * 86400)
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(max_entries=RESULT_CACHE_SIZE, ttl_seconds=RESULT_CACHE_TTL)
+
+@st.cache_resource
+def get_write_behind():
+    supabase = get_supabase_client()
+    cache = get_result_cache()
+    checkpoint = get_crawl_checkpoint()
+    return WriteBehindQueue(
+        lambda batch: persist_batch(supabase, batch),
+        # 저장이 끝나야 캐시와 체크포인트를 정리 (저장에 실패하면 체크포인트가 남아 다음 검색이 이어받음)
+        on_written=lambda item: analysis_written(item, cache, checkpoint),
+        on_failed=lambda item: print(f"'{item['name']}' 분석 저장 실패 - 체크포인트를 남겨 다음 검색에서 다시 저장")
+    )
+
+@st.cache_resource
+def get_crawl_archive():
+    return CrawlArchive(CRAWL_ARCHIVE_DIR) if CRAWL_ARCHIVE_ENABLED else None
+
+@st.cache_resource
+def get_crawl_checkpoint():
+    return CrawlCheckpoint(CRAWL_CHECKPOINT_PATH) if CRAWL_CHECKPOINT_ENABLED else None
+
+@st.cache_resource
+def get_trace_exporter():
+    return JsonlExporter(TRACE_PATH) if TRACE_EXPORT_ENABLED else None
+
+@st.cache_resource
+def get_profile_store():
+    return ProfileStore(PROFILE_DIR)
+
+@st.cache_resource
+def get_metrics():
+    metrics = MetricsRegistry()
+    # 단계별 소요 시간과 LLM 토큰 수는 끝난 구간에서 받음 (검색 API, 페이지 요청, 본문 해석, LLM, DB 읽기/쓰기)
+    add_listener(metrics.observe_span)
+    metrics.counter("searches_total", "검색 수 (결과 출처별: cache, database, web)", ("source",))
+    cache = get_result_cache()
+    metrics.callback(
+        "result_cache_requests_total", "조회 캐시 요청 수",
+        lambda: {('hit',): cache.hits, ('miss',): cache.misses}, kind="counter", labelnames=("result",)
+    )
+    metrics.callback("result_cache_hit_ratio", "조회 캐시 적중률", cache.hit_ratio)
+    if WRITE_BEHIND_ENABLED:
+        queue = get_write_behind()
+        metrics.callback("write_behind_depth", "저장 대기열 길이", lambda: queue.snapshot()['depth'])
+    if METRICS_PORT:
+        try:
+            metrics.serve(METRICS_PORT)
+        except OSError as e:
+            print(f"지표 서버 시작 실패 (포트 {METRICS_PORT}): {e}")
+    return metrics
+
+def count_search(source):
+    """검색 결과 출처별 횟수 (cache / database / web)"""
+    get_metrics().counter("searches_total", "검색 수 (결과 출처별: cache, database, web)", ("source",)).inc(source=source)
+
+@st.cache_resource
+def get_point_index():
+    return PointIndex()
+
+def analysis_table():
+    """현재 저장 방식의 직업 분석 테이블"""
+    return 'career_analysis' if ANALYSIS_STORAGE == STORAGE_SUMMARY else 'career_pros_cons'
+
+def analysis_written(item, cache, checkpoint):
+    """저장이 끝난 분석 결과 후처리 - 다음 조회가 저장된 결과를 읽도록 캐시를 비우고 더 이어받을 필요 없는 체크포인트 삭제"""
+    cache.invalidate(normalize_key(item['name']))
+    if checkpoint and item.get('search_id'):
+        checkpoint.clear(item['search_id'])
+
+def persist_analysis(supabase, item):
+    """분석 결과 저장 - 지연 저장이 켜져 있으면 대기열에 넘기고 바로 반환 (여러 프로세스 잠금을 쓰면 바로 저장, 저장 완료 여부 반환)"""
+    key = normalize_key(item['name'])
+    # 장단점 검색 색인에는 저장을 기다리지 않고 바로 반영
+    index_item(get_point_index(), item)
+    # 여러 프로세스가 잠금 파일을 나눠 쓰면 잠금이 풀리기 전에 DB에 있어야 다음 프로세스가 다시 수집하지 않음 - 바로 저장
+    if WRITE_BEHIND_ENABLED and not SINGLE_FLIGHT_LOCK_DIR:
+        get_write_behind().enqueue((item['table'], key), item)
+        # 대기 중인 결과가 다음 조회에 보이도록 캐시 비움
+        get_result_cache().invalidate(key)
+        return False
+    failed = persist_batch(supabase, [item])
+    if failed:
+        raise failed[0][1]
+    analysis_written(item, get_result_cache(), get_crawl_checkpoint())
+    return True
+
+@st.cache_resource
+def get_query_planner():
+    return QueryPlanner(
+        CAREER_SEARCH_TEMPLATES,
+        history_path=os.path.join(CACHE_DIR, "query_yield_career.json"),
+        page_size=SEARCH_PAGE_SIZE
+    )
 
 def search_database(state: CareerState) -> CareerState:
     """데이터베이스에서 직업 정보 검색"""
@@ -1413,24 +1568,73 @@ def search_database(state: CareerState) -> CareerState:
         state["results"] = {"data": None}
         return state
     
+    if state.get("refresh"):
+        state["messages"].append(
+            HumanMessage(content=f"♻️ 저장된 '{career_name}' 분석이 오래되어 다시 수집합니다...")
+        )
+        state["results"] = {"data": None}
+        return state
+    
     state["messages"].append(
         HumanMessage(content=f"📊 데이터베이스에서 '{career_name}' 검색 중...")
     )
     
     try:
-        # 정확한 매칭 시도
-        exact_match = supabase.table('career_pros_cons').select("*").eq('career_name', career_name).execute()
-        if exact_match.data:
+        def load_rows(name):
+            # 아직 저장 대기 중인 결과가 있으면 그 결과 사용 (방금 수집한 결과가 DB보다 최신)
+            pending = get_write_behind().pending((analysis_table(), normalize_key(name))) if WRITE_BEHIND_ENABLED else None
+            if pending:
+                return pending['rows']
+            with span("db.read", table=analysis_table(), key=name):
+                if ANALYSIS_STORAGE == STORAGE_SUMMARY:
+                    # 직업 1개당 1행 - 한 행만 읽으면 바로 표시 가능
+                    return fetch_summary(supabase, 'career_analysis', 'career_name', name)
+                # 정확한 매칭 시도
+                exact_match = supabase.table('career_pros_cons').select("*").eq('career_name', name).execute()
+                # 가장 최신 버전의 행만 사용 (재수집 결과로 교체되는 중에도 온전한 결과만 보임)
+                return latest_version(exact_match.data) if exact_match.data else []
+        
+        # 같은 검색어는 메모리 캐시에서 바로 반환 (새 결과가 저장되면 merge_branches에서 무효화)
+        rows, cache_hit = get_result_cache().get_or_load(normalize_key(career_name), lambda: load_rows(career_name))
+        if not rows:
+            # 띄어쓰기/대소문자만 다른 이름으로 저장된 분석이 있으면 사용 (로컬 저장소의 이름 전문 검색)
+            stored_name = find_stored_name(supabase, analysis_table(), career_name)
+            if stored_name and stored_name != career_name:
+                rows, cache_hit = get_result_cache().get_or_load(normalize_key(stored_name), lambda: load_rows(stored_name))
+                if rows:
+                    state["messages"].append(
+                        AIMessage(content=f"🔎 '{career_name}'와(과) 같은 항목으로 저장된 '{stored_name}' 분석을 사용합니다")
+                    )
+                    career_name = state["career_name"] = stored_name
+        if rows:
             state["search_method"] = "database"
-            state["results"] = {"data": exact_match.data}
+            state["results"] = {"data": rows}
+            source = "캐시" if cache_hit else "데이터베이스"
+            count_search("cache" if cache_hit else "database")
             state["messages"].append(
-                AIMessage(content=f"✅ 데이터베이스에서 '{career_name}' 정보를 찾았습니다! ({len(exact_match.data)}개 항목)")
+                AIMessage(content=f"✅ {source}에서 '{career_name}' 정보를 찾았습니다! ({len(rows)}개 항목)")
             )
+            emit(EVENT_CACHE_HIT, f"✅ {source}에서 '{career_name}' 정보를 찾았습니다!", source=source, name=career_name, rows=len(rows))
+            
+            # 유효 기간이 지났으면 저장된 결과는 그대로 보여주고 백그라운드에서 다시 수집
+            policy = get_freshness_policy()
+            refresh_key = f"refresh:{normalize_key(career_name)}"
+            if policy.is_stale(rows) and policy.should_revalidate(refresh_key):
+                get_single_flight().submit(refresh_key, run_career_search, career_name, refresh=True, name=f"{career_name} 재수집")
+                age_days = policy.age_seconds(rows) / 86400
+                state["messages"].append(
+                    AIMessage(content=f"♻️ 저장된 분석이 {age_days:.0f}일 지나 백그라운드에서 최신 리뷰를 다시 수집합니다")
+                )
             return state
         
         state["messages"].append(
             AIMessage(content=f"❌ 데이터베이스에서 '{career_name}'을(를) 찾을 수 없습니다. 웹에서 검색합니다...")
         )
+        suggestions = similar_names(supabase, analysis_table(), career_name)
+        if suggestions:
+            state["messages"].append(
+                AIMessage(content=f"💡 비슷한 저장 항목: {', '.join(suggestions)}")
+            )
         state["results"] = {"data": None}
         return state
         
@@ -1442,13 +1646,15 @@ def search_database(state: CareerState) -> CareerState:
         state["results"] = {"data": None}
         return state
 
-def crawl_web(state: CareerState) -> CareerState:
-    """웹에서 직업 정보 크롤링"""
+def plan_crawl(state: CareerState) -> CareerState:
+    """웹 수집 계획 - 블로그/뉴스 검색 결과를 가치 순으로 골라 출처별 수집 가지로 나눔"""
+    state["crawl_plan"] = {}
     if state["results"].get("data"):  # 이미 DB에서 찾은 경우
         return state
     
     career_name = state["career_name"]
     state["search_method"] = "web_crawling"
+    count_search("web")
     crawler = get_crawler()
     
     if not crawler:
@@ -1491,70 +1697,280 @@ def crawl_web(state: CareerState) -> CareerState:
         )
         return state
     
-    # 실제 크롤링 로직
-    all_pros = []
-    all_cons = []
-    sources = []
-    
-    # 직업 정보 검색
-    search_results = crawler.search_career_info(career_name)
-    
-    if search_results:
+    # 직업 정보 검색 - 모든 검색어의 결과를 하나의 우선순위 큐로 병합
+    frontier = CrawlFrontier()
+    planner = get_query_planner()
+    plan = planner.plan(career_name)
+    # 수집은 합치기/저장에 쓸 시간을 남겨 두고 끝냄
+    crawl_deadline = state["deadline"] - DEADLINE_RESERVE
+    cut_short = False
+    
+    # 중단된 같은 검색의 체크포인트가 있으면 처리를 마친 포스트는 다시 요청/추출하지 않고 결과를 이어받음
+    checkpoint = get_crawl_checkpoint()
+    resumed = checkpoint.load(state["search_id"]) if checkpoint else []
+    done_links = {record['link'] for record in resumed}
+    if resumed:
+        resumed_pros = [point for record in resumed for point in record['pros']]
+        resumed_cons = [point for record in resumed for point in record['cons']]
+        message = f"♻️ 중단된 검색에서 처리를 마친 포스트 {len(resumed)}개를 이어받습니다 (장점 {len(resumed_pros)}개, 단점 {len(resumed_cons)}개)"
+        state["messages"].append(AIMessage(content=message))
+        emit(EVENT_POINTS, message, pros=resumed_pros, cons=resumed_cons)
+    
+    def fetch_next_page():
+        """다음 검색 페이지를 조회해 프런티어에 추가 (더 조회할 페이지가 없거나 시간이 다 됐으면 False)"""
+        nonlocal cut_short
+        if not time_left(crawl_deadline):
+            cut_short = True
+            return False
+        request = plan.next_request()
+        if not request:
+            return False
+        
+        posts = crawler.search_naver(request['source_type'], request['query'], display=request['display'], start=request['start'],
+                                     timeout=request_timeout(crawl_deadline, crawler.fetch_timeout))
+        plan.record_page(request, posts)
+        for post in posts:
+            frontier.add(post, rank=post['rank'], query=post['query'], source_type=post['search_type'])
+        
         state["messages"].append(
-            AIMessage(content=f"→ {len(search_results)}개 포스트/기사 발견 (블로그 + 뉴스)")
+            AIMessage(content=f"🔍 [{request['source_type']}] '{request['query']}' ({request['start']}위부터) → {len(posts)}개 발견")
         )
+        emit(EVENT_QUERY, f"🔍 [{request['source_type']}] '{request['query']}' → {len(posts)}개 발견",
+             query=request['query'], source_type=request['source_type'], start=request['start'], found=len(posts))
+        time.sleep(0.1)  # API 호출 제한을 위한 짧은 대기
+        return True
+    
+    for _ in range(SEARCH_INITIAL_PAGES):
+        if not fetch_next_page():
+            break
+    
+    # 가지에 나눠 줄 후보를 가치 순으로 선택 (본문이 없는 포스트가 있어 페이지 요청 예산의 두 배까지)
+    candidates = []
+    while len(candidates) < CRAWL_FETCH_BUDGET * 2 and not is_cancelled():
+        # 후보가 떨어졌을 때만 다음 페이지 조회
+        if not len(frontier):
+            if not fetch_next_page():
+                break
+            continue
         
-        # 각 포스트 처리 (최대 15개까지 처리)
-        processed_count = 0
-        for idx, post in enumerate(search_results[:15]):
+        post = frontier.pop()
+        
+        # 이전 시도에서 처리를 마친 포스트
+        if canonical_link(post['link']) in done_links:
+            continue
+        
+        # 차단된 호스트(뉴스 사이트 등)의 포스트는 뒤로 미룸 (한 번만)
+        if not crawler.is_host_available(post['link']):
+            if not frontier.defer(post):
+                crawler.stats.inc(event='breaker_skipped')
+            continue
+        candidates.append(post)
+    
+    # 가치 높은 포스트부터 예산 안에서 처리 (모든 가지가 예산과 조기 종료 기준을 공유)
+    budget = CrawlBudget(
+        max_seconds=min(CRAWL_TIME_BUDGET, time_left(crawl_deadline)),
+        max_llm_calls=CRAWL_LLM_BUDGET,
+        max_fetches=CRAWL_FETCH_BUDGET
+    )
+    # 장점/단점이 각각 20개 이상 모이면 충분한 것으로 보고 중단
+    session = CrawlSession(budget, NoveltyTracker(window=3, min_novelty=1.0, min_posts=4), enough_points=20)
+    for record in resumed:
+        session.observe(record['pros'], record['cons'])
+    branches = partition(candidates, CRAWL_BRANCHES)
+    state["crawl_plan"] = {
+        'branches': branches,
+        'session': session,
+        'plan': plan,
+        'candidates': len(candidates),
+        'frontier_left': len(frontier),
+        'deadline': crawl_deadline,
+        'cut_short': cut_short,
+        'search_id': state["search_id"],
+        # 이어받은 포스트의 결과 (합치기 노드에서 새로 수집한 결과와 후보 순위 순으로 합침)
+        'resumed': [
+            {'rank': record['rank'], 'pros': record['pros'], 'cons': record['cons'], 'source': record['source']}
+            for record in resumed if record['pros'] or record['cons']
+        ]
+    }
+    
+    if candidates:
+        state["messages"].append(
+            AIMessage(content=f"→ {len(candidates)}개 포스트/기사 선택 (블로그 + 뉴스), 가지 {len(branches)}개로 나눠 동시에 분석합니다")
+        )
+    return state
+
+def dispatch_branches(state: CareerState):
+    """수집 가지 띄우기 (가지마다 Send 하나, 가지가 없으면 바로 합치기)"""
+    branches = (state.get("crawl_plan") or {}).get("branches")
+    if not branches:
+        return "merge_branches"
+    return [
+        Send("crawl_branch", {"career_name": state["career_name"], "crawl_plan": state["crawl_plan"], "branch": branch})
+        for branch in branches
+    ]
+
+def crawl_branch(branch_state):
+    """수집 가지 - 배정된 후보를 순서대로 페이지 요청 → 장단점 추출 (오류가 나도 다른 가지는 계속)"""
+    career_name = branch_state["career_name"]
+    branch = branch_state["branch"]
+    session = branch_state["crawl_plan"]["session"]
+    deadline = branch_state["crawl_plan"]["deadline"]
+    search_id = branch_state["crawl_plan"]["search_id"]
+    crawler = get_crawler()
+    archive = get_crawl_archive()
+    checkpoint = get_crawl_checkpoint()
+    planner = get_query_planner()
+    
+    result = {'id': branch['id'], 'source_type': branch['source_type'], 'posts': [], 'error': ''}
+    messages = []
+    try:
+        for post in branch['posts']:
+            # 취소, 예산 소진, 조기 종료면 중단
+            if is_cancelled() or not session.take_fetch():
+                break
+            
             search_type = post.get('search_type', 'blog')
-            state["messages"].append(
+            messages.append(
                 AIMessage(content=f"📖 [{search_type}] 분석 중: {post['title'][:40]}...")
             )
             
             # 크롤링
-            content = crawler.crawl_content(post['link'])
+            content = crawler.crawl_content(post['link'], timeout=request_timeout(deadline, crawler.fetch_timeout))
             if not content:
                 continue
+            emit(EVENT_FETCH, f"📖 [{search_type}] 분석 중: {post['title'][:40]}...",
+                 title=post['title'], link=post['link'], source_type=search_type)
             
-            crawler.stats['total_crawled'] += 1
-            processed_count += 1
+            crawler.stats.inc(event='total_crawled')
+            
+            # 원문 보관 (다시 분석할 때 재크롤링하지 않도록)
+            if archive:
+                archive.append(canonical_link(post['link']), content, 'career', career_name,
+                               query=post.get('query', ''), source_type=search_type, title=post['title'])
             
             # 장단점 추출
             if OPENAI_API_KEY:
                 # GPT API를 사용한 추출
-                pros_cons = crawler.extract_career_pros_cons_with_gpt(career_name, content)
+                if not session.take_llm():
+                    break
+                pros_cons = crawler.extract_career_pros_cons_with_gpt(career_name, content, timeout=request_timeout(deadline, crawler.llm_timeout))
             else:
                 # 키워드 기반 간단한 추출
                 pros_cons = crawler.extract_career_pros_cons_simple(career_name, content)
+            planner.record_result(post.get('template'), useful=bool(pros_cons))
+            source = {
+                'title': post['title'],
+                'link': post['link'],
+                'date': post.get('postdate', ''),
+                'type': search_type
+            }
+            
+            # 처리를 마친 포스트 기록 (검색이 중단돼도 다시 검색하면 이어받음)
+            if checkpoint:
+                checkpoint.record(search_id, post, pros_cons, source=source)
             
             if pros_cons:
-                all_pros.extend(pros_cons['pros'])
-                all_cons.extend(pros_cons['cons'])
-                sources.append({
-                    'title': post['title'],
-                    'link': post['link'],
-                    'date': post.get('postdate', ''),
-                    'type': search_type
+                result['posts'].append({
+                    'rank': post['rank'],
+                    'pros': pros_cons['pros'],
+                    'cons': pros_cons['cons'],
+                    'source': source
                 })
                 
-                state["messages"].append(
+                messages.append(
                     AIMessage(content=f"✓ 장점 {len(pros_cons['pros'])}개, 단점 {len(pros_cons['cons'])}개 추출")
                 )
+                emit(EVENT_POINTS, f"✓ [{search_type}] 장점 {len(pros_cons['pros'])}개, 단점 {len(pros_cons['cons'])}개 추출",
+                     pros=pros_cons['pros'], cons=pros_cons['cons'], title=post['title'])
             
-            # API 호출 제한을 위한 대기
-            time.sleep(0.3)
+            # 최근 포스트들이 새로운 장단점을 거의 더하지 못하거나 충분히 모이면 모든 가지 조기 종료
+            session.observe(pros_cons['pros'] if pros_cons else [], pros_cons['cons'] if pros_cons else [])
             
-            # 충분한 데이터를 수집했으면 중단
-            if len(all_pros) >= 20 and len(all_cons) >= 20:
-                break
+            # API 호출 제한을 위한 대기 (마감을 넘기지 않도록)
+            time.sleep(min(0.3, time_left(deadline)))
+    except Exception as e:
+        result['error'] = str(e)
+        messages.append(
+            AIMessage(content=f"⚠️ 수집 가지 {branch['id'] + 1} 오류: {str(e)[:100]}")
+        )
+    
+    return {"branch_results": [result], "messages": messages}
+
+def merge_branches(state: CareerState) -> CareerState:
+    """가지 결과 합치기 - 후보 순위대로 모아 중복 제거 후 저장"""
+    crawl_plan = state.get("crawl_plan") or {}
+    if not crawl_plan.get("session"):  # DB에서 찾았거나 샘플 데이터
+        return state
+    
+    career_name = state["career_name"]
+    crawler = get_crawler()
+    archive = get_crawl_archive()
+    planner = get_query_planner()
+    session = crawl_plan['session']
+    budget = session.budget
+    plan = crawl_plan['plan']
+    
+    # 이어받은 포스트도 한 가지의 결과처럼 함께 합쳐 후보 순위 순서를 유지
+    posts, failed = merge_branch_results([{'posts': crawl_plan['resumed']}] + state["branch_results"])
+    if crawl_plan['candidates']:
+        if is_cancelled():
+            state["messages"].append(
+                AIMessage(content="⏹️ 사용자가 검색을 취소했습니다")
+            )
+        if failed:
+            state["messages"].append(
+                AIMessage(content=f"⚠️ 수집 가지 {len(failed)}개가 중간에 실패해 오류 전까지 수집한 결과만 합칩니다")
+            )
+        
+        remaining = crawl_plan['candidates'] - session.attempted + crawl_plan['frontier_left']
+        if session.converged:
+            posts_saved, llm_calls_saved = estimate_savings(remaining, budget, uses_llm=bool(OPENAI_API_KEY))
+            convergence = session.novelty.summary(posts_saved=posts_saved, llm_calls_saved=llm_calls_saved)
+            crawler.stats.inc(event='early_stops')
+            crawler.stats.inc(posts_saved, event='posts_saved')
+            crawler.stats.inc(llm_calls_saved, event='llm_calls_saved')
+            state["messages"].append(
+                AIMessage(content=f"🛑 신규 장단점이 수렴하여 조기 종료: 최근 포스트당 평균 {convergence['marginal_novelty']}개, "
+                                  f"포스트 {posts_saved}개 / LLM 호출 {llm_calls_saved}회 절약, "
+                                  f"최근 {session.novelty.window}개 포스트 기여율 {convergence['window_change'] * 100:.0f}%")
+            )
+        
+        exhausted = budget.exhausted()
+        if crawl_plan['cut_short'] or (exhausted == "시간" and remaining):
+            # 검색 마감으로 후보를 다 보지 못함 - 지금까지 수집한 결과를 부분 결과로 반환
+            state["results"]["partial"] = True
+            state["messages"].append(
+                AIMessage(content=f"⏱️ 검색 제한 시간이 되어 지금까지 수집한 결과로 마칩니다 (부분 결과, 남은 후보 {remaining}개)")
+            )
+        elif exhausted and remaining:
+            state["messages"].append(
+                AIMessage(content=f"⏱️ {exhausted} 예산 소진으로 수집 종료 (남은 후보 {remaining}개)")
+            )
+        state["messages"].append(
+            AIMessage(content=f"📈 검색 API {plan.pages_fetched}회(결과 {plan.items_fetched}개), 페이지 요청 {budget.fetches}회, LLM 호출 {budget.llm_calls}회, {budget.elapsed():.1f}초 소요")
+        )
+        planner.save()
+        if archive:
+            archive.flush()
+        
+        if crawler.breaker.total_trips():
+            state["messages"].append(
+                AIMessage(content=f"⏸️ 응답 지연 호스트 차단 {crawler.breaker.total_trips()}회, 건너뛴 요청 {crawler.stats.value(event='breaker_skipped')}개")
+            )
+    elif crawl_plan['cut_short']:
+        state["results"]["partial"] = True
+        state["messages"].append(
+            AIMessage(content="⏱️ 검색 제한 시간 안에 분석할 포스트를 고르지 못했습니다 (부분 결과)")
+        )
     
-    # 중복 제거 및 정리
-    unique_pros = crawler.deduplicate_points(all_pros)
-    unique_cons = crawler.deduplicate_points(all_cons)
+    # 중복 제거 및 정리 (가지가 끝난 순서와 상관없이 가치 높은 포스트의 장단점이 앞에 오도록)
+    unique_pros = crawler.deduplicate_points([point for post in posts for point in post['pros']])
+    unique_cons = crawler.deduplicate_points([point for post in posts for point in post['cons']])
+    sources = [post['source'] for post in posts]
     
     # 크롤링 결과가 없거나 부족한 경우 기본 데이터 사용
-    if not unique_pros and not unique_cons:
+    fallback_used = not unique_pros and not unique_cons
+    if fallback_used:
         state["messages"].append(
             AIMessage(content="⚠️ 웹에서 충분한 정보를 찾지 못했습니다. 기본 정보를 제공합니다.")
         )
@@ -1586,38 +2002,44 @@ def crawl_web(state: CareerState) -> CareerState:
             AIMessage(content=f"🎉 웹 크롤링 완료! 총 장점 {len(state['pros'])}개, 단점 {len(state['cons'])}개 수집")
         )
         
-        # DB에 저장
+        # DB에 저장 (취소된 검색의 부분 결과는 저장하지 않음)
         try:
             supabase = get_supabase_client()
-            if supabase:
-                # 기존 데이터 삭제 (중복 방지)
-                try:
-                    supabase.table('career_pros_cons').delete().eq('career_name', career_name).execute()
-                except:
-                    pass
-                
-                data = []
-                
-                for pro in state["pros"]:
-                    data.append({
-                        'career_name': career_name,
-                        'type': 'pro',
-                        'content': pro
-                    })
-                
-                for con in state["cons"]:
-                    data.append({
-                        'career_name': career_name,
-                        'type': 'con',
-                        'content': con
-                    })
-                
-                if data:
-                    supabase.table('career_pros_cons').insert(data).execute()
-                    state["messages"].append(
-                        AIMessage(content="💾 데이터베이스에 저장 완료! 다음 검색 시 더 빠른 결과를 제공합니다.")
+            # 재수집에서 기본 데이터로 대체된 결과는 기존 분석을 덮어쓰지 않음
+            can_save = supabase and not is_cancelled() and not (fallback_used and state.get("refresh"))
+            if can_save and state["results"].get("partial"):
+                # 마감으로 잘린 결과를 저장하면 신선도 기간 내내 전체 분석처럼 제공됨 - 저장하지 않고 다음 검색이 체크포인트에서 이어서 수집
+                state["messages"].append(
+                    AIMessage(content="📝 부분 결과라 저장하지 않았습니다. 다음 검색에서 이어서 수집합니다.")
+                )
+            elif can_save:
+                item = None
+                if ANALYSIS_STORAGE == STORAGE_SUMMARY:
+                    # 직업 1개당 1행 (키워드 빈도, 연봉, 경력 경로를 함께 저장)
+                    summary = build_career_summary(
+                        career_name, state["pros"], state["cons"], state["sources"],
+                        salary_info=state["salary_info"], career_path=state["career_path"]
                     )
-                    st.session_state.saved_careers += 1
+                    state["analysis"] = {'keywords': summary['keywords']}
+                    item = {'mode': 'summary', 'table': 'career_analysis', 'key_column': 'career_name', 'name': career_name, 'rows': [summary]}
+                elif state["pros"] or state["cons"]:
+                    # 새 버전 저장과 이전 버전 삭제를 저장 프로시저 한 번의 호출로 처리 (원자적 교체)
+                    rows = point_rows('career_name', career_name, state["pros"], state["cons"])
+                    item = {'mode': 'points', 'table': 'career_pros_cons', 'key_column': 'career_name', 'name': career_name, 'rows': rows}
+                
+                if item:
+                    # 저장이 끝난 뒤 이 검색의 체크포인트를 지우도록 함께 넘김
+                    item['search_id'] = crawl_plan['search_id']
+                    # 지연 저장이 켜져 있으면 대기열에 넘기고 결과는 바로 표시
+                    if persist_analysis(supabase, item):
+                        state["messages"].append(
+                            AIMessage(content="💾 데이터베이스에 저장 완료! 다음 검색 시 더 빠른 결과를 제공합니다.")
+                        )
+                    else:
+                        state["messages"].append(
+                            AIMessage(content="💾 분석 결과를 저장 대기열에 넣었습니다 (백그라운드에서 저장)")
+                        )
+                    state["results"]["saved"] = True
         except Exception as e:
             state["messages"].append(
                 AIMessage(content=f"⚠️ DB 저장 실패: {str(e)}")
@@ -1634,19 +2056,31 @@ def process_results(state: CareerState) -> CareerState:
     if state["search_method"] == "database" and state["results"].get("data"):
         # DB 결과 처리
         data = state["results"]["data"]
-        state["pros"] = [item['content'] for item in data if item['type'] == 'pro']
-        state["cons"] = [item['content'] for item in data if item['type'] == 'con']
-        state["sources"] = []
+        if ANALYSIS_STORAGE == STORAGE_SUMMARY:
+            # 요약 행에 장단점, 키워드 빈도, 연봉, 경력 경로가 모두 들어 있어 다시 계산할 필요 없음
+            row = data[0]
+            state["pros"] = row.get('pros') or []
+            state["cons"] = row.get('cons') or []
+            state["sources"] = row.get('sources') or []
+            state["salary_info"] = row.get('salary_info') or {}
+            state["career_path"] = row.get('career_path') or []
+            state["analysis"] = {'keywords': row.get('keywords') or {}}
+        else:
+            state["pros"] = [item['content'] for item in data if item['type'] == 'pro']
+            state["cons"] = [item['content'] for item in data if item['type'] == 'con']
+            state["sources"] = []
         
-        # 연봉 정보와 경력 경로는 크롤러를 통해 가져옴
+        # 연봉 정보와 경력 경로가 저장되어 있지 않으면 크롤러를 통해 가져옴
         crawler = get_crawler()
-        if crawler:
+        if crawler and not (state["salary_info"] and state["career_path"]):
             state["salary_info"] = crawler.get_career_salary_info(state["career_name"])
             state["career_path"] = crawler.get_career_path(state["career_name"])
         
         state["messages"].append(
             AIMessage(content=f"📋 결과 정리 완료: 장점 {len(state['pros'])}개, 단점 {len(state['cons'])}개")
         )
+        emit(EVENT_POINTS, f"📋 저장된 분석: 장점 {len(state['pros'])}개, 단점 {len(state['cons'])}개",
+             pros=state["pros"], cons=state["cons"])
     
     return state
 
@@ -1665,22 +2099,26 @@ def should_search_web(state: CareerState) -> str:
 def create_career_workflow():
     workflow = StateGraph(CareerState)
     
-    # 노드 추가
-    workflow.add_node("search_db", search_database)
-    workflow.add_node("crawl_web", crawl_web)
-    workflow.add_node("process", process_results)
+    # 노드 추가 (상태를 고쳐 반환하는 노드는 바뀐 값만 반환하도록 감싸고, 노드마다 구간 기록)
+    workflow.add_node("search_db", traced("node.search_db", as_update(search_database, CareerState)))
+    workflow.add_node("plan_crawl", traced("node.plan_crawl", as_update(plan_crawl, CareerState)))
+    workflow.add_node("crawl_branch", traced("node.crawl_branch", crawl_branch))
+    workflow.add_node("merge_branches", traced("node.merge_branches", as_update(merge_branches, CareerState)))
+    workflow.add_node("process", traced("node.process", as_update(process_results, CareerState)))
     
-    # 엣지 설정
+    # 엣지 설정: 계획 → 가지별 수집(동시 실행) → 합치기
     workflow.set_entry_point("search_db")
     workflow.add_conditional_edges(
         "search_db",
         should_search_web,
         {
-            "crawl": "crawl_web",
+            "crawl": "plan_crawl",
             "process": "process"
         }
     )
-    workflow.add_edge("crawl_web", "process")
+    workflow.add_conditional_edges("plan_crawl", dispatch_branches, ["crawl_branch", "merge_branches"])
+    workflow.add_edge("crawl_branch", "merge_branches")
+    workflow.add_edge("merge_branches", "process")
     workflow.add_edge("process", END)
     
     return workflow.compile()
@@ -1688,10 +2126,119 @@ def create_career_workflow():
 # 워크플로우 인스턴스 생성
 career_app = create_career_workflow()
 
+# ========================
+# 백그라운드 검색 작업
+# ========================
+
+@st.cache_resource
+def get_job_runner():
+    return JobRunner(max_workers=4)
+
+@st.cache_resource
+def get_single_flight():
+    # 같은 검색어의 동시 검색은 하나의 작업으로 합침
+    lock_backend = FileLockBackend(SINGLE_FLIGHT_LOCK_DIR) if SINGLE_FLIGHT_LOCK_DIR else ThreadLockBackend()
+    return SingleFlight(get_job_runner(), lock_backend=lock_backend)
+
+def initial_career_state(search_term, refresh=False):
+    """워크플로우 초기 상태 (마감 시각은 지금부터 SEARCH_DEADLINE 초, 재수집은 CRAWL_TIME_BUDGET 초)"""
+    return {
+        "career_name": search_term,
+        "search_method": "",
+        "results": {},
+        "pros": [],
+        "cons": [],
+        "sources": [],
+        "salary_info": {},
+        "career_path": [],
+        "messages": [],
+        "error": "",
+        "refresh": refresh,
+        "analysis": {},
+        "crawl_plan": {},
+        "branch_results": [],
+        "deadline": time.time() + (CRAWL_TIME_BUDGET if refresh else SEARCH_DEADLINE),
+        "search_id": f"career:{normalize_key(search_term)}"
+    }
+
+def run_career_search(search_term, refresh=False, profile=False):
+    """백그라운드 스레드에서 직업 분석 워크플로우 실행 (profile: 실행을 프로파일링 - 결과 화면을 그린 뒤 저장)"""
+    report_progress(f"🚀 '{search_term}' 검색 시작")
+    
+    # LangGraph 실행
+    initial_state = initial_career_state(search_term, refresh)
+    
+    # 스트리밍으로 실행해 진행 이벤트와 부분 결과를 작업에 바로 기록 (UI가 1초마다 조회)
+    # 검색 1회를 추적 1개로 기록 (노드/네이버 API/페이지 요청/본문 해석/LLM 호출 구간)
+    capture = get_profile_store().begin(search_term, app="career") if profile else None
+    try:
+        with start_trace("search", exporter=get_trace_exporter(), profile=capture, app="career", term=search_term, refresh=refresh) as trace:
+            final_state = stream_workflow(career_app, initial_state, on_event=lambda event: report_progress(**event), on_partial=report_partial)
+    except Exception:
+        if capture:
+            get_profile_store().finish(capture.id)
+        raise
+    if final_state is not None:
+        final_state["results"]["trace"] = trace.spans()
+        if capture:
+            final_state["results"]["profile_id"] = capture.id
+    elif capture:
+        get_profile_store().finish(capture.id)
+    if METRICS_PATH:
+        try:
+            get_metrics().write_file(METRICS_PATH)
+        except OSError as e:
+            print(f"지표 기록 오류: {e}")
+    return final_state
+
+@st.fragment(run_every=1)
+def show_job_progress(job_id, search_term):
+    """진행 중인 검색 작업 표시 (1초마다 이 영역만 다시 그림)"""
+    job = get_job_runner().get(job_id)
+    if job is None or job.finished():
+        # 작업이 끝나면 전체 페이지를 다시 그려 결과 표시
+        st.rerun()
+    
+    snapshot = job.snapshot()
+    partial = snapshot['partial']
+    if not partial.get('pros') and not partial.get('cons'):
+        # 첫 장단점이 나오기 전까지만 로딩 애니메이션 표시
+        show_loading_animation()
+    
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        caption = f"⏳ '{search_term}' 분석 중... ({snapshot['elapsed']:.0f}초 경과)"
+        if partial.get('first_result') is not None:
+            caption += f" · 첫 결과 {partial['first_result']:.1f}초"
+        st.caption(caption)
+        
+        kinds = Counter(entry.get('kind') for entry in snapshot['progress'])
+        st.caption(f"🔍 검색 {kinds[EVENT_QUERY]}회 · 📖 페이지 {kinds[EVENT_FETCH]}개 · ✓ 추출 {kinds[EVENT_POINTS]}건")
+        for entry in snapshot['progress'][-5:]:
+            st.write(entry['message'])
+    with col2:
+        if st.button("⏹️ 취소", key="cancel_search_job"):
+            # 같은 검색을 보고 있는 다른 사용자가 있으면 이 세션만 구독 해제
+            get_single_flight().cancel(job_id)
+            st.session_state.search_job = None
+            st.rerun()
+    
+    # 지금까지 추출된 장단점 (최종 결과는 중복 제거 후 순위대로 다시 정리됨)
+    if partial.get('pros') or partial.get('cons'):
+        pros_col, cons_col = st.columns(2)
+        with pros_col:
+            st.markdown(f"**👍 지금까지 수집된 장점 {len(partial.get('pros', []))}개**")
+            for pro in partial.get('pros', [])[:10]:
+                st.write(f"✅ {pro}")
+        with cons_col:
+            st.markdown(f"**👎 지금까지 수집된 단점 {len(partial.get('cons', []))}개**")
+            for con in partial.get('cons', [])[:10]:
+                st.write(f"❌ {con}")
+
 # ========================
 # 탭 생성
 # ========================
-tab1, tab2 = st.tabs(["🔍 직업 검색", "🧬 MBTI 직업 추천"])
+tab1, tab2, tab3 = st.tabs(["🔍 직업 검색", "🧬 MBTI 직업 추천", "🔎 장단점 검색"])
 
 with tab1:
     # 검색 섹션
@@ -1761,6 +2308,27 @@ with tab1:
         
         st.markdown('</div></div>', unsafe_allow_html=True)
     
+    # 사용 통계 - 서버 전체 지표
+    with server_stats:
+        show_server_stats()
+
+    # 조회 캐시 상태 (서버 전체에서 공유)
+    with st.sidebar:
+        with st.expander("⚡ 조회 캐시", expanded=False):
+            cache_stats = get_result_cache().snapshot()
+            st.metric("캐시 적중률", f"{cache_stats['hit_ratio'] * 100:.1f}%", help=f"적중 {cache_stats['hits']}회 / 미적중 {cache_stats['misses']}회")
+            if cache_stats['p50_ms'] is not None:
+                st.caption(f"조회 지연 p50 {cache_stats['p50_ms']}ms · p99 {cache_stats['p99_ms']}ms")
+            st.caption(f"보관 {cache_stats['size']}개 · 무효화 {cache_stats['invalidations']}회 · 제거 {cache_stats['evictions']}회")
+        if WRITE_BEHIND_ENABLED:
+            with st.expander("💾 저장 대기열", expanded=False):
+                queue_stats = get_write_behind().snapshot()
+                st.metric("대기 중", f"{queue_stats['depth']}건", help=f"저장 {queue_stats['written']}건 / 실패 {queue_stats['failed']}건 / 재시도 {queue_stats['retries']}회")
+                if queue_stats['p50_ms'] is not None:
+                    st.caption(f"저장 지연 p50 {queue_stats['p50_ms']}ms · p99 {queue_stats['p99_ms']}ms · 묶음 {queue_stats['batches']}회")
+                if queue_stats['last_error']:
+                    st.caption(f"최근 오류: {queue_stats['last_error']}")
+
     # 검색 실행
     if search_button:
         # 인기 검색어로 선택된 경우 해당 검색어 사용
@@ -1774,28 +2342,45 @@ with tab1:
             # 검색 통계 증가
             st.session_state.total_searches += 1
             
-            loading_placeholder = show_loading_animation()
-            
-            # LangGraph 실행
-            initial_state = {
-                "career_name": search_term,
-                "search_method": "",
-                "results": {},
-                "pros": [],
-                "cons": [],
-                "sources": [],
-                "salary_info": {},
-                "career_path": [],
-                "messages": [],
-                "error": ""
-            }
-            
-            # 워크플로우 실행
-            final_state = career_app.invoke(initial_state)
-            
-            # 로딩 애니메이션 제거
-            loading_placeholder.empty()
+            # 워크플로우는 백그라운드 작업으로 실행하고 세션에는 작업 ID만 보관
+            # 같은 검색어가 이미 진행 중이면 새로 크롤링하지 않고 그 작업에 합류
+            job_id, joined = get_single_flight().submit(normalize_key(search_term), run_career_search, search_term, profile=profiling_enabled, name=search_term)
+            st.session_state.search_job = {'id': job_id, 'term': search_term, 'joined': joined, 'counted': False}
+    
+    # 검색 작업 상태 확인 (페이지가 다시 실행되거나 탭을 옮겨도 작업은 계속 진행)
+    search_job = st.session_state.get('search_job')
+    if search_job:
+        search_term = search_job['term']
+        job = get_job_runner().get(search_job['id'])
+        final_state = None
+        profile_capture = None
+        
+        if job is None:
+            st.session_state.search_job = None
+            st.warning("검색 작업이 만료되었습니다. 다시 검색해주세요.")
+        elif not job.finished():
+            if search_job['joined']:
+                st.info("👥 다른 사용자가 같은 검색을 진행 중이어서 그 결과를 함께 받아옵니다.")
+            show_job_progress(job.id, search_term)
+        elif job.status == FAILED:
+            st.error(f"검색 중 오류가 발생했습니다: {job.error}")
+        else:
+            final_state = job.result
+            # 프로파일링한 검색이면 결과 화면 그리기도 같은 캡처에 기록 (다 그린 뒤 저장)
+            if final_state and not search_job['joined']:
+                profile_capture = get_profile_store().resume(final_state["results"].get("profile_id"))
+            if job.status == CANCELLED:
+                st.info("⏹️ 검색이 취소되었습니다. 취소 전까지 수집한 결과를 표시합니다.")
+            elif final_state and final_state["results"].get("partial"):
+                st.info(f"⏱️ 제한 시간({SEARCH_DEADLINE:.0f}초) 안에 수집한 부분 결과입니다.")
             
+            # 저장 통계는 작업을 시작한 세션에서 한 번만 반영
+            if not search_job['counted']:
+                search_job['counted'] = True
+                if final_state and final_state["results"].get("saved") and not search_job['joined']:
+                    st.session_state.saved_careers += 1
+        
+        if final_state:
             # 프로세스 로그 표시
             if show_process and final_state["messages"]:
                 with st.expander("🔧 검색 프로세스", expanded=False):
@@ -1805,8 +2390,15 @@ with tab1:
                         else:
                             st.write(f"🤖 {msg.content}")
             
+            # 성능 패널 - 이 검색의 구간별 소요 시간 (노드, 네이버 API, 페이지 요청/해석, LLM 호출)
+            if show_process and final_state["results"].get("trace"):
+                with st.expander("⏱️ 성능", expanded=False):
+                    show_trace_waterfall(final_state["results"]["trace"])
+            
             # 결과 표시
             if final_state["pros"] or final_state["cons"]:
+                # 첫 결과까지 걸린 시간 (스트리밍 실행에서 측정)
+                timing = final_state["results"].get("timing") or {}
                 # 검색 정보
                 st.markdown(f"""
                 <div class="process-info fade-in">
@@ -1814,7 +2406,8 @@ with tab1:
                         '데이터베이스' if final_state["search_method"] == "database" else '웹 크롤링'
                     } | 
                     <strong><i class="fas fa-thumbs-up"></i> 장점:</strong> {len(final_state["pros"])}개 | 
-                    <strong><i class="fas fa-thumbs-down"></i> 단점:</strong> {len(final_state["cons"])}개
+                    <strong><i class="fas fa-thumbs-down"></i> 단점:</strong> {len(final_state["cons"])}개 | 
+                    <strong><i class="fas fa-bolt"></i> 첫 결과:</strong> {timing.get('time_to_first_result') or 0:.1f}초 (전체 {timing.get('total') or 0:.1f}초)
                 </div>
                 """, unsafe_allow_html=True)
                 
@@ -1840,7 +2433,7 @@ with tab1:
                 st.markdown("---")
                 
                 # 워드클라우드 표시
-                display_wordclouds(final_state["pros"], final_state["cons"])
+                display_wordclouds(final_state["pros"], final_state["cons"], keywords=(final_state.get("analysis") or {}).get("keywords"))
                 
                 # 장단점 통계 차트
                 pros_cons_chart = create_pros_cons_chart(len(final_state["pros"]), len(final_state["cons"]))
@@ -1908,6 +2501,13 @@ with tab1:
                             """, unsafe_allow_html=True)
             else:
                 st.error(f"'{search_term}'에 대한 정보를 찾을 수 없습니다.")
+        
+        if profile_capture:
+            st.session_state.last_profile = get_profile_store().finish(profile_capture.id)
+
+if st.session_state.get('last_profile'):
+    with profile_panel:
+        show_profile_result(st.session_state.last_profile)
 
 with tab2:
     # MBTI 직업 추천 섹션
@@ -2237,6 +2837,32 @@ with tab2:
                 del st.session_state.mbti_type_analysis
                 st.rerun()
 
+with tab3:
+    # 저장된 모든 직업의 장단점에서 검색어가 들어간 항목 찾기
+    st.markdown("### 🔎 저장된 장단점 검색")
+    st.caption("예: '워라밸' 장점이 있는 직업, '야근' 단점이 있는 직업")
+    point_query = st.text_input("검색어", placeholder="예: 워라밸, 야근, 연봉 상승", key="point_search_input")
+    point_type_label = st.radio("유형", ["전체", "장점", "단점"], horizontal=True, key="point_search_type")
+    if point_query:
+        point_type = {'장점': 'pro', '단점': 'con'}.get(point_type_label)
+        start_time = time.perf_counter()
+        try:
+            point_results = search_stored_points(
+                get_supabase_client(), get_point_index(), point_query, POINT_SEARCH_SOURCES,
+                point_type=point_type, limit=50, max_age=POINT_INDEX_MAX_AGE
+            )
+        except Exception as e:
+            point_results = []
+            st.error(f"장단점 검색 오류: {str(e)}")
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        groups = group_by_name(point_results)
+        st.caption(f"{len(groups)}개 직업 · 장단점 {len(point_results)}개 · {elapsed_ms:.1f}ms")
+        for group in groups[:10]:
+            st.markdown(f"**{group['name']}**")
+            for point in group['points'][:5]:
+                icon = "✅" if point['type'] == 'pro' else "⚠️"
+                st.markdown(f"- {icon} {point['content']}")
+
 # 하단 정보
 st.markdown("---")
 col1, col2, col3 = st.columns(3)
@@ -0,0 +1,293 @@
+"""
+구간 추적 (span tracing) - 검색 1회가 어디서 시간을 쓰는지 노드/네이버 API/페이지 요청/본문 해석/LLM 호출 단위로 기록
+
+    with start_trace("search", term="맥북 프로") as trace:     # 검색 1회 = 추적 1개
+        with span("naver.search", query=...) as s:            # 안쪽 구간은 바깥 구간의 자식
+            ...
+            s.set(items=30, bytes=5120)
+
+현재 추적과 구간은 contextvars 로 전달되므로 LangGraph 병렬 노드(컨텍스트를 복사해 띄운 스레드)의
+구간도 같은 추적에 부모 관계를 유지한 채 기록됩니다. 추적 밖에서 span() 은 아무것도 하지 않습니다.
+
+끝난 추적은 JSONL 파일(구간 1개당 1줄)에 덧붙이고, Chrome 추적 형식(chrome://tracing, Perfetto)으로
+바꿔 볼 수 있습니다. add_listener() 로 등록한 함수는 추적 밖의 구간까지 포함해 끝난 구간을 모두 받습니다
+(운영 지표 집계용 - 예: 저장 대기열 스레드의 DB 쓰기).
+    python tracing.py list [traces.jsonl]
+    python tracing.py chrome [traces.jsonl] --trace last -o search.json
+"""
+
+import argparse
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+_current_span = contextvars.ContextVar('current_span', default=None)
+_listeners = []
+
+
+def add_listener(fn):
+    """끝난 구간을 받을 함수 등록 - fn(구간 dict), 추적 밖의 구간도 전달"""
+    if fn not in _listeners:
+        _listeners.append(fn)
+
+
+class Span:
+    """구간 1개 (이름, 시작 시각, 소요 시간, 속성)"""
+
+    __slots__ = ('trace', 'id', 'parent_id', 'name', 'start', 'duration', 'thread', 'attrs', 'error')
+
+    def __init__(self, trace, name, parent_id, attrs):
+        self.trace = trace
+        self.id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.duration = None
+        self.thread = threading.current_thread().name
+        self.attrs = attrs
+        self.error = ""
+
+    def set(self, **attrs):
+        """속성 추가 (URL, 바이트 수, 토큰 수 등)"""
+        self.attrs.update(attrs)
+
+    def fail(self, error):
+        """안에서 처리한 오류 기록 (예외를 다시 발생시키지 않는 경우)"""
+        self.error = str(error)[:200]
+
+    def to_dict(self):
+        return {
+            'trace_id': self.trace.id if self.trace else None,
+            'span_id': self.id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.start,
+            'duration': self.duration,
+            'thread': self.thread,
+            'attrs': self.attrs,
+            'error': self.error
+        }
+
+
+class _NoopSpan:
+    """추적 밖에서 쓰는 빈 구간"""
+
+    def set(self, **attrs):
+        pass
+
+    def fail(self, error):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Trace:
+    """추적 1개 - 끝난 구간을 모음 (여러 스레드에서 추가)"""
+
+    def __init__(self, name, attrs, profile=None):
+        self.id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attrs = attrs
+        self.profile = profile
+        self.started_at = time.time()
+        self._spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span_):
+        with self._lock:
+            self._spans.append(span_.to_dict())
+
+    def spans(self):
+        """끝난 구간 목록 (시작 순)"""
+        with self._lock:
+            return sorted(self._spans, key=lambda s: s['start'])
+
+
+@contextmanager
+def span(name, **attrs):
+    """구간 기록 (현재 추적과 리스너가 모두 없으면 아무것도 하지 않음, 예외는 error 속성에 남기고 다시 발생)"""
+    trace = _current_trace.get()
+    if trace is None and not _listeners:
+        yield _NOOP
+        return
+    parent = _current_span.get()
+    current = Span(trace, name, parent.id if parent else None, attrs)
+    token = _current_span.set(current)
+    # 프로파일링 중인 추적이면 구간이 열린 동안 이 스레드도 표본 추출 (병렬 가지 스레드 포함)
+    profile = trace.profile if trace is not None else None
+    if profile is not None:
+        profile.enter()
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {str(e)[:200]}"
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        if profile is not None:
+            profile.exit()
+        _current_span.reset(token)
+        if trace is not None:
+            trace.add(current)
+        if _listeners:
+            record = current.to_dict()
+            for listener in _listeners:
+                listener(record)
+
+
+def traced(name, fn):
+    """함수 호출 전체를 구간으로 감쌈 (LangGraph 노드 등)"""
+    def wrapped(*args, **kwargs):
+        with span(name):
+            return fn(*args, **kwargs)
+
+    wrapped.__name__ = getattr(fn, '__name__', name)
+    wrapped.__doc__ = fn.__doc__
+    return wrapped
+
+
+@contextmanager
+def start_trace(name, exporter=None, profile=None, **attrs):
+    """추적 시작 - 안에서 기록한 구간을 모으고, 끝나면 exporter 로 내보냄 (최상위 구간 이름은 name)
+
+    profile(profiling.Capture)을 주면 구간이 열려 있는 스레드를 그 캡처로 표본 추출합니다.
+    """
+    trace = Trace(name, attrs, profile)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        with span(name, **attrs):
+            yield trace
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        if exporter:
+            try:
+                exporter.export(trace.spans())
+            except OSError as e:
+                print(f"추적 기록 오류: {e}")
+
+
+class JsonlExporter:
+    """끝난 추적의 구간을 JSONL 파일에 덧붙임 (max_bytes 를 넘으면 .1 로 넘기고 새 파일)"""
+
+    def __init__(self, path, max_bytes=50 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def export(self, spans):
+        lines = ''.join(json.dumps(s, ensure_ascii=False, default=str) + '\n' for s in spans)
+        with self._lock:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                os.replace(self.path, self.path + '.1')
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+
+def read_traces(path):
+    """JSONL 파일의 추적 목록 {추적 ID: [구간...]} (기록 순)"""
+    traces = {}
+    if not os.path.exists(path):
+        return traces
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            traces.setdefault(record['trace_id'], []).append(record)
+    return traces
+
+
+def to_chrome_trace(spans):
+    """Chrome 추적 형식 (chrome://tracing / ui.perfetto.dev 에서 열기) - 스레드별 줄로 표시"""
+    threads = {}
+    events = []
+    for s in spans:
+        tid = threads.setdefault(s['thread'], len(threads) + 1)
+        args = dict(s['attrs'])
+        if s['error']:
+            args['error'] = s['error']
+        events.append({
+            'name': s['name'], 'cat': s['name'].split('.')[0], 'ph': 'X', 'pid': 1, 'tid': tid,
+            'ts': round(s['start'] * 1e6), 'dur': round((s['duration'] or 0) * 1e6), 'args': args
+        })
+    for thread, tid in threads.items():
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': thread}})
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def waterfall_rows(spans):
+    """폭포 차트용 행 - 추적 시작 기준 시작/소요 시간(ms), 깊이, 표시 이름 (시작 순)"""
+    if not spans:
+        return []
+    origin = min(s['start'] for s in spans)
+    depth = {}
+    by_id = {s['span_id']: s for s in spans}
+    rows = []
+    for s in sorted(spans, key=lambda s: s['start']):
+        parent = by_id.get(s['parent_id'])
+        depth[s['span_id']] = depth.get(parent['span_id'], -1) + 1 if parent else 0
+        detail = s['attrs'].get('url') or s['attrs'].get('query') or ''
+        rows.append({
+            'name': s['name'],
+            'label': f"{s['name']} {str(detail)[:40]}".strip(),
+            'start_ms': (s['start'] - origin) * 1000,
+            'duration_ms': (s['duration'] or 0) * 1000,
+            'depth': depth[s['span_id']],
+            'thread': s['thread'],
+            'attrs': s['attrs'],
+            'error': s['error']
+        })
+    return rows
+
+
+def summarize(spans):
+    """구간 이름별 횟수/합계/최대 시간(ms) - 합계가 큰 순"""
+    totals = {}
+    for s in spans:
+        entry = totals.setdefault(s['name'], {'name': s['name'], 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'errors': 0})
+        duration_ms = (s['duration'] or 0) * 1000
+        entry['count'] += 1
+        entry['total_ms'] += duration_ms
+        entry['max_ms'] = max(entry['max_ms'], duration_ms)
+        entry['errors'] += bool(s['error'])
+    return sorted(totals.values(), key=lambda entry: entry['total_ms'], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 추적 확인 / Chrome 추적 형식으로 내보내기")
+    parser.add_argument('command', choices=['list', 'chrome'])
+    parser.add_argument('path', nargs='?', default=os.path.join(os.getenv("SMART_CACHE_DIR", ".cache"), "traces.jsonl"))
+    parser.add_argument('--trace', default='last', help="추적 ID (기본: 마지막 추적)")
+    parser.add_argument('-o', '--output', default='trace.json')
+    args = parser.parse_args()
+
+    traces = read_traces(args.path)
+    if args.command == 'list':
+        for trace_id, spans in traces.items():
+            root = next((s for s in spans if not s['parent_id']), spans[-1])
+            print(f"{trace_id}  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(root['start']))}  "
+                  f"{root['duration'] or 0:6.2f}초  구간 {len(spans)}개  {root['name']} {root['attrs']}")
+        return
+    if not traces:
+        parser.error("기록된 추적이 없습니다")
+    trace_id = list(traces)[-1] if args.trace == 'last' else args.trace
+    if trace_id not in traces:
+        parser.error(f"추적 {trace_id} 이(가) 없습니다")
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(to_chrome_trace(traces[trace_id]), f, ensure_ascii=False)
+    print(f"{args.output} 저장 (구간 {len(traces[trace_id])}개) - chrome://tracing 또는 ui.perfetto.dev 에서 열기")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+버전 단위 저장 - 장단점 행 전체를 한 번의 RPC(저장 프로시저)로 새 버전으로 교체
+
+insert 후 delete(swap_in)는 왕복이 두 번이고 그 사이에 두 버전이 함께 보입니다.
+저장 프로시저는 한 트랜잭션 안에서 새 버전을 넣고 이전 버전을 지우므로, 읽는 쪽은
+커밋 전에는 이전 버전만, 커밋 후에는 새 버전만 봅니다.
+
+Supabase SQL 편집기에서 versioned_save_sql('laptop_pros_cons', 'product_name') 결과를
+실행하면 됩니다 (직업은 'career_pros_cons', 'career_name').
+프로시저가 없으면 swap_in 으로 대신 저장합니다.
+
+로컬 검증: python versioned_store.py (LocalVersionedStore 로 동시 저장/조회 확인)
+"""
+
+import threading
+
+from freshness import latest_batch, swap_in
+
+# PostgREST/PostgreSQL 의 '함수 없음' 오류 코드
+_MISSING_FUNCTION_CODES = ('PGRST202', '42883')
+
+# 프로시저가 없는 테이블 (매번 실패하는 RPC를 다시 호출하지 않도록 기록)
+_rpc_unavailable = set()
+_rpc_lock = threading.Lock()
+
+
+def rpc_name(table):
+    return f"save_{table}_version"
+
+
+def versioned_save_sql(table, key_column):
+    """버전 컬럼 추가 및 저장 프로시저 생성 SQL"""
+    return f"""
+alter table {table} add column if not exists version bigint not null default 0;
+create index if not exists {table}_name_version_idx on {table} ({key_column}, version);
+
+create or replace function {rpc_name(table)}(p_name text, p_pros jsonb, p_cons jsonb)
+returns bigint language plpgsql as $$
+declare
+    v bigint;
+begin
+    -- 같은 이름의 동시 저장은 순서대로 처리
+    perform pg_advisory_xact_lock(hashtext('{table}:' || p_name));
+    select coalesce(max(version), 0) + 1 into v from {table} where {key_column} = p_name;
+    insert into {table} ({key_column}, type, content, version)
+        select p_name, 'pro', value, v from jsonb_array_elements_text(p_pros)
+        union all
+        select p_name, 'con', value, v from jsonb_array_elements_text(p_cons);
+    delete from {table} where {key_column} = p_name and version < v;
+    return v;
+end $$;
+""".strip()
+
+
+def latest_version(rows):
+    """가장 최신 버전의 행만 반환 (version 컬럼이 없으면 최신 created_at 묶음)
+
+    version 0 은 버전 컬럼을 추가하기 전에 저장된 행(또는 swap_in 으로 저장한 행)이라 여러 번의
+    저장이 섞여 있을 수 있으므로, 최신 버전 행 중에서도 최신 created_at 묶음만 남깁니다.
+    """
+    versions = [row.get('version') for row in rows if row.get('version') is not None]
+    if not versions:
+        return latest_batch(rows)
+    newest = max(versions)
+    return latest_batch([row for row in rows if row.get('version') == newest])
+
+
+def point_rows(key_column, name, pros, cons):
+    """장단점 목록을 장단점 1개당 1행 형식으로 변환"""
+    rows = [{key_column: name, 'type': 'pro', 'content': pro} for pro in pros]
+    rows += [{key_column: name, 'type': 'con', 'content': con} for con in cons]
+    return rows
+
+
+def save_points_versioned(supabase, table, key_column, name, pros, cons):
+    """장단점을 새 버전으로 저장 (한 번의 RPC), 저장한 버전 반환 - 프로시저가 없으면 swap_in 후 None"""
+    with _rpc_lock:
+        use_rpc = table not in _rpc_unavailable
+
+    if use_rpc:
+        try:
+            result = supabase.rpc(rpc_name(table), {'p_name': name, 'p_pros': list(pros), 'p_cons': list(cons)}).execute()
+            return result.data
+        except Exception as e:
+            if getattr(e, 'code', None) not in _MISSING_FUNCTION_CODES:
+                raise
+            print(f"저장 프로시저 {rpc_name(table)} 없음 - insert/delete 방식으로 저장합니다")
+            with _rpc_lock:
+                _rpc_unavailable.add(table)
+
+    swap_in(supabase, table, key_column, name, point_rows(key_column, name, pros, cons))
+    return None
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _LocalQuery:
+    """LocalVersionedStore 조회 (select/eq/execute 만 지원)"""
+
+    def __init__(self, store, table):
+        self.store = store
+        self.table = table
+        self.filters = []
+
+    def select(self, *columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def execute(self):
+        with self.store._lock:
+            rows = [dict(row) for row in self.store.tables.get(self.table, [])]
+        return _Result([row for row in rows if all(row.get(c) == v for c, v in self.filters)])
+
+
+class _LocalCall:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self):
+        return _Result(self.fn())
+
+
+class LocalVersionedStore:
+    """저장 프로시저와 같은 동작을 하는 로컬 대역 (Supabase 없이 저장 경로 검증용)
+
+    rpc() 는 프로시저와 같이 락 안에서 새 버전 삽입과 이전 버전 삭제를 한 번에 처리합니다.
+    """
+
+    def __init__(self, key_columns):
+        self.key_columns = key_columns  # {테이블: 이름 컬럼}
+        self.tables = {table: [] for table in key_columns}
+        self._lock = threading.Lock()
+
+    def table(self, table):
+        return _LocalQuery(self, table)
+
+    def rpc(self, name, params):
+        table = next((t for t in self.key_columns if rpc_name(t) == name), None)
+        if table is None:
+            error = RuntimeError(f"function {name} does not exist")
+            error.code = 'PGRST202'
+            raise error
+        return _LocalCall(lambda: self._save_version(table, params))
+
+    def _save_version(self, table, params):
+        key_column = self.key_columns[table]
+        name = params['p_name']
+        with self._lock:
+            rows = self.tables[table]
+            version = max((row['version'] for row in rows if row[key_column] == name), default=0) + 1
+            new_rows = [dict(row, version=version) for row in point_rows(key_column, name, params['p_pros'], params['p_cons'])]
+            self.tables[table] = [row for row in rows if row[key_column] != name] + new_rows
+        return version
+
+
+def _self_check(writers=4, rounds=50):
+    """동시 저장 중에도 조회 결과가 항상 한 버전의 온전한 묶음인지 확인"""
+    store = LocalVersionedStore({'laptop_pros_cons': 'product_name'})
+    errors = []
+
+    def writer(worker):
+        for i in range(rounds):
+            tag = f"{worker}-{i}"
+            save_points_versioned(store, 'laptop_pros_cons', 'product_name', '테스트', [f"장점 {tag}"] * 3, [f"단점 {tag}"] * 2)
+
+    def reader():
+        for _ in range(rounds * writers):
+            rows = latest_version(store.table('laptop_pros_cons').select("*").eq('product_name', '테스트').execute().data)
+            if rows and (len(rows) != 5 or len({row['version'] for row in rows}) != 1):
+                errors.append(rows)
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)] + [threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    final = latest_version(store.table('laptop_pros_cons').select("*").execute().data)
+    assert not errors, f"불완전한 조회 {len(errors)}건"
+    assert final[0]['version'] == writers * rounds and len(store.tables['laptop_pros_cons']) == 5
+    print(f"확인 완료: {writers * rounds}회 저장, 최종 버전 {final[0]['version']}, 불완전한 조회 0건")
+
+    # 버전 컬럼 추가 전 행(version 0, 저장 시각이 다른 묶음 여러 개)이 섞인 테이블
+    legacy = LocalVersionedStore({'laptop_pros_cons': 'product_name'})
+    for created_at, tag in (('2024-01-01T00:00:00+00:00', '이전'), ('2024-02-01T00:00:00+00:00', '최신')):
+        legacy.tables['laptop_pros_cons'] += [
+            dict(row, version=0, created_at=created_at)
+            for row in point_rows('product_name', '테스트', [f"장점 {tag}"], [f"단점 {tag}"])
+        ]
+    rows = latest_version(legacy.table('laptop_pros_cons').select("*").execute().data)
+    assert sorted(row['content'] for row in rows) == ['단점 최신', '장점 최신'], rows
+    save_points_versioned(legacy, 'laptop_pros_cons', 'product_name', '테스트', ["장점 새 버전"], [])
+    rows = latest_version(legacy.table('laptop_pros_cons').select("*").execute().data)
+    assert [row['content'] for row in rows] == ['장점 새 버전'], rows
+    print("확인 완료: 버전 0 행이 섞인 테이블에서도 최신 묶음만 조회")
+
+
+if __name__ == "__main__":
+    _self_check()
@@ -0,0 +1,205 @@
+"""
+지연 저장 (write-behind) - 크롤링 결과 저장을 대기열에 넘기고 바로 반환, 백그라운드 스레드가 모아서 저장
+"""
+
+import atexit
+import threading
+import time
+from collections import OrderedDict, deque
+
+from analysis_store import save_summary
+from result_cache import percentile
+from tracing import span
+from versioned_store import save_points_versioned
+
+
+def persist_batch(supabase, batch):
+    """대기열 항목 묶음 저장 - 요약 행은 테이블별로 한 번의 upsert, 장단점 행은 항목별 RPC
+
+    한 항목의 실패가 다른 검색의 항목까지 실패시키지 않도록 항목별로 오류를 잡아
+    실패한 [(항목, 오류)] 목록을 반환합니다. 묶음 upsert 가 실패하면 그 테이블의 항목을 하나씩 다시 저장합니다.
+    """
+    failed = []
+    with span("db.write", items=len(batch), rows=sum(len(item['rows']) for item in batch)) as write_span:
+        summaries = OrderedDict()
+        for item in batch:
+            if item['mode'] == 'summary':
+                summaries.setdefault((item['table'], item['key_column']), []).append(item)
+                continue
+            pros = [row['content'] for row in item['rows'] if row['type'] == 'pro']
+            cons = [row['content'] for row in item['rows'] if row['type'] == 'con']
+            try:
+                save_points_versioned(supabase, item['table'], item['key_column'], item['name'], pros, cons)
+            except Exception as e:
+                failed.append((item, e))
+        for (table, key_column), items in summaries.items():
+            try:
+                save_summary(supabase, table, key_column, [row for item in items for row in item['rows']])
+            except Exception:
+                for item in items:
+                    try:
+                        save_summary(supabase, table, key_column, item['rows'])
+                    except Exception as e:
+                        failed.append((item, e))
+        if failed:
+            write_span.set(failed=len(failed))
+            write_span.fail(failed[-1][1])
+    return failed
+
+
+class WriteBehindQueue:
+    """저장 대기열
+
+    enqueue() 는 항목을 넣고 바로 반환합니다. 백그라운드 스레드는 flush_interval 마다
+    (또는 max_batch 개가 쌓이면) 여러 검색의 항목을 묶어 writer(batch) 로 저장합니다.
+    writer 는 실패한 [(항목, 오류)] 목록을 반환합니다 (예외를 내면 묶음 전체가 실패한 것으로 봄).
+    같은 키(테이블, 이름)의 항목이 아직 저장 전이면 새 항목으로 대체합니다.
+    실패한 항목만 backoff 초부터 두 배씩 늘려 max_retries 번까지 다시 시도하고,
+    그래도 실패하면 대기열에서 빼고 그 항목마다 on_failed(item) 를 호출합니다 (호출한 쪽이 체크포인트 등
+    디스크에 남긴 원본으로 다시 저장할 수 있도록). 종료 시(atexit) 남은 항목을 모두 저장합니다.
+    """
+
+    def __init__(self, writer, flush_interval=0.5, max_batch=50, max_retries=5, backoff=0.5,
+                 on_written=None, on_failed=None, sample_size=500):
+        self.writer = writer
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.on_written = on_written
+        self.on_failed = on_failed
+        self._pending = OrderedDict()
+        self._inflight = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._latencies = deque(maxlen=sample_size)
+        self.stats = {
+            'enqueued': 0,
+            'coalesced': 0,
+            'written': 0,
+            'batches': 0,
+            'retries': 0,
+            'failed': 0,
+            'last_error': ''
+        }
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def enqueue(self, key, item):
+        """저장 항목 추가 (바로 반환)"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("저장 대기열이 종료되었습니다")
+            if key in self._pending:
+                self.stats['coalesced'] += 1
+                del self._pending[key]
+            self._pending[key] = dict(item, enqueued_at=time.monotonic())
+            self.stats['enqueued'] += 1
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+
+    def pending(self, key):
+        """아직 저장되지 않은 항목 (저장 전 조회에서도 방금 수집한 결과를 보이도록)"""
+        with self._cond:
+            item = self._pending.get(key) or self._inflight.get(key)
+            return dict(item) if item else None
+
+    def depth(self):
+        with self._cond:
+            return len(self._pending) + len(self._inflight)
+
+    def _take_batch(self):
+        with self._cond:
+            if not self._pending and not self._closed:
+                self._cond.wait(self.flush_interval)
+            batch = []
+            while self._pending and len(batch) < self.max_batch:
+                key, item = self._pending.popitem(last=False)
+                self._inflight[key] = item
+                batch.append((key, item))
+            return batch
+
+    def _write(self, batch):
+        """묶음 저장 (실패한 항목만 다시 시도), 끝까지 실패한 항목 목록 반환"""
+        items = [item for _, item in batch]
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            try:
+                failed = self.writer(items) or []
+            except Exception as e:
+                failed = [(item, e) for item in items]
+            if not failed:
+                return []
+            items = [item for item, _ in failed]
+            error = failed[-1][1]
+            self.stats['last_error'] = str(error)
+            if attempt == self.max_retries:
+                print(f"지연 저장 실패 ({len(items)}건, {attempt + 1}회 시도): {error}")
+                return items
+            self.stats['retries'] += 1
+            time.sleep(delay)
+            delay *= 2
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch:
+                failed = {id(item) for item in self._write(batch)}
+                now = time.monotonic()
+                for _, item in batch:
+                    callback = self.on_failed if id(item) in failed else self.on_written
+                    if callback:
+                        try:
+                            callback(item)
+                        except Exception as e:
+                            print(f"지연 저장 후처리 오류: {e}")
+                with self._cond:
+                    for key, item in batch:
+                        self._inflight.pop(key, None)
+                        self._latencies.append(now - item['enqueued_at'])
+                    self.stats['batches'] += 1
+                    self.stats['written'] += len(batch) - len(failed)
+                    self.stats['failed'] += len(failed)
+                    self._cond.notify_all()
+                continue
+            with self._cond:
+                if self._closed and not self._pending:
+                    self._cond.notify_all()
+                    return
+
+    def flush(self, timeout=None):
+        """대기 중인 항목이 모두 저장될 때까지 대기, 다 저장되었으면 True"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._pending or self._inflight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining if remaining is not None else self.flush_interval)
+            return True
+
+    def close(self, timeout=30):
+        """남은 항목 저장 후 종료"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def snapshot(self):
+        """대기열 상태 요약 (저장 지연은 대기열에 들어간 시점부터 저장 완료까지, 밀리초)"""
+        with self._cond:
+            latencies = sorted(self._latencies)
+            stats = dict(self.stats)
+            depth = len(self._pending) + len(self._inflight)
+        p50 = percentile(latencies, 50)
+        p99 = percentile(latencies, 99)
+        return {
+            **stats,
+            'depth': depth,
+            'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+            'p99_ms': round(p99 * 1000, 1) if p99 is not None else None
+        }